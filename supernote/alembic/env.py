@@ -2,6 +2,7 @@ import asyncio
 import sys
 from logging.config import fileConfig
 from pathlib import Path
+from typing import Any
 
 from alembic import context
 from sqlalchemy import pool
@@ -16,6 +17,7 @@ from supernote.server.db.base import Base
 
 # Import all models so they are registered with Base.metadata
 from supernote.server.db.models import *  # noqa
+from supernote.server.db.models.file import FILE_NAME_FTS_TABLE
 
 # ----------------------------------------------------------------------
 
@@ -42,6 +44,15 @@ if not current_url or "driver://" in current_url:
     config.set_main_option("sqlalchemy.url", app_config.db_url)
 
 
+def include_object(
+    object: Any, name: str | None, type_: str, reflected: bool, compare_to: Any
+) -> bool:
+    """Skip the full text index, which is maintained by hand-written DDL."""
+    return not (
+        type_ == "table" and name is not None and name.startswith(FILE_NAME_FTS_TABLE)
+    )
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -58,6 +69,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -67,7 +79,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection: Connection) -> None:
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+    )
 
     with context.begin_transaction():
         context.run_migrations()
@@ -0,0 +1,36 @@
+"""Full text index of file names
+
+Revision ID: 4b1f2c3d5e6a
+Revises: 0543a383957b
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from supernote.server.db.models.file import FILE_NAME_FTS_DDL, FILE_NAME_FTS_TABLE
+
+# revision identifiers, used by Alembic.
+revision: str = "4b1f2c3d5e6a"
+down_revision: Union[str, Sequence[str], None] = "0543a383957b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for statement in FILE_NAME_FTS_DDL:
+        op.execute(statement)
+    op.execute(
+        f"INSERT INTO {FILE_NAME_FTS_TABLE}(rowid, file_name) "
+        "SELECT id, file_name FROM f_user_file"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for suffix in ("ai", "ad", "au"):
+        op.execute(f"DROP TRIGGER IF EXISTS {FILE_NAME_FTS_TABLE}_{suffix}")
+    op.execute(f"DROP TABLE IF EXISTS {FILE_NAME_FTS_TABLE}")
@@ -9,7 +9,7 @@ from mashumaro.config import BaseConfig
 from mashumaro.mixins.json import DataClassJSONMixin
 
 
-@dataclass
+@dataclass(slots=True)
 class BaseResponse(DataClassJSONMixin):
     """Base response class."""
 
@@ -63,7 +63,7 @@ class ProcessingStatus(str, BaseEnum):
     NONE = "NONE"  # Used in view aggregation
 
 
-@dataclass
+@dataclass(slots=True)
 class CommonList(BaseResponse):
     """Common list response class."""
 
@@ -36,7 +36,7 @@ class UploadType(str, BaseEnum):
     CLOUD = "2"
 
 
-@dataclass
+@dataclass(slots=True)
 class EntriesVO(DataClassJSONMixin):
     """Object representing a file entry (Device)."""
 
@@ -60,7 +60,7 @@ class EntriesVO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileUploadApplyLocalVO(BaseResponse):
     """Response model containing upload credentials/URLs.
 
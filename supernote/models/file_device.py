@@ -8,7 +8,7 @@ from .base import BaseResponse
 from .file_common import EntriesVO
 
 
-@dataclass
+@dataclass(slots=True)
 class AllocationVO(DataClassJSONMixin):
     """Object representing storage allocation stats."""
 
@@ -19,7 +19,7 @@ class AllocationVO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class CapacityLocalVO(BaseResponse):
     """Response model for device storage capacity query (replaces legacy).
 
@@ -36,7 +36,7 @@ class CapacityLocalVO(BaseResponse):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class CapacityLocalDTO(DataClassJSONMixin):
     """Request model for device storage capacity query.
 
@@ -50,7 +50,7 @@ class CapacityLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SynchronousStartLocalDTO(DataClassJSONMixin):
     """Request model for starting device synchronization.
 
@@ -64,7 +64,7 @@ class SynchronousStartLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SynchronousStartLocalVO(BaseResponse):
     """Response model for sync start acknowledgement.
 
@@ -79,7 +79,7 @@ class SynchronousStartLocalVO(BaseResponse):
     """True: normal sync, false: full re-upload."""
 
 
-@dataclass
+@dataclass(slots=True)
 class SynchronousEndLocalDTO(DataClassJSONMixin):
     """Request model for ending device synchronization.
 
@@ -95,7 +95,7 @@ class SynchronousEndLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SynchronousEndLocalVO(BaseResponse):
     """Response model for sync end acknowledgement.
 
@@ -108,7 +108,7 @@ class SynchronousEndLocalVO(BaseResponse):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateFolderLocalDTO(DataClassJSONMixin):
     """Request model for creating a folder (Device/Path-based).
 
@@ -124,7 +124,7 @@ class CreateFolderLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class MetadataVO(DataClassJSONMixin):
     """Object representing basic file metadata."""
 
@@ -137,7 +137,7 @@ class MetadataVO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class CreateFolderLocalVO(BaseResponse):
     """Response model for folder creation.
 
@@ -151,7 +151,7 @@ class CreateFolderLocalVO(BaseResponse):
     metadata: MetadataVO | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ListFolderV2DTO(DataClassJSONMixin):
     """Request model for listing folder contents (V2).
 
@@ -167,7 +167,7 @@ class ListFolderV2DTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ListFolderLocalDTO(DataClassJSONMixin):
     """Request model for listing folder contents (Device/V3).
 
@@ -183,7 +183,7 @@ class ListFolderLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class ListFolderLocalVO(BaseResponse):
     """Response model containing list of file entries (Device).
 
@@ -198,7 +198,7 @@ class ListFolderLocalVO(BaseResponse):
     entries: list[EntriesVO] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DeleteFolderLocalDTO(DataClassJSONMixin):
     """Request model for deleting a folder (Device).
 
@@ -213,7 +213,7 @@ class DeleteFolderLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class DeleteFolderLocalVO(BaseResponse):
     """Response model for folder deletion.
 
@@ -227,7 +227,7 @@ class DeleteFolderLocalVO(BaseResponse):
     metadata: MetadataVO | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class FileUploadApplyLocalDTO(DataClassJSONMixin):
     """Request model for initiating a file upload (Device/Path-based).
 
@@ -244,7 +244,7 @@ class FileUploadApplyLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileUploadFinishLocalDTO(DataClassJSONMixin):
     """Request model for completing a file upload (Device/Path-based).
 
@@ -266,7 +266,7 @@ class FileUploadFinishLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileUploadFinishLocalVO(BaseResponse):
     """Response model for completing a file upload (Device/Path-based).
 
@@ -288,7 +288,7 @@ class FileUploadFinishLocalVO(BaseResponse):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class FileDownloadLocalDTO(DataClassJSONMixin):
     """Request model for file download (Device).
 
@@ -306,7 +306,7 @@ class FileDownloadLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileDownloadLocalVO(BaseResponse):
     """Response model containing file download info (Device).
 
@@ -328,7 +328,7 @@ class FileDownloadLocalVO(BaseResponse):
     size: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class FileQueryLocalDTO(DataClassJSONMixin):
     """Request model for querying file info (Device).
 
@@ -343,7 +343,7 @@ class FileQueryLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileQueryLocalVO(BaseResponse):
     """Response model containing file info (Device).
 
@@ -359,7 +359,7 @@ class FileQueryLocalVO(BaseResponse):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class FileQueryByPathLocalDTO(DataClassJSONMixin):
     """Request model for querying file info by path (Device).
 
@@ -374,7 +374,7 @@ class FileQueryByPathLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileQueryByPathLocalVO(BaseResponse):
     """Response model containing file info by path (Device).
 
@@ -390,7 +390,7 @@ class FileQueryByPathLocalVO(BaseResponse):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class FileMoveLocalDTO(DataClassJSONMixin):
     """Request model for moving a file (Device).
 
@@ -407,7 +407,7 @@ class FileMoveLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileMoveLocalVO(BaseResponse):
     """Response model for file move operation (Device).
 
@@ -423,7 +423,7 @@ class FileMoveLocalVO(BaseResponse):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class FileCopyLocalDTO(DataClassJSONMixin):
     """Request model for copying a file (Device).
 
@@ -440,7 +440,7 @@ class FileCopyLocalDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class FileCopyLocalVO(BaseResponse):
     """Response model for file copy operation (Device).
 
@@ -456,7 +456,7 @@ class FileCopyLocalVO(BaseResponse):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class TerminalFileUploadApplyDTO(DataClassJSONMixin):
     """Request model for initiating a terminal file upload.
 
@@ -478,7 +478,7 @@ class TerminalFileUploadApplyDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class TerminalFileUploadFinishDTO(DataClassJSONMixin):
     """Request model for completing a terminal file upload.
 
@@ -505,7 +505,7 @@ class TerminalFileUploadFinishDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class PdfDTO(DataClassJSONMixin):
     """Request model for converting a note to PDF.
 
@@ -522,7 +522,7 @@ class PdfDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class PdfVO(BaseResponse):
     """Response model for PDF conversion.
 
@@ -533,7 +533,7 @@ class PdfVO(BaseResponse):
     url: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PngDTO(DataClassJSONMixin):
     """Request model for converting a note to PNG.
 
@@ -547,7 +547,7 @@ class PngDTO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class PngPageVO(DataClassJSONMixin):
     """Object representing a single converted PNG page."""
 
@@ -558,7 +558,7 @@ class PngPageVO(DataClassJSONMixin):
         serialize_by_alias = True
 
 
-@dataclass
+@dataclass(slots=True)
 class PngVO(BaseResponse):
     """Response model for PNG conversion.
 
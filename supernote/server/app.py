@@ -23,6 +23,7 @@ from .constants import MAX_UPLOAD_SIZE
 from .db.models.user import UserDO
 from .db.session import DatabaseSessionManager
 from .events import LocalEventBus
+from .exceptions import error_middleware
 from .routes import (
     admin,
     auth,
@@ -45,9 +46,11 @@ from .services.processor_modules.gemini_ocr import GeminiOcrModule
 from .services.processor_modules.page_hashing import PageHashingModule
 from .services.processor_modules.png_conversion import PngConversionModule
 from .services.processor_modules.summary import SummaryModule
+from .services.registry import SERVICES_KEY, Services
 from .services.schedule import ScheduleService
 from .services.search import SearchService
 from .services.summary import SummaryService
+from .services.sync_lock import SyncLocks
 from .services.user import UserService
 from .utils.hashing import get_md5_hash
 from .utils.rate_limit import RateLimiter
@@ -288,7 +291,8 @@ def create_app(config: ServerConfig) -> web.Application:
     )
     app["user_service"] = user_service
     app["file_service"] = file_service
-    app["url_signer"] = UrlSigner(config.auth.secret_key, coordination_service)
+    url_signer = UrlSigner(config.auth.secret_key, coordination_service)
+    app["url_signer"] = url_signer
     app["schedule_service"] = ScheduleService(session_manager)
     gemini_service = GeminiService(
         config.gemini_api_key, max_concurrency=config.gemini_max_concurrency
@@ -301,7 +305,13 @@ def create_app(config: ServerConfig) -> web.Application:
     search_service = SearchService(session_manager, gemini_service, config)
     app["search_service"] = search_service
 
-    app["sync_locks"] = {}  # user -> (equipment_no, expiry_time)
+    sync_locks = SyncLocks()
+    app["sync_locks"] = sync_locks
+    app[SERVICES_KEY] = Services(
+        file_service=file_service,
+        url_signer=url_signer,
+        sync_locks=sync_locks,
+    )
     app["rate_limiter"] = RateLimiter(coordination_service)
 
     processor_service = ProcessorService(
@@ -366,6 +376,7 @@ def create_app(config: ServerConfig) -> web.Application:
         # Register trace and auth middlewares after proxy setup to avoid clone errors
         app.middlewares.append(trace_middleware)
         app.middlewares.append(jwt_auth_middleware)
+        app.middlewares.append(error_middleware)
 
         logger.info("Running database migrations...")
         await asyncio.to_thread(run_migrations, config.db_url)
@@ -394,6 +405,7 @@ def create_app(config: ServerConfig) -> web.Application:
 
         logger.info("Starting background services...")
         await processor_service.start()
+        await coordination_service.start()
         logger.info("Startup sequence complete.")
 
         app["mcp_task"] = mcp_task
@@ -409,6 +421,7 @@ def create_app(config: ServerConfig) -> web.Application:
                 pass
 
         await processor_service.stop()
+        await coordination_service.stop()
         await session_manager.close()
 
     app.on_shutdown.append(on_shutdown_handler)
@@ -1,19 +1,21 @@
 """Server constants."""
 
 # System directories that cannot be deleted or renamed
-IMMUTABLE_SYSTEM_DIRECTORIES = {
-    "Export",
-    "Inbox",
-    "Screenshot",
-    "Note",
-    "Document",
-    "MyStyle",
-    "NOTE",  # Category container
-    "DOCUMENT",  # Category container
-}
+IMMUTABLE_SYSTEM_DIRECTORIES = frozenset(
+    {
+        "Export",
+        "Inbox",
+        "Screenshot",
+        "Note",
+        "Document",
+        "MyStyle",
+        "NOTE",  # Category container
+        "DOCUMENT",  # Category container
+    }
+)
 
 # Category containers (hidden from web API)
-CATEGORY_CONTAINERS = {"NOTE", "DOCUMENT"}
+CATEGORY_CONTAINERS = frozenset({"NOTE", "DOCUMENT"})
 
 # Forced order and specific names for web API root (when flatten=True)
 ORDERED_WEB_ROOT = ["Note", "Document"]
@@ -22,5 +24,15 @@ ORDERED_WEB_ROOT = ["Note", "Document"]
 USER_DATA_BUCKET = "supernote-user-data"
 CACHE_BUCKET = "supernote-cache"
 
+# Storage capacity reported to clients. Quotas are not enforced.
+TOTAL_CAPACITY = 1024 * 1024 * 1024 * 10  # 10GB
+
 # Maximum upload size for file uploads
 MAX_UPLOAD_SIZE = 1024 * 1024 * 1024  # 1GB
+
+# Maximum size of a JSON request body
+MAX_JSON_BODY_SIZE = 16 * 1024 * 1024  # 16MB
+
+# JSON list responses with more items than this are streamed in batches
+JSON_STREAM_THRESHOLD = 1000
+JSON_STREAM_BATCH_SIZE = 500
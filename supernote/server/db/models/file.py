@@ -1,7 +1,7 @@
 import time
 from typing import Optional
 
-from sqlalchemy import BigInteger, Index, String
+from sqlalchemy import DDL, BigInteger, Index, String, event
 from sqlalchemy.orm import Mapped, mapped_column
 
 from supernote.server.db.base import Base
@@ -105,3 +105,36 @@ class RecycleFileDO(Base):
         BigInteger, default=lambda: int(time.time() * 1000)
     )
     """Delete time in epoch milliseconds."""
+
+
+FILE_NAME_FTS_TABLE = "f_user_file_fts"
+"""Full text index of `UserFileDO.file_name`, keyed by the file's id as rowid.
+
+The trigram tokenizer matches any substring of at least three characters,
+the same results as a case-insensitive LIKE '%keyword%'. The index is kept
+in sync with `f_user_file` by triggers.
+"""
+
+FILE_NAME_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FILE_NAME_FTS_TABLE} "
+    "USING fts5(file_name, tokenize='trigram')",
+    f"CREATE TRIGGER IF NOT EXISTS {FILE_NAME_FTS_TABLE}_ai "
+    "AFTER INSERT ON f_user_file BEGIN "
+    f"INSERT INTO {FILE_NAME_FTS_TABLE}(rowid, file_name) "
+    "VALUES (new.id, new.file_name); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FILE_NAME_FTS_TABLE}_ad "
+    "AFTER DELETE ON f_user_file BEGIN "
+    f"DELETE FROM {FILE_NAME_FTS_TABLE} WHERE rowid = old.id; END",
+    f"CREATE TRIGGER IF NOT EXISTS {FILE_NAME_FTS_TABLE}_au "
+    "AFTER UPDATE OF file_name ON f_user_file BEGIN "
+    f"UPDATE {FILE_NAME_FTS_TABLE} SET file_name = new.file_name "
+    "WHERE rowid = old.id; END",
+]
+"""Statements creating the file name index. Also applied by migration."""
+
+for _statement in FILE_NAME_FTS_DDL:
+    event.listen(
+        UserFileDO.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),  # type: ignore[no-untyped-call]
+    )
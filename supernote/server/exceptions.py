@@ -1,11 +1,12 @@
 """Module for centralized exception handling."""
 
 import logging
-from typing import Self
+from typing import Awaitable, Callable, Self
 
 from aiohttp import web
 
 from supernote.models.base import BaseResponse, ErrorCode
+from supernote.server.utils.json_utils import STREAMED_RESPONSE_KEY, json_response
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +29,12 @@ class SupernoteError(Exception):
 
     def to_response(self) -> web.Response:
         """Convert the error to an aiohttp web response."""
-        return web.json_response(
+        return json_response(
             BaseResponse(
                 success=False,
                 error_code=self.error_code,
                 error_msg=self.message,
-            ).to_dict(),
+            ),
             status=self.status_code,
         )
 
@@ -44,6 +45,31 @@ class SupernoteError(Exception):
         return cls(str(err), error_code=ErrorCode.INTERNAL_ERROR, status_code=500)
 
 
+@web.middleware
+async def error_middleware(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> web.StreamResponse:
+    """Convert exceptions raised by handlers into JSON error responses.
+
+    `SupernoteError` uses its own status and error code, and any other
+    exception becomes an internal error. aiohttp HTTP exceptions and client
+    disconnects are left for aiohttp to handle, as are errors raised after a
+    streamed response was started, since a second response would be written
+    into the body already being sent.
+    """
+    try:
+        return await handler(request)
+    except (web.HTTPException, ConnectionResetError):
+        raise
+    except Exception as err:
+        if request.get(STREAMED_RESPONSE_KEY):
+            raise
+        if isinstance(err, SupernoteError):
+            return err.to_response()
+        return SupernoteError.uncaught(err).to_response()
+
+
 class FileError(SupernoteError):
     """Base class for file-related errors."""
 
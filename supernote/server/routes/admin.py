@@ -8,6 +8,7 @@ from supernote.models.base import BaseResponse, create_error_response
 from supernote.models.user import UserRegisterDTO
 from supernote.server.exceptions import SupernoteError
 from supernote.server.services.user import UserService
+from supernote.server.utils.json_utils import read_json
 
 routes = web.RouteTableDef()
 
@@ -41,7 +42,7 @@ def require_admin(
 @require_admin
 async def handle_create_user(request: web.Request) -> web.Response:
     """Create a new user (Admin only)."""
-    req_data = await request.json()
+    req_data = await read_json(request)
     try:
         dto = UserRegisterDTO.from_dict(req_data)
     except (MissingField, ValueError):
@@ -62,7 +63,7 @@ async def handle_create_user(request: web.Request) -> web.Response:
 @require_admin
 async def handle_admin_update_password(request: web.Request) -> web.Response:
     """Update any user's password (Admin only)."""
-    req_data = await request.json()
+    req_data = await read_json(request)
     # We reuse UpdatePasswordDTO but only look at the email and
     # new password fields.
     email = req_data.get("email")
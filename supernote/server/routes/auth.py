@@ -20,6 +20,7 @@ from supernote.models.user import (
 )
 from supernote.server.exceptions import SupernoteError
 from supernote.server.services.user import UserService
+from supernote.server.utils.json_utils import read_json
 from supernote.server.utils.rate_limit import (
     LIMIT_LOGIN_ACCOUNT_MAX,
     LIMIT_LOGIN_ACCOUNT_WINDOW,
@@ -44,7 +45,7 @@ routes = web.RouteTableDef()
 async def handle_equipment_unlink(request: web.Request) -> web.Response:
     # Endpoint: POST /api/terminal/equipment/unlink
     # Purpose: Device requests to unlink itself from the account/server.
-    req_data = await request.json()
+    req_data = await read_json(request)
     try:
         unlink_req = UnbindEquipmentDTO.from_dict(req_data)
     except (MissingField, ValueError):
@@ -63,7 +64,7 @@ async def handle_equipment_unlink(request: web.Request) -> web.Response:
 async def handle_check_user_exists(request: web.Request) -> web.Response:
     # Endpoint: POST /api/official/user/check/exists/server
     # Purpose: Check if the user exists on this server.
-    req_data = await request.json()
+    req_data = await read_json(request)
     user_check_req = UserCheckDTO.from_dict(req_data)
     user_service: UserService = request.app["user_service"]
     if await user_service.check_user_exists(user_check_req.email or ""):
@@ -86,7 +87,7 @@ async def handle_query_token(request: web.Request) -> web.Response:
 async def handle_random_code(request: web.Request) -> web.Response:
     # Endpoint: POST /api/official/user/query/random/code
     # Purpose: Get challenge for password hashing
-    req_data = await request.json()
+    req_data = await read_json(request)
     code_req = RandomCodeDTO.from_dict(req_data)
     user_service: UserService = request.app["user_service"]
     random_code, timestamp = await user_service.generate_random_code(code_req.account)
@@ -102,7 +103,7 @@ async def handle_login(request: web.Request) -> web.Response:
     # Endpoint: POST /api/official/user/account/login/new
     # Purpose: Login with hashed password
     user_service: UserService = request.app["user_service"]
-    req_data = await request.json()
+    req_data = await read_json(request)
     login_req = LoginDTO.from_dict(req_data)
 
     # Extract IP if possible
@@ -146,7 +147,7 @@ async def handle_login(request: web.Request) -> web.Response:
 async def handle_bind_equipment(request: web.Request) -> web.Response:
     # Endpoint: POST /api/terminal/user/bindEquipment
     # Purpose: Bind the device to the account.
-    req_data = await request.json()
+    req_data = await read_json(request)
     try:
         bind_req = BindEquipmentDTO.from_dict(req_data)
     except (MissingField, ValueError):
@@ -191,7 +192,7 @@ async def handle_register(request: web.Request) -> web.Response:
     """Register a new user."""
     # Endpoint: POST /api/user/register
 
-    req_data = await request.json()
+    req_data = await read_json(request)
     try:
         dto = UserRegisterDTO.from_dict(req_data)
     except (MissingField, ValueError) as e:
@@ -233,7 +234,7 @@ async def handle_update_password(request: web.Request) -> web.Response:
             create_error_response("Unauthorized").to_dict(), status=401
         )
 
-    req_data = await request.json()
+    req_data = await read_json(request)
     dto = UpdatePasswordDTO.from_dict(req_data)
     user_service: UserService = request.app["user_service"]
     await user_service.update_password(str(account), dto)
@@ -249,7 +250,7 @@ async def handle_update_email(request: web.Request) -> web.Response:
             create_error_response("Unauthorized").to_dict(), status=401
         )
 
-    req_data = await request.json()
+    req_data = await read_json(request)
     dto = UpdateEmailDTO.from_dict(req_data)
     user_service: UserService = request.app["user_service"]
     await user_service.update_email(str(account), dto)
@@ -266,8 +267,7 @@ async def handle_retrieve_password(request: web.Request) -> web.Response:
             status=403,
         )
 
-    req_data = await request.json()
-    req_data = await request.json()
+    req_data = await read_json(request)
     dto = RetrievePasswordDTO.from_dict(req_data)
     user_service: UserService = request.app["user_service"]
 
@@ -313,7 +313,7 @@ async def handle_login_record(request: web.Request) -> web.Response:
             create_error_response("Unauthorized").to_dict(), status=401
         )
 
-    req_data = await request.json()
+    req_data = await read_json(request)
     dto = LoginRecordDTO.from_dict(req_data)
     user_service: UserService = request.app["user_service"]
 
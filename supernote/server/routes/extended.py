@@ -28,6 +28,7 @@ from supernote.server.exceptions import SupernoteError
 from supernote.server.services.search import SearchService
 from supernote.server.services.summary import SummaryService
 from supernote.server.services.user import UserService
+from supernote.server.utils.json_utils import read_json
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +41,7 @@ async def handle_extended_file_summary_list(request: web.Request) -> web.Respons
     # Purpose: Extended API to list summaries for a file.
     user_email = request["user"]
     try:
-        data = await request.json()
+        data = await read_json(request)
     except Exception:
         return web.json_response({"error": "Invalid JSON"}, status=400)
 
@@ -103,7 +104,7 @@ async def handle_file_processing_status(request: web.Request) -> web.Response:
     # Purpose: Get aggregated processing status for a list of files.
 
     try:
-        data = await request.json()
+        data = await read_json(request)
         req_dto = FileProcessingStatusDTO.from_dict(data)
     except Exception as e:
         return web.json_response({"error": f"Invalid Request: {e}"}, status=400)
@@ -152,7 +153,7 @@ async def handle_extended_search(request: web.Request) -> web.Response:
     # Purpose: Semantic search across notebook content.
     user_email = request["user"]
     try:
-        data = await request.json()
+        data = await read_json(request)
         req_dto = WebSearchRequestDTO.from_dict(data)
     except Exception as e:
         return web.json_response({"error": f"Invalid Request: {e}"}, status=400)
@@ -199,7 +200,7 @@ async def handle_extended_transcript(request: web.Request) -> web.Response:
     # Purpose: Retrieve notebook transcript.
     user_email = request["user"]
     try:
-        data = await request.json()
+        data = await read_json(request)
         req_dto = WebTranscriptRequestDTO.from_dict(data)
     except Exception as e:
         return web.json_response({"error": f"Invalid Request: {e}"}, status=400)
@@ -1,6 +1,5 @@
 import logging
-import time
-import urllib.parse
+from typing import Any
 
 from aiohttp import web
 
@@ -28,7 +27,6 @@ from supernote.models.file_device import (
     FileUploadFinishLocalDTO,
     FileUploadFinishLocalVO,
     ListFolderLocalDTO,
-    ListFolderLocalVO,
     ListFolderV2DTO,
     MetadataVO,
     PdfDTO,
@@ -41,17 +39,39 @@ from supernote.models.file_device import (
     SynchronousStartLocalDTO,
     SynchronousStartLocalVO,
 )
+from supernote.server.constants import TOTAL_CAPACITY
 from supernote.server.exceptions import SupernoteError
-from supernote.server.services.file import (
-    FileEntity,
-    FileService,
+from supernote.server.services.file import FileEntity
+from supernote.server.services.registry import get_services
+from supernote.server.utils.json_utils import (
+    dumps,
+    json_list_response,
+    json_response,
+    read_json,
+)
+from supernote.server.utils.paths import (
+    absolute_url,
+    generate_inner_name,
+    quote_path,
 )
-from supernote.server.utils.paths import generate_inner_name
 from supernote.server.utils.url_signer import UrlSigner
 
 logger = logging.getLogger(__name__)
 routes = web.RouteTableDef()
 
+_SYNC_END_BODY = dumps(SynchronousEndLocalVO())
+_SYNC_CONFLICT_BODY = dumps(
+    create_error_response(
+        error_msg="Another device is synchronizing",
+        error_code="E0078",
+    )
+)
+_MISSING_INNER_NAME_BODY = dumps(
+    create_error_response("Invalid upload missing inner name")
+)
+_MISSING_MD5_BODY = dumps(create_error_response(error_msg="Invalid upload missing md5"))
+_FILE_NOT_FOUND_BODY = dumps(BaseResponse(success=False, error_msg="File not found"))
+
 
 def _to_entries_vo(entity: FileEntity) -> EntriesVO:
     """Convert FileEntity to EntriesVO."""
@@ -68,7 +88,40 @@ def _to_entries_vo(entity: FileEntity) -> EntriesVO:
     )
 
 
-SYNC_LOCK_TIMEOUT = 300  # 5 minutes
+def _to_entry_dict(entity: FileEntity) -> dict[str, Any]:
+    """Build the EntriesVO wire format directly from an entity.
+
+    Folder listings can hold thousands of entries, so this skips creating an
+    EntriesVO and calling its `to_dict()` for every entry. The keys must be
+    kept in sync with `EntriesVO`.
+    """
+    return {
+        "id": str(entity.id),
+        "name": entity.name,
+        "tag": entity.tag,
+        "path_display": entity.full_path,
+        "content_hash": entity.md5 or "",
+        "is_downloadable": True,
+        "size": entity.size,
+        "lastUpdateTime": entity.update_time,
+        "parent_path": entity.parent_path,
+    }
+
+
+async def _list_folder_response(
+    request: web.Request, equipment_no: str, entities: list[FileEntity]
+) -> web.StreamResponse:
+    """Return the ListFolderLocalVO wire format for the entities.
+
+    The keys must be kept in sync with `ListFolderLocalVO`.
+    """
+    return await json_list_response(
+        request,
+        {"success": True, "equipmentNo": equipment_no},
+        "entries",
+        entities,
+        _to_entry_dict,
+    )
 
 
 @routes.post("/api/file/2/files/synchronous/start")
@@ -76,37 +129,23 @@ async def handle_sync_start(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/2/files/synchronous/start
     # Purpose: Start a file synchronization session.
     # Response: SynchronousStartLocalVO
-    req_data = SynchronousStartLocalDTO.from_dict(await request.json())
+    req_data = SynchronousStartLocalDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    sync_locks = request.app["sync_locks"]
-    sync_locks = request.app["sync_locks"]
-    file_service: FileService = request.app["file_service"]
+    services = get_services(request)
+    sync_locks = services.sync_locks
+    file_service = services.file_service
 
     try:
         is_empty = await file_service.is_empty(user_email)
 
-        now = time.time()
-        if user_email in sync_locks:
-            owner_eq, expiry = sync_locks[user_email]
-            if now < expiry and owner_eq != req_data.equipment_no:
-                logger.info(
-                    f"Sync conflict: user {user_email} already syncing from {owner_eq}"
-                )
-                return web.json_response(
-                    create_error_response(
-                        error_msg="Another device is synchronizing",
-                        error_code="E0078",
-                    ).to_dict(),
-                    status=409,
-                )
-
-        sync_locks[user_email] = (req_data.equipment_no, now + SYNC_LOCK_TIMEOUT)
-
-        return web.json_response(
+        if not await sync_locks.acquire(user_email, req_data.equipment_no):
+            return json_response(_SYNC_CONFLICT_BODY, status=409)
+
+        return json_response(
             SynchronousStartLocalVO(
                 equipment_no=req_data.equipment_no,
                 syn_type=not is_empty,
-            ).to_dict()
+            )
         )
     except SupernoteError as err:
         return err.to_response()
@@ -119,29 +158,25 @@ async def handle_sync_end(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/2/files/synchronous/end
     # Purpose: End a file synchronization session.
     # Response: SynchronousEndLocalVO
-    req_data = SynchronousEndLocalDTO.from_dict(await request.json())
+    req_data = SynchronousEndLocalDTO.from_dict(await read_json(request))
     user_email = request["user"]
 
     # Release lock
-    sync_locks = request.app["sync_locks"]
-    if user_email in sync_locks:
-        owner_eq, _ = sync_locks[user_email]
-        if owner_eq == req_data.equipment_no:
-            del sync_locks[user_email]
+    await get_services(request).sync_locks.release(user_email, req_data.equipment_no)
 
-    return web.json_response(SynchronousEndLocalVO().to_dict())
+    return json_response(_SYNC_END_BODY)
 
 
 @routes.post("/api/file/2/files/list_folder")
-async def handle_list_folder(request: web.Request) -> web.Response:
+async def handle_list_folder(request: web.Request) -> web.StreamResponse:
     # Endpoint: POST /api/file/2/files/list_folder
     # Purpose: List folders for sync selection.
     # Response: ListFolderLocalVO
 
-    req_data = ListFolderV2DTO.from_dict(await request.json())
+    req_data = ListFolderV2DTO.from_dict(await read_json(request))
     path_str = req_data.path
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         entities = await file_service.list_folder(
@@ -149,13 +184,7 @@ async def handle_list_folder(request: web.Request) -> web.Response:
             path_str,
             req_data.recursive,
         )
-        entries = [_to_entries_vo(e) for e in entities]
-
-        return web.json_response(
-            ListFolderLocalVO(
-                equipment_no=req_data.equipment_no, entries=entries
-            ).to_dict()
-        )
+        return await _list_folder_response(request, req_data.equipment_no, entities)
     except SupernoteError as err:
         return err.to_response()
     except Exception as err:
@@ -163,15 +192,15 @@ async def handle_list_folder(request: web.Request) -> web.Response:
 
 
 @routes.post("/api/file/3/files/list_folder_v3")
-async def handle_list_folder_v3(request: web.Request) -> web.Response:
+async def handle_list_folder_v3(request: web.Request) -> web.StreamResponse:
     # Endpoint: POST /api/file/3/files/list_folder_v3
     # Purpose: List folders by ID (Device V3).
     # Response: ListFolderLocalVO
 
-    req_data = ListFolderLocalDTO.from_dict(await request.json())
+    req_data = ListFolderLocalDTO.from_dict(await read_json(request))
     folder_id = req_data.id
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         entities = await file_service.list_folder_by_id(
@@ -179,13 +208,7 @@ async def handle_list_folder_v3(request: web.Request) -> web.Response:
             folder_id,
             req_data.recursive,
         )
-        entries = [_to_entries_vo(e) for e in entities]
-
-        return web.json_response(
-            ListFolderLocalVO(
-                equipment_no=req_data.equipment_no, entries=entries
-            ).to_dict()
-        )
+        return await _list_folder_response(request, req_data.equipment_no, entities)
     except SupernoteError as err:
         return err.to_response()
     except Exception as err:
@@ -198,23 +221,23 @@ async def handle_capacity_query(request: web.Request) -> web.Response:
     # Purpose: Get storage capacity usage.
     # Response: CapacityLocalVO
 
-    req_data = await request.json()
+    req_data = await read_json(request)
     equipment_no = req_data.get("equipmentNo", "")
     user_email = request["user"]
 
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
     try:
         used = await file_service.get_storage_usage(user_email)
 
-        return web.json_response(
+        return json_response(
             CapacityLocalVO(
                 equipment_no=equipment_no,
                 used=used,
                 allocation_vo=AllocationVO(
                     tag="personal",
-                    allocated=1024 * 1024 * 1024 * 10,  # 10GB total
+                    allocated=TOTAL_CAPACITY,
                 ),
-            ).to_dict()
+            )
         )
     except SupernoteError as err:
         return err.to_response()
@@ -228,18 +251,18 @@ async def handle_query_by_path(request: web.Request) -> web.Response:
     # Purpose: Check if a file exists by path (Device).
     # Response: FileQueryByPathLocalVO
 
-    req_data = FileQueryByPathLocalDTO.from_dict(await request.json())
+    req_data = FileQueryByPathLocalDTO.from_dict(await read_json(request))
     path_str = req_data.path
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         entity = await file_service.get_file_info(user_email, path_str)
-        return web.json_response(
+        return json_response(
             FileQueryByPathLocalVO(
                 equipment_no=req_data.equipment_no,
                 entries_vo=_to_entries_vo(entity) if entity else None,
-            ).to_dict()
+            )
         )
     except SupernoteError as err:
         return err.to_response()
@@ -253,18 +276,18 @@ async def handle_query_v3(request: web.Request) -> web.Response:
     # Purpose: Get file details by ID (Device).
     # Response: FileQueryLocalVO
 
-    req_data = FileQueryLocalDTO.from_dict(await request.json())
+    req_data = FileQueryLocalDTO.from_dict(await read_json(request))
     file_id = req_data.id
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         entity = await file_service.get_file_info_by_id(user_email, int(file_id))
-        return web.json_response(
+        return json_response(
             FileQueryLocalVO(
                 equipment_no=req_data.equipment_no,
                 entries_vo=_to_entries_vo(entity) if entity else None,
-            ).to_dict()
+            )
         )
     except SupernoteError as err:
         return err.to_response()
@@ -278,20 +301,20 @@ async def handle_upload_apply(request: web.Request) -> web.Response:
     # Purpose: Request to upload a file.
     # Response: FileUploadApplyLocalVO
 
-    req_data = FileUploadApplyLocalDTO.from_dict(await request.json())
+    req_data = FileUploadApplyLocalDTO.from_dict(await read_json(request))
     file_name = req_data.file_name
 
     try:
-        url_signer: UrlSigner = request.app["url_signer"]
+        url_signer = get_services(request).url_signer
 
         # Generate a unique inner name for storage
         inner_name = generate_inner_name(file_name, req_data.equipment_no)
-        encoded_name = urllib.parse.quote(inner_name)
+        encoded_name = quote_path(inner_name)
 
         # Simple Upload URL: /api/oss/upload?path={name}&timestamp={ms}
         simple_path = f"/api/oss/upload?path={encoded_name}"
         full_upload_url_path = await url_signer.sign(simple_path, user=request["user"])
-        full_upload_url = f"{request.scheme}://{request.host}{full_upload_url_path}"
+        full_upload_url = absolute_url(request, full_upload_url_path)
 
         # Extract signature and timestamp using UrlSigner helpers
         signature = UrlSigner.extract_signature(full_upload_url_path)
@@ -303,9 +326,9 @@ async def handle_upload_apply(request: web.Request) -> web.Response:
         # Client will append &uploadId=...&partNumber=...
         part_path = f"/api/oss/upload/part?path={encoded_name}"
         part_upload_url_path = await url_signer.sign(part_path, user=request["user"])
-        part_upload_url = f"{request.scheme}://{request.host}{part_upload_url_path}"
+        part_upload_url = absolute_url(request, part_upload_url_path)
 
-        return web.json_response(
+        return json_response(
             FileUploadApplyLocalVO(
                 equipment_no=req_data.equipment_no or "",
                 bucket_name=file_name,  # Reference impl checks this matches filename
@@ -314,7 +337,7 @@ async def handle_upload_apply(request: web.Request) -> web.Response:
                 authorization=signature,
                 full_upload_url=full_upload_url,
                 part_upload_url=part_upload_url,
-            ).to_dict()
+            )
         )
     except SupernoteError as err:
         return err.to_response()
@@ -328,15 +351,12 @@ async def handle_upload_finish(request: web.Request) -> web.Response:
     # Purpose: Confirm upload completion and move file to final location.
     # Response: FileUploadFinishLocalVO
 
-    req_data = FileUploadFinishLocalDTO.from_dict(await request.json())
+    req_data = FileUploadFinishLocalDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     if not req_data.inner_name:
-        return web.json_response(
-            create_error_response("Invalid upload missing inner name").to_dict(),
-            status=400,
-        )
+        return json_response(_MISSING_INNER_NAME_BODY, status=400)
 
     try:
         entity = await file_service.finish_upload(
@@ -351,12 +371,9 @@ async def handle_upload_finish(request: web.Request) -> web.Response:
     except Exception as err:
         return SupernoteError.uncaught(err).to_response()
     if not entity.md5:
-        return web.json_response(
-            create_error_response(error_msg="Invalid upload missing md5").to_dict(),
-            status=500,
-        )
+        return json_response(_MISSING_MD5_BODY, status=500)
 
-    return web.json_response(
+    return json_response(
         FileUploadFinishLocalVO(
             equipment_no=req_data.equipment_no or "",
             path_display=entity.full_path,
@@ -364,7 +381,7 @@ async def handle_upload_finish(request: web.Request) -> web.Response:
             size=entity.size,
             name=entity.name,
             content_hash=entity.md5 or "",
-        ).to_dict()
+        )
     )
 
 
@@ -374,36 +391,34 @@ async def handle_download_apply(request: web.Request) -> web.Response:
     # Purpose: Request a download URL for a file.
     # Response: FileDownloadLocalVO
 
-    req_data = FileDownloadLocalDTO.from_dict(await request.json())
+    req_data = FileDownloadLocalDTO.from_dict(await read_json(request))
     file_id = int(req_data.id)
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    services = get_services(request)
+    file_service = services.file_service
 
     try:
         # Verify file exists using VFS
         info = await file_service.get_file_info_by_id(user_email, file_id)
         if not info:
-            return web.json_response(
-                BaseResponse(success=False, error_msg="File not found").to_dict(),
-                status=404,
-            )
+            return json_response(_FILE_NOT_FOUND_BODY, status=404)
 
         # Generate signed download URL
-        url_signer: UrlSigner = request.app["url_signer"]
+        url_signer = services.url_signer
 
         # OSS download URL: /api/oss/download?path={id}
         path_to_sign = f"/api/oss/download?path={info.id}"
 
         # helper returns: ...?signature=...
         signed_path = await url_signer.sign(path_to_sign, user=user_email)
-        download_url = f"{request.scheme}://{request.host}{signed_path}"
+        download_url = absolute_url(request, signed_path)
 
     except SupernoteError as err:
         return err.to_response()
     except Exception as err:
         return SupernoteError.uncaught(err).to_response()
 
-    return web.json_response(
+    return json_response(
         FileDownloadLocalVO(
             equipment_no=req_data.equipment_no,
             url=download_url,
@@ -413,7 +428,7 @@ async def handle_download_apply(request: web.Request) -> web.Response:
             content_hash=info.md5 or "",
             size=info.size,
             is_downloadable=True,
-        ).to_dict()
+        )
     )
 
 
@@ -432,9 +447,9 @@ async def handle_create_folder(request: web.Request) -> web.Response:
     # Purpose: Create a new folder.
     # Response: CreateFolderLocalVO
 
-    req_data = CreateFolderLocalDTO.from_dict(await request.json())
+    req_data = CreateFolderLocalDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         entry = await file_service.create_directory(user_email, req_data.path)
@@ -442,11 +457,11 @@ async def handle_create_folder(request: web.Request) -> web.Response:
         return err.to_response()
     except Exception as err:
         return SupernoteError.uncaught(err).to_response()
-    return web.json_response(
+    return json_response(
         CreateFolderLocalVO(
             equipment_no=req_data.equipment_no,
             metadata=_to_metadata_vo(entry),
-        ).to_dict()
+        )
     )
 
 
@@ -456,9 +471,9 @@ async def handle_delete_folder(request: web.Request) -> web.Response:
     # Purpose: Delete a file or folder.
     # Response: DeleteFolderLocalVO
 
-    req_data = DeleteFolderLocalDTO.from_dict(await request.json())
+    req_data = DeleteFolderLocalDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         deleted_item = await file_service.delete_item(
@@ -470,11 +485,11 @@ async def handle_delete_folder(request: web.Request) -> web.Response:
     except Exception as err:
         return SupernoteError.uncaught(err).to_response()
 
-    return web.json_response(
+    return json_response(
         DeleteFolderLocalVO(
             equipment_no=req_data.equipment_no,
             metadata=_to_metadata_vo(deleted_item),
-        ).to_dict()
+        )
     )
 
 
@@ -484,9 +499,9 @@ async def handle_move_file(request: web.Request) -> web.Response:
     # Purpose: Move a file or folder.
     # Response: FileMoveLocalVO
 
-    req_data = FileMoveLocalDTO.from_dict(await request.json())
+    req_data = FileMoveLocalDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         result = await file_service.move_item(
@@ -499,11 +514,11 @@ async def handle_move_file(request: web.Request) -> web.Response:
         return err.to_response()
     except Exception as err:
         return SupernoteError.uncaught(err).to_response()
-    return web.json_response(
+    return json_response(
         FileMoveLocalVO(
             equipment_no=req_data.equipment_no,
             entries_vo=_to_entries_vo(result),
-        ).to_dict()
+        )
     )
 
 
@@ -513,9 +528,9 @@ async def handle_copy_file(request: web.Request) -> web.Response:
     # Purpose: Copy a file or folder.
     # Response: FileCopyLocalVO
 
-    req_data = FileCopyLocalDTO.from_dict(await request.json())
+    req_data = FileCopyLocalDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
     try:
         result = await file_service.copy_item(
@@ -528,11 +543,11 @@ async def handle_copy_file(request: web.Request) -> web.Response:
         return err.to_response()
     except Exception as err:
         return SupernoteError.uncaught(err).to_response()
-    return web.json_response(
+    return json_response(
         FileCopyLocalVO(
             equipment_no=req_data.equipment_no,
             entries_vo=_to_entries_vo(result),
-        ).to_dict()
+        )
     )
 
 
@@ -541,10 +556,11 @@ async def handle_note_to_png(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/note/to/png
     # Purpose: Convert a note to PNG.
     # Response: PngVO
-    req_data = PngDTO.from_dict(await request.json())
+    req_data = PngDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
-    url_signer: UrlSigner = request.app["url_signer"]
+    services = get_services(request)
+    file_service = services.file_service
+    url_signer = services.url_signer
 
     try:
         results = await file_service.convert_note_to_png(user_email, req_data.id)
@@ -555,11 +571,11 @@ async def handle_note_to_png(request: web.Request) -> web.Response:
             # Here storage_key is already the full path within bucket
             path_to_sign = f"/api/oss/download?path={res.storage_key}"
             signed_path = await url_signer.sign(path_to_sign, user=user_email)
-            download_url = f"{request.scheme}://{request.host}{signed_path}"
+            download_url = absolute_url(request, signed_path)
 
             png_pages.append(PngPageVO(page_no=res.page_no, url=download_url))
 
-        return web.json_response(PngVO(png_page_vo_list=png_pages).to_dict())
+        return json_response(PngVO(png_page_vo_list=png_pages))
     except SupernoteError as err:
         return err.to_response()
     except Exception as err:
@@ -571,10 +587,11 @@ async def handle_note_to_pdf(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/note/to/pdf
     # Purpose: Convert a note to PDF.
     # Response: PdfVO
-    req_data = PdfDTO.from_dict(await request.json())
+    req_data = PdfDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
-    url_signer: UrlSigner = request.app["url_signer"]
+    services = get_services(request)
+    file_service = services.file_service
+    url_signer = services.url_signer
 
     try:
         storage_key = await file_service.convert_note_to_pdf(
@@ -584,9 +601,9 @@ async def handle_note_to_pdf(request: web.Request) -> web.Response:
         # Generate signed URL for PDF
         path_to_sign = f"/api/oss/download?path={storage_key}"
         signed_path = await url_signer.sign(path_to_sign, user=user_email)
-        download_url = f"{request.scheme}://{request.host}{signed_path}"
+        download_url = absolute_url(request, signed_path)
 
-        return web.json_response(PdfVO(url=download_url).to_dict())
+        return json_response(PdfVO(url=download_url))
     except SupernoteError as err:
         return err.to_response()
     except Exception as err:
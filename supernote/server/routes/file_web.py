@@ -1,8 +1,8 @@
+import heapq
 import logging
-import urllib.parse
+import operator
 import uuid
-from pathlib import Path
-from typing import TypeVar
+from typing import Any, TypeVar
 
 from aiohttp import web
 
@@ -13,7 +13,6 @@ from supernote.models.base import (
 from supernote.models.file_common import FileUploadApplyLocalVO
 from supernote.models.file_web import (
     CapacityVO,
-    EntriesVO,
     FileDeleteDTO,
     FileLabelSearchDTO,
     FileLabelSearchVO,
@@ -34,27 +33,40 @@ from supernote.models.file_web import (
     RecycleFileDTO,
     RecycleFileListDTO,
     RecycleFileListVO,
-    RecycleFileVO,
-    UserFileVO,
 )
 from supernote.server.constants import (
     CATEGORY_CONTAINERS,
     IMMUTABLE_SYSTEM_DIRECTORIES,
     ORDERED_WEB_ROOT,
+    TOTAL_CAPACITY,
 )
-from supernote.server.exceptions import SupernoteError
 from supernote.server.services.file import (
     FileEntity,
-    FileService,
     FolderDetail,
     RecycleEntity,
 )
+from supernote.server.services.registry import get_services
+from supernote.server.utils.json_utils import (
+    dumps,
+    json_list_response,
+    json_response,
+    read_json,
+)
+from supernote.server.utils.paths import absolute_url, file_suffixes, quote_path
 
 logger = logging.getLogger(__name__)
 routes = web.RouteTableDef()
 
+_SUCCESS_BODY = dumps(BaseResponse(success=True))
+
 _T = TypeVar("_T", bound=(FileEntity | RecycleEntity))
 
+_SORT_BY_TIME = operator.attrgetter("sort_time")
+_SORT_KEYS = {
+    FileSortOrder.FILENAME: operator.attrgetter("name"),
+    FileSortOrder.SIZE: operator.attrgetter("size"),
+}
+
 
 def _sort_and_page(
     items: list[_T],
@@ -68,31 +80,90 @@ def _sort_and_page(
     Returns:
         tuple[list[_T], int]: the page of items and the total number of items.
     """
-    # Sorting
-    reverse = sequence.lower() == FileSortSequence.DESC
-    if order == FileSortOrder.FILENAME:
-        items.sort(key=lambda x: x.name, reverse=reverse)
-    elif order == FileSortOrder.SIZE:
-        items.sort(key=lambda x: x.size, reverse=reverse)
-    else:  # time
-        items.sort(key=lambda x: x.sort_time, reverse=reverse)
-
-    # Pagination
     total = len(items)
     start = (page_no - 1) * page_size
     end = start + page_size
-    page_items = items[start:end]
-    return page_items, total
+    key = _SORT_KEYS.get(order, _SORT_BY_TIME)
+    reverse = sequence.lower() == FileSortSequence.DESC
 
+    # Only the items up to the end of the page need to be ordered. The heapq
+    # selections match a stable sort, so pages stay consistent either way.
+    if end * 4 < total:
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        return select(end, items, key=key)[start:], total
 
-def _flatten_path(path: str) -> str:
-    """Flatten paths for items inside category containers (e.g., NOTE/Note -> Note)."""
+    items.sort(key=key, reverse=reverse)
+    return items[start:end], total
 
+
+def _flatten_path(path: str) -> tuple[str, str]:
+    """Flatten paths for items inside category containers (e.g., NOTE/Note -> Note).
+
+    Returns the flattened path and its parent path, which is empty for items
+    at the root.
+    """
     path_parts = path.strip("/").split("/")
     if len(path_parts) >= 2 and path_parts[0] in CATEGORY_CONTAINERS:
         # Convert NOTE/Note/Sub -> Note/Sub
-        return "/".join(path_parts[1:])
-    return path
+        del path_parts[0]
+        path = "/".join(path_parts)
+    return path, "/".join(path_parts[:-1])
+
+
+def _to_search_entry_dict(entity: FileEntity) -> dict[str, Any]:
+    """Build the EntriesVO wire format for a search result.
+
+    The keys must be kept in sync with `EntriesVO`.
+    """
+    # Web API expects flattened paths for system directories
+    path_display, parent_path = _flatten_path(entity.full_path)
+
+    return {
+        "id": str(entity.id),
+        "name": entity.name,
+        "tag": "folder" if entity.is_folder else "file",
+        "path_display": path_display,
+        "content_hash": entity.md5 or "",
+        "is_downloadable": True,
+        "size": entity.size,
+        "lastUpdateTime": entity.update_time,
+        "parent_path": parent_path,
+    }
+
+
+def _to_user_file_dict(entity: FileEntity) -> dict[str, Any]:
+    """Build the UserFileVO wire format for a listed file.
+
+    Pages can hold hundreds of entries, so this skips creating a UserFileVO
+    and calling its `to_dict()` for each one. The keys must be kept in sync
+    with `UserFileVO`.
+    """
+    return {
+        "id": str(entity.id),
+        "directoryId": str(entity.parent_id),
+        "fileName": entity.name,
+        "size": entity.size,
+        "md5": entity.md5,
+        "innerName": entity.storage_key,
+        "isFolder": BooleanEnum.YES.value if entity.is_folder else BooleanEnum.NO.value,
+        "createTime": entity.create_time,
+        "updateTime": entity.update_time,
+    }
+
+
+def _to_recycle_file_dict(item: RecycleEntity) -> dict[str, Any]:
+    """Build the RecycleFileVO wire format for a recycle bin item.
+
+    The keys must be kept in sync with `RecycleFileVO`.
+    """
+    return {
+        # Recycle ID, not Original File ID? Client usually wants ID to action on.
+        "fileId": str(item.id),
+        "isFolder": "Y" if item.is_folder else "N",
+        "fileName": item.name,
+        "updateTime": str(item.delete_time),
+        "size": item.size,
+    }
 
 
 @routes.post("/api/file/capacity/query")
@@ -102,21 +173,16 @@ async def handle_capacity_query_cloud(request: web.Request) -> web.Response:
     # Response: CapacityVO
 
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        # TODO: Implement quota properly
-        used = await file_service.get_storage_usage(user_email)
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
-
-    return web.json_response(
+    # TODO: Implement quota properly
+    used = await file_service.get_storage_usage(user_email)
+
+    return json_response(
         CapacityVO(
             used_capacity=used,
-            total_capacity=1024 * 1024 * 1024 * 10,  # 10GB total
-        ).to_dict()
+            total_capacity=TOTAL_CAPACITY,
+        )
     )
 
 
@@ -125,42 +191,21 @@ async def handle_recycle_list(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/recycle/list/query
     # Purpose: List files in recycle bin.
 
-    req_data = RecycleFileListDTO.from_dict(await request.json())
+    req_data = RecycleFileListDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
-
-    try:
-        recycle_files = await file_service.list_recycle(
-            user_email,
-        )
-
-        page_items, total = _sort_and_page(
-            recycle_files,
-            req_data.sequence,
-            req_data.order,
-            req_data.page_no,
-            req_data.page_size,
-        )
-
-        result_items = []
-        for item in page_items:
-            result_items.append(
-                RecycleFileVO(
-                    # Recycle ID, not Original File ID? Client usually wants ID to action on.
-                    file_id=str(item.id),
-                    is_folder="Y" if item.is_folder else "N",
-                    file_name=item.name,
-                    size=item.size,
-                    update_time=str(item.delete_time),
-                )
-            )
+    file_service = get_services(request).file_service
+
+    page_items, total = await file_service.list_recycle(
+        user_email,
+        req_data.order,
+        req_data.sequence,
+        req_data.page_no,
+        req_data.page_size,
+    )
 
-        response = RecycleFileListVO(total=total, recycle_file_vo_list=result_items)
-        return web.json_response(response.to_dict())
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    response = RecycleFileListVO(total=total).to_dict()
+    response["recycleFileVOList"] = [_to_recycle_file_dict(i) for i in page_items]
+    return json_response(response)
 
 
 @routes.post("/api/file/recycle/delete")
@@ -169,15 +214,12 @@ async def handle_recycle_delete(request: web.Request) -> web.Response:
     # Purpose: Permanently delete items from recycle bin.
     # Response: BaseVO
 
-    req_data = RecycleFileDTO.from_dict(await request.json())
+    req_data = RecycleFileDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        await file_service.delete_from_recycle(user_email, req_data.id_list)
-    except SupernoteError as err:
-        return err.to_response()
-    return web.json_response(BaseResponse(success=True).to_dict())
+    await file_service.delete_from_recycle(user_email, req_data.id_list)
+    return json_response(_SUCCESS_BODY)
 
 
 @routes.post("/api/file/recycle/revert")
@@ -186,15 +228,12 @@ async def handle_recycle_revert(request: web.Request) -> web.Response:
     # Purpose: Restore items from recycle bin.
     # Response: BaseVO
 
-    req_data = RecycleFileDTO.from_dict(await request.json())
+    req_data = RecycleFileDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        await file_service.revert_from_recycle(user_email, req_data.id_list)
-    except SupernoteError as err:
-        return err.to_response()
-    return web.json_response(BaseResponse(success=True).to_dict())
+    await file_service.revert_from_recycle(user_email, req_data.id_list)
+    return json_response(_SUCCESS_BODY)
 
 
 @routes.post("/api/file/recycle/clear")
@@ -203,13 +242,10 @@ async def handle_recycle_clear(request: web.Request) -> web.Response:
     # Purpose: Empty the recycle bin.
 
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        await file_service.clear_recycle(user_email)
-    except SupernoteError as err:
-        return err.to_response()
-    return web.json_response(BaseResponse(success=True).to_dict())
+    await file_service.clear_recycle(user_email)
+    return json_response(_SUCCESS_BODY)
 
 
 @routes.post("/api/file/path/query")
@@ -218,32 +254,27 @@ async def handle_path_query(request: web.Request) -> web.Response:
     # Purpose: Resolve file path and ID path.
     # Response: FilePathQueryVO
 
-    req_data = FilePathQueryDTO.from_dict(await request.json())
+    req_data = FilePathQueryDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        path_info = await file_service.get_path_info(user_email, req_data.id)
+    path_info = await file_service.get_path_info(user_email, req_data.id)
 
-        # Flatten if needed for Web API
-        path = path_info.path.strip("/")
-        id_path = path_info.id_path.strip("/")
+    # Flatten if needed for Web API
+    path = path_info.path.strip("/")
+    id_path = path_info.id_path.strip("/")
 
-        parts = path.split("/")
-        if parts and parts[0] in CATEGORY_CONTAINERS:
-            # Strip first component from both path and id_path
-            path = "/".join(parts[1:])
+    parts = path.split("/")
+    if parts and parts[0] in CATEGORY_CONTAINERS:
+        # Strip first component from both path and id_path
+        path = "/".join(parts[1:])
 
-            id_parts = id_path.split("/")
-            if len(id_parts) >= len(parts):  # Safety check
-                id_path = "/".join(id_parts[1:])
+        id_parts = id_path.split("/")
+        if len(id_parts) >= len(parts):  # Safety check
+            id_path = "/".join(id_parts[1:])
 
-        response = FilePathQueryVO(path=path, id_path=id_path)
-        return web.json_response(response.to_dict())
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    response = FilePathQueryVO(path=path, id_path=id_path)
+    return json_response(response)
 
 
 @routes.post("/api/file/list/query")
@@ -252,36 +283,38 @@ async def handle_file_list_query(request: web.Request) -> web.Response:
     # Purpose: Query files in a directory.
     # Response: FileListQueryVO
 
-    req_data = FileListQueryDTO.from_dict(await request.json())
+    req_data = FileListQueryDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        file_entities = await file_service.query_file_list(
+    if req_data.directory_id != 0:
+        page_items, total = await file_service.query_file_page(
             user_email,
             req_data.directory_id,
+            req_data.order,
+            req_data.sequence,
+            req_data.page_no,
+            req_data.page_size,
         )
-
-        # Flatten root directory for Web API (View Logic)
-        if req_data.directory_id == 0:
-            flattened_entities: list[FileEntity] = []
-            # Identify category containers
-            category_map: dict[str, FileEntity] = {}
-            for entity in file_entities:
-                if entity.name in CATEGORY_CONTAINERS:
-                    category_map[entity.name] = entity
-                else:
-                    flattened_entities.append(entity)
-
-            # Fetch children of category containers and promote to root
-            for name, entity in category_map.items():
-                children = await file_service.query_file_list(user_email, entity.id)
-                for child in children:
-                    # Modify parent_id to 0 for the view
-                    child.parent_id = 0
-                    flattened_entities.append(child)
-
-            file_entities = flattened_entities
+    else:
+        # Flatten root directory for Web API (View Logic). The merged
+        # listing spans several folders, so it is sorted in memory.
+        flattened_entities: list[FileEntity] = []
+        # Identify category containers
+        category_map: dict[str, FileEntity] = {}
+        for entity in await file_service.query_file_list(user_email, 0):
+            if entity.name in CATEGORY_CONTAINERS:
+                category_map[entity.name] = entity
+            else:
+                flattened_entities.append(entity)
+
+        # Fetch children of category containers and promote to root
+        for name, entity in category_map.items():
+            children = await file_service.query_file_list(user_email, entity.id)
+            for child in children:
+                # Modify parent_id to 0 for the view
+                child.parent_id = 0
+                flattened_entities.append(child)
 
         # TODO: This is not currently using the same sorting where there is
         # a preferred orderign and capitalization for the items in the root folder.
@@ -289,86 +322,43 @@ async def handle_file_list_query(request: web.Request) -> web.Response:
         #     if req_data.directory_id != 0 or item.name not in IMMUTABLE_SYSTEM_DIRECTORIES:
         #         item.name = item.name.capitalize()
         page_items, total = _sort_and_page(
-            file_entities,
+            flattened_entities,
             req_data.sequence,
             req_data.order,
             req_data.page_no,
             req_data.page_size,
         )
 
-        user_file_vos: list[UserFileVO] = []
-        for entity in page_items:
-            user_file_vos.append(
-                UserFileVO(
-                    id=str(entity.id),
-                    directory_id=str(entity.parent_id),
-                    file_name=entity.name,
-                    size=entity.size,
-                    md5=entity.md5,
-                    inner_name=entity.storage_key,
-                    is_folder=BooleanEnum.YES if entity.is_folder else BooleanEnum.NO,
-                    create_time=entity.create_time,
-                    update_time=entity.update_time,
-                )
-            )
-
-        pages = max(1, (total + req_data.page_size - 1) // req_data.page_size)
+    pages = max(1, (total + req_data.page_size - 1) // req_data.page_size)
 
-        response = FileListQueryVO(
-            total=total,
-            pages=pages,
-            page_num=req_data.page_no,
-            page_size=req_data.page_size,
-            user_file_vo_list=user_file_vos,
-        )
-        return web.json_response(response.to_dict())
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    response = FileListQueryVO(
+        total=total,
+        pages=pages,
+        page_num=req_data.page_no,
+        page_size=req_data.page_size,
+    ).to_dict()
+    response["userFileVOList"] = [_to_user_file_dict(e) for e in page_items]
+    return json_response(response)
 
 
 @routes.post("/api/file/label/list/search")
-async def handle_file_search(request: web.Request) -> web.Response:
+async def handle_file_search(request: web.Request) -> web.StreamResponse:
     # Endpoint: POST /api/file/label/list/search
     # Purpose: Search for files by keyword.
     # Response: FileSearchResponse
 
-    req_data = FileLabelSearchDTO.from_dict(await request.json())
+    req_data = FileLabelSearchDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
-
-    try:
-        file_entities = await file_service.search_files(user_email, req_data.keyword)
-
-        entries_vos: list[EntriesVO] = []
-        for entity in file_entities:
-            # Web API expects flattened paths for system directories
-            path_display = _flatten_path(entity.full_path)
-            parent_path = str(Path(path_display).parent)
-            if parent_path == ".":
-                parent_path = ""
-
-            entries_vos.append(
-                EntriesVO(
-                    tag="folder" if entity.is_folder else "file",
-                    id=str(entity.id),
-                    name=entity.name,
-                    path_display=path_display,
-                    parent_path=parent_path,
-                    size=entity.size,
-                    last_update_time=entity.update_time,
-                    content_hash=entity.md5 or "",
-                    is_downloadable=True,
-                )
-            )
-
-        response = FileLabelSearchVO(entries=entries_vos)
-        return web.json_response(response.to_dict())
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    file_service = get_services(request).file_service
+
+    file_entities = await file_service.search_files(user_email, req_data.keyword)
+    return await json_list_response(
+        request,
+        FileLabelSearchVO().to_dict(),
+        "entries",
+        file_entities,
+        _to_search_entry_dict,
+    )
 
 
 @routes.post("/api/file/folder/add")
@@ -377,18 +367,13 @@ async def handle_folder_add(request: web.Request) -> web.Response:
     # Purpose: Create a new folder (Web).
     # Response: FolderVO
 
-    req_data = FolderAddDTO.from_dict(await request.json())
+    req_data = FolderAddDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        new_dir = await file_service.create_directory_by_id(
-            user_email, req_data.directory_id, req_data.file_name
-        )
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    new_dir = await file_service.create_directory_by_id(
+        user_email, req_data.directory_id, req_data.file_name
+    )
 
     response = FolderVO(
         id=str(new_dir.id),
@@ -397,7 +382,7 @@ async def handle_folder_add(request: web.Request) -> web.Response:
         # TODO: What is the expected behavior when targeting an existing non-empty directory?
         empty=BooleanEnum.YES,  # Newly created is empty
     )
-    return web.json_response(response.to_dict())
+    return json_response(response)
 
 
 def _root_sort_key(d: FolderDetail) -> tuple[int, str]:
@@ -414,53 +399,48 @@ async def handle_folder_list_query(request: web.Request) -> web.Response:
     # Purpose: Query details for a list of folders.
     # Response: FolderListQueryVO
 
-    req_data = FolderListQueryDTO.from_dict(await request.json())
+    req_data = FolderListQueryDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        # Initial query
-        folder_details = await file_service.get_folders_by_ids(
-            user_email, req_data.directory_id, req_data.id_list
-        )
+    # Initial query
+    folder_details = await file_service.get_folders_by_ids(
+        user_email, req_data.directory_id, req_data.id_list
+    )
 
-        # Web API Flattening Logic for Root. We fetch the special folders
-        # and flatten them to pretend they were really in the root.
-        if req_data.directory_id == 0:
-            pending_scans = list(folder_details)
-            folder_details = []
-            for detail in pending_scans:
-                if detail.entity.name in CATEGORY_CONTAINERS:
-                    # Fetch children
-                    children = await file_service.get_folders_by_ids(
-                        user_email, detail.entity.id, req_data.id_list
-                    )
-                    # Add children to results (flattened)
-                    for child in children:
-                        child.entity.parent_id = 0  # View adjustment
-                        folder_details.append(child)
-                else:
-                    if detail.entity.name not in IMMUTABLE_SYSTEM_DIRECTORIES:
-                        detail.entity.name = detail.entity.name.capitalize()
-                    folder_details.append(detail)
-
-        folder_details.sort(key=_root_sort_key)
-
-        folder_vos = [
-            FolderVO(
-                id=str(detail.entity.id),
-                directory_id=str(detail.entity.parent_id),
-                file_name=detail.entity.name,
-                empty=BooleanEnum.NO if detail.has_subfolders else BooleanEnum.YES,
-            )
-            for detail in folder_details
-        ]
-        response = FolderListQueryVO(folder_vo_list=folder_vos)
-        return web.json_response(response.to_dict())
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    # Web API Flattening Logic for Root. We fetch the special folders
+    # and flatten them to pretend they were really in the root.
+    if req_data.directory_id == 0:
+        pending_scans = list(folder_details)
+        folder_details = []
+        for detail in pending_scans:
+            if detail.entity.name in CATEGORY_CONTAINERS:
+                # Fetch children
+                children = await file_service.get_folders_by_ids(
+                    user_email, detail.entity.id, req_data.id_list
+                )
+                # Add children to results (flattened)
+                for child in children:
+                    child.entity.parent_id = 0  # View adjustment
+                    folder_details.append(child)
+            else:
+                if detail.entity.name not in IMMUTABLE_SYSTEM_DIRECTORIES:
+                    detail.entity.name = detail.entity.name.capitalize()
+                folder_details.append(detail)
+
+    folder_details.sort(key=_root_sort_key)
+
+    folder_vos = [
+        FolderVO(
+            id=str(detail.entity.id),
+            directory_id=str(detail.entity.parent_id),
+            file_name=detail.entity.name,
+            empty=BooleanEnum.NO if detail.has_subfolders else BooleanEnum.YES,
+        )
+        for detail in folder_details
+    ]
+    response = FolderListQueryVO(folder_vo_list=folder_vos)
+    return json_response(response)
 
 
 @routes.post("/api/file/move")
@@ -469,17 +449,14 @@ async def handle_file_move_web(request: web.Request) -> web.Response:
     # Purpose: Move files/folders (Web).
     # Response: BaseResponse
 
-    req_data = FileMoveAndCopyDTO.from_dict(await request.json())
+    req_data = FileMoveAndCopyDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        await file_service.move_items(
-            user_email, req_data.id_list, req_data.go_directory_id
-        )
-    except SupernoteError as err:
-        return err.to_response()
-    return web.json_response(BaseResponse(success=True).to_dict())
+    await file_service.move_items(
+        user_email, req_data.id_list, req_data.go_directory_id
+    )
+    return json_response(_SUCCESS_BODY)
 
 
 @routes.post("/api/file/copy")
@@ -488,17 +465,14 @@ async def handle_file_copy_web(request: web.Request) -> web.Response:
     # Purpose: Copy files/folders (Web).
     # Response: BaseResponse
 
-    req_data = FileMoveAndCopyDTO.from_dict(await request.json())
+    req_data = FileMoveAndCopyDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        await file_service.copy_items(
-            user_email, req_data.id_list, req_data.go_directory_id
-        )
-    except SupernoteError as err:
-        return err.to_response()
-    return web.json_response(BaseResponse(success=True).to_dict())
+    await file_service.copy_items(
+        user_email, req_data.id_list, req_data.go_directory_id
+    )
+    return json_response(_SUCCESS_BODY)
 
 
 @routes.post("/api/file/rename")
@@ -507,15 +481,12 @@ async def handle_file_rename_web(request: web.Request) -> web.Response:
     # Purpose: Rename file/folder (Web).
     # Response: BaseResponse
 
-    req_data = FileReNameDTO.from_dict(await request.json())
+    req_data = FileReNameDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        await file_service.rename_item(user_email, req_data.id, req_data.new_name)
-    except SupernoteError as err:
-        return err.to_response()
-    return web.json_response(BaseResponse(success=True).to_dict())
+    await file_service.rename_item(user_email, req_data.id, req_data.new_name)
+    return json_response(_SUCCESS_BODY)
 
 
 @routes.post("/api/file/delete")
@@ -524,19 +495,12 @@ async def handle_file_delete(request: web.Request) -> web.Response:
     # Purpose: Delete file/folder (Web).
     # Response: BaseResponse
 
-    req_data = FileDeleteDTO.from_dict(await request.json())
+    req_data = FileDeleteDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
+    file_service = get_services(request).file_service
 
-    try:
-        await file_service.delete_items(
-            user_email, req_data.id_list, req_data.directory_id
-        )
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
-    return web.json_response(BaseResponse(success=True).to_dict())
+    await file_service.delete_items(user_email, req_data.id_list, req_data.directory_id)
+    return json_response(_SUCCESS_BODY)
 
 
 @routes.post("/api/file/upload/apply")
@@ -545,30 +509,25 @@ async def handle_file_upload_apply(request: web.Request) -> web.Response:
     # Purpose: Request upload (Web).
     # Response: FileUploadApplyLocalVO
 
-    req_data = FileUploadApplyDTO.from_dict(await request.json())
-    url_signer = request.app["url_signer"]
+    req_data = FileUploadApplyDTO.from_dict(await read_json(request))
+    url_signer = get_services(request).url_signer
 
-    try:
-        # Generate inner_name
-        ext = "".join(Path(req_data.file_name).suffixes)
-        inner_name = f"{uuid.uuid4()}{ext}"
-
-        # Sign URL
-        encoded_name = urllib.parse.quote(inner_name)
-        path_to_sign = f"/api/oss/upload?path={encoded_name}"
-        signed_path = await url_signer.sign(path_to_sign, user=request["user"])
-        full_url = f"{request.scheme}://{request.host}{signed_path}"
-
-        return web.json_response(
-            FileUploadApplyLocalVO(
-                full_upload_url=full_url,
-                inner_name=inner_name,
-            ).to_dict()
+    # Generate inner_name
+    ext = file_suffixes(req_data.file_name)
+    inner_name = f"{uuid.uuid4()}{ext}"
+
+    # Sign URL
+    encoded_name = quote_path(inner_name)
+    path_to_sign = f"/api/oss/upload?path={encoded_name}"
+    signed_path = await url_signer.sign(path_to_sign, user=request["user"])
+    full_url = absolute_url(request, signed_path)
+
+    return json_response(
+        FileUploadApplyLocalVO(
+            full_upload_url=full_url,
+            inner_name=inner_name,
         )
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    )
 
 
 @routes.post("/api/file/upload/finish")
@@ -577,21 +536,16 @@ async def handle_file_upload_finish(request: web.Request) -> web.Response:
     # Purpose: Complete upload (Web).
     # Response: BaseResponse
 
-    req_data = FileUploadFinishDTO.from_dict(await request.json())
+    req_data = FileUploadFinishDTO.from_dict(await read_json(request))
     user_email = request["user"]
-    file_service: FileService = request.app["file_service"]
-
-    try:
-        await file_service.upload_finish_web(
-            user=user_email,
-            directory_id=req_data.directory_id,
-            file_name=req_data.file_name,
-            md5=req_data.md5,
-            inner_name=req_data.inner_name,
-        )
-    except SupernoteError as err:
-        return err.to_response()
-    except Exception as err:
-        return SupernoteError.uncaught(err).to_response()
+    file_service = get_services(request).file_service
+
+    await file_service.upload_finish_web(
+        user=user_email,
+        directory_id=req_data.directory_id,
+        file_name=req_data.file_name,
+        md5=req_data.md5,
+        inner_name=req_data.inner_name,
+    )
 
-    return web.json_response(BaseResponse(success=True).to_dict())
+    return json_response(_SUCCESS_BODY)
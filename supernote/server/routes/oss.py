@@ -1,17 +1,23 @@
 """Handlers for the object storage service."""
 
 import asyncio
+import functools
 import logging
-from collections.abc import AsyncGenerator
+import re
+import socket
+import urllib.parse
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import contextmanager, suppress
 from pathlib import Path
 
 from aiohttp import BodyPartReader, web
+from aiohttp.abc import AbstractStreamWriter
 
 from supernote.models.base import create_error_response
 from supernote.models.system import FileChunkParams, FileChunkVO, UploadFileVO
 from supernote.server.constants import USER_DATA_BUCKET
 from supernote.server.exceptions import SupernoteError
-from supernote.server.services.blob import BlobStorage
+from supernote.server.services.blob import WRITE_BUFFER_SIZE, BlobStorage
 from supernote.server.services.file import FileService
 from supernote.server.utils.paths import get_file_chunk_path
 from supernote.server.utils.url_signer import UrlSigner
@@ -21,11 +27,85 @@ from .decorators import public_route
 logger = logging.getLogger(__name__)
 routes = web.RouteTableDef()
 
+# A single byte range, e.g. "bytes=0-499", "bytes=500-" or "bytes=-500"
+_RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _content_disposition(file_name: str) -> str:
+    """Build an attachment Content-Disposition header for a file name.
+
+    The quoted `filename` is an ASCII fallback and `filename*` carries the
+    exact name percent-encoded as UTF-8 (RFC 6266 / RFC 5987).
+    """
+    fallback = "".join(
+        c if c.isascii() and c.isprintable() and c not in '"\\' else "_"
+        for c in file_name
+    )
+    encoded = urllib.parse.quote(file_name, safe="")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{encoded}"
+
+
+@contextmanager
+def _tcp_cork(request: web.BaseRequest) -> Iterator[None]:
+    """Hold back partial TCP segments while the response is written.
+
+    This lets the response headers and the start of the body share a segment
+    instead of the headers going out on their own. Only supported on Linux.
+    """
+    sock = request.transport.get_extra_info("socket") if request.transport else None
+    cork = getattr(socket, "TCP_CORK", None)
+    if sock is None or cork is None:
+        yield
+        return
+    with suppress(OSError):
+        sock.setsockopt(socket.IPPROTO_TCP, cork, 1)
+    try:
+        yield
+    finally:
+        with suppress(OSError):
+            sock.setsockopt(socket.IPPROTO_TCP, cork, 0)
+
+
+class _CorkedFileResponse(web.FileResponse):
+    """A FileResponse that corks the socket while headers and body are sent."""
+
+    async def prepare(self, request: web.BaseRequest) -> AbstractStreamWriter | None:
+        """Send the file with the socket corked."""
+        with _tcp_cork(request):
+            return await super().prepare(request)
+
+
+def _check_multipart(request: web.Request) -> web.Response | None:
+    """Return an error response if the request is not a multipart upload.
+
+    This is checked before the signature so that a malformed request does not
+    consume the signed URL's nonce.
+    """
+    if request.content_type.startswith("multipart/"):
+        return None
+    return web.json_response(
+        create_error_response(
+            f"Expected multipart content, got {request.content_type}", "E415"
+        ).to_dict(),
+        status=web.HTTPUnsupportedMediaType.status_code,
+    )
+
+
+async def _read_file_field(request: web.Request) -> BodyPartReader | None:
+    """Return the multipart `file` field, or None if it is not the first part."""
+    reader = await request.multipart()
+    field = await reader.next()
+    if isinstance(field, BodyPartReader) and field.name == "file":
+        return field
+    return None
+
 
 async def _stream_upload_field(field: BodyPartReader) -> AsyncGenerator[bytes, None]:
     """Stream chunks from a multipart field."""
     while True:
-        chunk = await field.read_chunk()
+        # Return whatever has arrived, up to a full blob write buffer
+        chunk = await field.read_chunk(WRITE_BUFFER_SIZE)
         if not chunk:
             break
         yield chunk
@@ -41,7 +121,11 @@ async def handle_oss_upload(request: web.Request) -> web.Response:
     url_signer: UrlSigner = request.app["url_signer"]
     blob_storage: BlobStorage = request.app["blob_storage"]
 
-    logger.debug("OSS Upload Headers: %s", dict(request.headers))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("OSS Upload Headers: %s", dict(request.headers))
+    if (error := _check_multipart(request)) is not None:
+        return error
+
     try:
         payload = await url_signer.verify(request.path_qs)
     except SupernoteError as err:
@@ -61,32 +145,30 @@ async def handle_oss_upload(request: web.Request) -> web.Response:
             create_error_response("Missing path", "E400").to_dict(), status=400
         )
 
-    if not request.content_type.startswith("multipart/"):
+    field = await _read_file_field(request)
+    if field is None:
         return web.json_response(
-            create_error_response(
-                f"Expected multipart content, got {request.content_type}", "E400"
-            ).to_dict(),
+            create_error_response("No file field found", "E400").to_dict(),
             status=400,
         )
 
-    reader = await request.multipart()
-    field = await reader.next()
-    if isinstance(field, BodyPartReader) and field.name == "file":
-        metadata = await blob_storage.put(
-            USER_DATA_BUCKET, object_name, _stream_upload_field(field)
-        )
-        logger.info(
-            f"Received OSS upload for {object_name} (user: {user_email}): {metadata.size} bytes, MD5: {metadata.content_md5}"
-        )
-
-        # Return UploadFileVO with innerName and md5
-        response = UploadFileVO(
-            inner_name=object_name,
-            md5=metadata.content_md5,
-        )
-        return web.json_response(response.to_dict())
-
-    return web.Response(status=400, text="No file field found")
+    metadata = await blob_storage.put(
+        USER_DATA_BUCKET, object_name, _stream_upload_field(field)
+    )
+    logger.info(
+        "Received OSS upload for %s (user: %s): %d bytes, MD5: %s",
+        object_name,
+        user_email,
+        metadata.size,
+        metadata.content_md5,
+    )
+
+    # Return UploadFileVO with innerName and md5
+    response = UploadFileVO(
+        inner_name=object_name,
+        md5=metadata.content_md5,
+    )
+    return web.json_response(response.to_dict())
 
 
 @routes.put("/api/oss/upload/part")
@@ -101,10 +183,14 @@ async def handle_oss_upload_part(request: web.Request) -> web.Response:
     url_signer: UrlSigner = request.app["url_signer"]
     blob_storage: BlobStorage = request.app["blob_storage"]
 
-    logger.debug("OSS Upload Part Headers: %s", dict(request.headers))
-    query_dict = dict(request.query)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("OSS Upload Part Headers: %s", dict(request.headers))
+    if (error := _check_multipart(request)) is not None:
+        return error
+
     try:
-        params = FileChunkParams.from_dict(query_dict)
+        # The query MultiDict is a Mapping, so it is read without a copy
+        params = FileChunkParams.from_dict(request.query)
     except ValueError:
         return web.json_response(
             create_error_response("Invalid param types", "E400").to_dict(), status=400
@@ -132,66 +218,56 @@ async def handle_oss_upload_part(request: web.Request) -> web.Response:
             status=403,
         )
 
-    if not request.content_type.startswith("multipart/"):
+    field = await _read_file_field(request)
+    if field is None:
         return web.json_response(
-            create_error_response(
-                f"Expected multipart content, got {request.content_type}", "E400"
-            ).to_dict(),
-            status=400,
-        )
-
-    reader = await request.multipart()
-    field = await reader.next()
-    if isinstance(field, BodyPartReader) and field.name == "file":
-        chunk_key = get_file_chunk_path(params.path, params.part_number)
-
-        metadata = await blob_storage.put(
-            USER_DATA_BUCKET, chunk_key, _stream_upload_field(field)
-        )
-        chunk_md5 = metadata.content_md5
-        total_bytes = metadata.size
-
-        logger.info(
-            f"Received chunk {params.part_number} for {params.path} (uploadId: {params.upload_id}): {total_bytes} bytes, MD5: {chunk_md5}"
+            create_error_response("No file field", "E400").to_dict(), status=400
         )
 
-        # Implicit Merge Logic (for Device Compatibility)
-        if params.total_chunks:
-            if params.part_number == params.total_chunks:
-                logger.info(
-                    f"Implicitly merging {params.total_chunks} chunks for {params.path}"
-                )
-                source_keys = [
-                    get_file_chunk_path(params.path, i)
-                    for i in range(1, params.total_chunks + 1)
-                ]
-
-                async def combined_stream() -> AsyncGenerator[bytes, None]:
-                    for source_key in source_keys:
-                        async for chunk in blob_storage.get(
-                            USER_DATA_BUCKET, source_key
-                        ):
-                            yield chunk
-
-                await blob_storage.put(USER_DATA_BUCKET, params.path, combined_stream())
-                logger.info(f"Successfully merged chunks for {params.path}")
-
-                # Cleanup chunks
-                await asyncio.gather(
-                    *[blob_storage.delete(USER_DATA_BUCKET, key) for key in source_keys]
-                )
-
-        # Return FileChunkVO with chunk MD5
-        resp_vo = FileChunkVO(
-            upload_id=params.upload_id,
-            part_number=params.part_number,
-            total_chunks=params.total_chunks,
-            chunk_md5=chunk_md5,
-            status="success",
-        )
-        return web.json_response(resp_vo.to_dict())
+    chunk_key = get_file_chunk_path(params.path, params.part_number)
+
+    metadata = await blob_storage.put(
+        USER_DATA_BUCKET, chunk_key, _stream_upload_field(field)
+    )
+    chunk_md5 = metadata.content_md5
+    total_bytes = metadata.size
+
+    logger.info(
+        "Received chunk %d for %s (uploadId: %s): %d bytes, MD5: %s",
+        params.part_number,
+        params.path,
+        params.upload_id,
+        total_bytes,
+        chunk_md5,
+    )
+
+    # Implicit Merge Logic (for Device Compatibility)
+    if params.total_chunks:
+        if params.part_number == params.total_chunks:
+            logger.info(
+                "Implicitly merging %d chunks for %s", params.total_chunks, params.path
+            )
+            source_keys = [
+                get_file_chunk_path(params.path, i)
+                for i in range(1, params.total_chunks + 1)
+            ]
+            await blob_storage.concat(USER_DATA_BUCKET, params.path, source_keys)
+            logger.info("Successfully merged chunks for %s", params.path)
+
+            # Cleanup chunks
+            await asyncio.gather(
+                *[blob_storage.delete(USER_DATA_BUCKET, key) for key in source_keys]
+            )
 
-    return web.Response(status=400, text="No file field")
+    # Return FileChunkVO with chunk MD5
+    resp_vo = FileChunkVO(
+        upload_id=params.upload_id,
+        part_number=params.part_number,
+        total_chunks=params.total_chunks,
+        chunk_md5=chunk_md5,
+        status="success",
+    )
+    return web.json_response(resp_vo.to_dict())
 
 
 @routes.get("/api/oss/download")
@@ -228,6 +304,14 @@ async def handle_oss_download(request: web.Request) -> web.StreamResponse:
     try:
         # Try as numeric ID (legacy/sync flow)
         id_val = int(file_id_str)
+    except ValueError:
+        # Treat as direct storage key (conversions flow)
+        storage_key = file_id_str
+        file_name = Path(storage_key).name
+    else:
+        # Download apply looked up the same file moments ago, so this is
+        # normally served from the file info cache. Going through the VFS
+        # keeps deleted files from being downloaded with an unexpired URL.
         info = await file_service.get_file_info_by_id(user_email, id_val)
         if not info:
             return web.json_response(
@@ -237,81 +321,43 @@ async def handle_oss_download(request: web.Request) -> web.StreamResponse:
             return web.json_response(
                 create_error_response("Not a file").to_dict(), status=400
             )
-        storage_key = info.storage_key
-        if not storage_key:
+        if not info.storage_key:
             return web.json_response(
-                create_error_response("File content not found").to_dict(), status=404
+                create_error_response("File content not found").to_dict(),
+                status=404,
             )
+        storage_key = info.storage_key
         file_name = info.name
-        file_size = info.size
-    except ValueError:
-        # Treat as direct storage key (conversions flow)
-        storage_key = file_id_str
-        if not await file_service.blob_storage.exists(USER_DATA_BUCKET, storage_key):
-            return web.json_response(
-                create_error_response("Blob not found").to_dict(), status=404
-            )
+
+    # A single stat both checks the blob still exists and returns its real
+    # size for the range check below.
+    try:
         metadata = await file_service.blob_storage.get_metadata(
             USER_DATA_BUCKET, storage_key
         )
-        file_size = metadata.size
-        file_name = Path(storage_key).name
+    except FileNotFoundError:
+        return web.json_response(
+            create_error_response("Blob not found").to_dict(), status=404
+        )
+    file_size = metadata.size
 
-    # Handle Range Header
+    # Validate the Range header up front so malformed requests get the same
+    # JSON errors as the rest of the API; FileResponse applies the range.
     range_header = request.headers.get("Range")
-
-    start = 0
-    end = file_size - 1
-
     if range_header:
-        # Simplistic Range parsing: bytes=start-end
-        try:
-            unit, ranges = range_header.split("=")
-            if unit == "bytes":
-                r = ranges.split("-")
-                if r[0]:
-                    start = int(r[0])
-                if len(r) > 1 and r[1]:
-                    end = int(r[1])
-
-                # Check bounds
-                if start >= file_size:
-                    return web.json_response(
-                        create_error_response("Invalid range").to_dict(), status=416
-                    )
-
-                if end >= file_size:
-                    end = file_size - 1
-        except ValueError:
+        if (match := _RANGE_RE.fullmatch(range_header)) is None:
             return web.json_response(
                 create_error_response("Invalid Range header").to_dict(), status=400
             )
+        start = int(match[1]) if match[1] else 0
+        if start >= file_size:
+            return web.json_response(
+                create_error_response("Invalid range").to_dict(), status=416
+            )
 
-    content_length = end - start + 1
-    status = 206 if range_header else 200
-
-    headers = {
-        "Content-Disposition": f'attachment; filename="{file_name}"',
-        "Content-Length": str(content_length),
-        "Accept-Ranges": "bytes",
-    }
-
-    if status == 206:
-        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
-
-    response = web.StreamResponse(status=status, headers=headers)
-    await response.prepare(request)
-
-    try:
-        stream = file_service.blob_storage.get(
-            USER_DATA_BUCKET, storage_key, start=start, end=end
-        )
-        async for chunk in stream:
-            await response.write(chunk)
-
-    except FileNotFoundError:
-        return web.json_response(
-            create_error_response("Blob not found").to_dict(), status=404
-        )
-
-    return response
+    # FileResponse sets Content-Length from a stat of the blob and serves the
+    # body with sendfile(), so the content never passes through Python.
+    return _CorkedFileResponse(
+        file_service.blob_storage.get_blob_path(USER_DATA_BUCKET, storage_key),
+        headers={"Content-Disposition": _content_disposition(file_name)},
+    )
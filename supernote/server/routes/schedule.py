@@ -17,6 +17,7 @@ from supernote.models.schedule import (
     UpdateScheduleTaskVO,
 )
 from supernote.server.services.schedule import ScheduleService
+from supernote.server.utils.json_utils import read_json
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +28,7 @@ routes = web.RouteTableDef()
 async def create_group(request: web.Request) -> web.Response:
     user = request["user"]
     try:
-        data = await request.json()
+        data = await read_json(request)
         dto = AddScheduleTaskGroupDTO.from_dict(data)
     except Exception as e:
         return web.json_response(
@@ -97,7 +98,7 @@ async def delete_group(request: web.Request) -> web.Response:
 async def create_task(request: web.Request) -> web.Response:
     user = request["user"]
     try:
-        data = await request.json()
+        data = await read_json(request)
         dto = AddScheduleTaskDTO.from_dict(data)
     except Exception as e:
         return web.json_response(
@@ -168,7 +169,7 @@ async def update_task(request: web.Request) -> web.Response:
     user = request["user"]
     task_id = int(request.match_info["id"])
     try:
-        data = await request.json()
+        data = await read_json(request)
         dto = UpdateScheduleTaskDTO.from_dict(data)
     except Exception as e:
         return web.json_response(
@@ -1,5 +1,4 @@
 import logging
-import urllib.parse
 
 from aiohttp import web
 
@@ -31,7 +30,12 @@ from supernote.models.summary import (
 )
 from supernote.server.exceptions import SupernoteError
 from supernote.server.services.summary import SummaryService
-from supernote.server.utils.paths import generate_inner_name
+from supernote.server.utils.json_utils import read_json
+from supernote.server.utils.paths import (
+    absolute_url,
+    generate_inner_name,
+    quote_path,
+)
 from supernote.server.utils.url_signer import UrlSigner
 
 logger = logging.getLogger(__name__)
@@ -43,7 +47,7 @@ async def handle_add_summary_tag(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/add/summary/tag
     # Purpose: Add a new summary tag.
     # Response: AddSummaryTagVO
-    req_data = AddSummaryTagDTO.from_dict(await request.json())
+    req_data = AddSummaryTagDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -61,7 +65,7 @@ async def handle_update_summary_tag(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/update/summary/tag
     # Purpose: Update an existing summary tag.
     # Response: BaseResponse
-    req_data = UpdateSummaryTagDTO.from_dict(await request.json())
+    req_data = UpdateSummaryTagDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -79,7 +83,7 @@ async def handle_delete_summary_tag(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/delete/summary/tag
     # Purpose: Delete a summary tag.
     # Response: BaseResponse
-    req_data = DeleteSummaryTagDTO.from_dict(await request.json())
+    req_data = DeleteSummaryTagDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -114,7 +118,7 @@ async def handle_add_summary(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/add/summary
     # Purpose: Add a new summary.
     # Response: AddSummaryVO
-    req_data = AddSummaryDTO.from_dict(await request.json())
+    req_data = AddSummaryDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -132,7 +136,7 @@ async def handle_update_summary(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/update/summary
     # Purpose: Update an existing summary.
     # Response: BaseResponse
-    req_data = UpdateSummaryDTO.from_dict(await request.json())
+    req_data = UpdateSummaryDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -150,7 +154,7 @@ async def handle_delete_summary(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/delete/summary
     # Purpose: Delete a summary.
     # Response: BaseResponse
-    req_data = DeleteSummaryDTO.from_dict(await request.json())
+    req_data = DeleteSummaryDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -168,7 +172,7 @@ async def handle_query_summary(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/query/summary
     # Purpose: Query summaries.
     # Response: QuerySummaryVO
-    req_data = QuerySummaryDTO.from_dict(await request.json())
+    req_data = QuerySummaryDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -200,7 +204,7 @@ async def handle_add_summary_group(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/add/summary/group
     # Purpose: Add a new summary group.
     # Response: AddSummaryGroupVO
-    req_data = AddSummaryGroupDTO.from_dict(await request.json())
+    req_data = AddSummaryGroupDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -218,7 +222,7 @@ async def handle_update_summary_group(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/update/summary/group
     # Purpose: Update an existing summary group.
     # Response: BaseResponse
-    req_data = UpdateSummaryGroupDTO.from_dict(await request.json())
+    req_data = UpdateSummaryGroupDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -236,7 +240,7 @@ async def handle_delete_summary_group(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/delete/summary/group
     # Purpose: Delete a summary group.
     # Response: BaseResponse
-    req_data = DeleteSummaryGroupDTO.from_dict(await request.json())
+    req_data = DeleteSummaryGroupDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -254,7 +258,7 @@ async def handle_query_summary_group(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/query/summary/group
     # Purpose: Query summary groups.
     # Response: QuerySummaryGroupVO
-    req_data = QuerySummaryGroupDTO.from_dict(await request.json())
+    req_data = QuerySummaryGroupDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -280,7 +284,7 @@ async def handle_upload_apply_summary(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/upload/apply/summary
     # Purpose: Apply for upload (signed URL).
     # Response: UploadSummaryApplyVO
-    req_data = UploadSummaryApplyDTO.from_dict(await request.json())
+    req_data = UploadSummaryApplyDTO.from_dict(await read_json(request))
     user_email = request["user"]
 
     try:
@@ -288,16 +292,16 @@ async def handle_upload_apply_summary(request: web.Request) -> web.Response:
 
         # Generate inner name
         inner_name = generate_inner_name(req_data.file_name, req_data.equipment_no)
-        encoded_name = urllib.parse.quote(inner_name)
+        encoded_name = quote_path(inner_name)
 
         # Sign URLs
         full_path = f"/api/oss/upload?path={encoded_name}"
         full_url_path = await url_signer.sign(full_path, user=user_email)
-        full_url = f"{request.scheme}://{request.host}{full_url_path}"
+        full_url = absolute_url(request, full_url_path)
 
         part_path = f"/api/oss/upload/part?path={encoded_name}"
         part_url_path = await url_signer.sign(part_path, user=user_email)
-        part_url = f"{request.scheme}://{request.host}{part_url_path}"
+        part_url = absolute_url(request, part_url_path)
 
         return web.json_response(
             UploadSummaryApplyVO(
@@ -317,7 +321,7 @@ async def handle_download_summary(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/download/summary
     # Purpose: Get signed download URL for binary content.
     # Response: DownloadSummaryVO
-    req_data = DownloadSummaryDTO.from_dict(await request.json())
+    req_data = DownloadSummaryDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -332,10 +336,10 @@ async def handle_download_summary(request: web.Request) -> web.Response:
             )
 
         url_signer: UrlSigner = request.app["url_signer"]
-        encoded_name = urllib.parse.quote(summary.handwrite_inner_name)
+        encoded_name = quote_path(summary.handwrite_inner_name)
         download_path = f"/api/oss/download?path={encoded_name}"
         signed_path = await url_signer.sign(download_path, user=user_email)
-        download_url = f"{request.scheme}://{request.host}{signed_path}"
+        download_url = absolute_url(request, signed_path)
 
         return web.json_response(DownloadSummaryVO(url=download_url).to_dict())
     except SupernoteError as err:
@@ -349,7 +353,7 @@ async def handle_query_summary_hash(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/query/summary/hash
     # Purpose: Query summary lightweight info (hash/integrity).
     # Response: QuerySummaryMD5HashVO
-    req_data = QuerySummaryDTO.from_dict(await request.json())
+    req_data = QuerySummaryDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
@@ -375,7 +379,7 @@ async def handle_query_summary_id(request: web.Request) -> web.Response:
     # Endpoint: POST /api/file/query/summary/id
     # Purpose: Query full summaries by ID.
     # Response: QuerySummaryByIdVO
-    req_data = QuerySummaryDTO.from_dict(await request.json())
+    req_data = QuerySummaryDTO.from_dict(await read_json(request))
     user_email = request["user"]
     summary_service: SummaryService = request.app["summary_service"]
 
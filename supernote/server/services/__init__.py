@@ -8,8 +8,10 @@ __all__ = [
     "blob",
     "coordination",
     "file",
+    "registry",
     "state",
     "storage",
+    "sync_lock",
     "user",
     "vfs",
 ]
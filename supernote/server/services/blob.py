@@ -1,13 +1,21 @@
+import asyncio
 import hashlib
+import os
 import secrets
+import shutil
+import sys
 from abc import ABC, abstractmethod
+from contextlib import suppress
 from dataclasses import dataclass
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import AsyncGenerator, BinaryIO
 
 import aiofiles
 import aiofiles.os
 
+WRITE_BUFFER_SIZE = 1024 * 1024
+"""Bytes of an incoming stream gathered before they are hashed and written."""
+
 
 @dataclass
 class BlobMetadata:
@@ -28,6 +36,17 @@ class BlobStorage(ABC):
         """Write blob to storage."""
         pass
 
+    @abstractmethod
+    async def concat(
+        self, bucket: str, key: str, source_keys: list[str]
+    ) -> BlobMetadata:
+        """Write a blob made of the content of other blobs, in order.
+
+        Returns:
+            BlobMetadata with the size of the new blob.
+        """
+        pass
+
     @abstractmethod
     def get(
         self, bucket: str, key: str, start: int | None = None, end: int | None = None
@@ -74,6 +93,120 @@ class BlobStorage(ABC):
         pass
 
 
+def _concat_files(sources: list[Path], dest: Path) -> int:
+    """Concatenate files into `dest`, returning the number of bytes written.
+
+    On Linux the data is copied in the kernel with sendfile() rather than
+    being read into userspace and written back out.
+    """
+    total_size = 0
+    with dest.open("wb") as dst:
+        for source in sources:
+            with source.open("rb") as src:
+                if sys.platform != "linux":
+                    shutil.copyfileobj(src, dst)
+                    total_size += src.tell()
+                    continue
+                remaining = os.fstat(src.fileno()).st_size
+                offset = 0
+                while remaining > 0:
+                    sent = os.sendfile(dst.fileno(), src.fileno(), offset, remaining)
+                    if sent == 0:
+                        break
+                    offset += sent
+                    remaining -= sent
+                total_size += offset
+        _sync(dst)
+    return total_size
+
+
+# fdatasync skips flushing metadata such as the modification time, but is
+# not available on every platform.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+
+def _sync(f: BinaryIO) -> None:
+    """Flush a file's data to disk before it is published with a rename."""
+    f.flush()
+    _fdatasync(f.fileno())
+
+
+async def _hash_and_write(
+    f: BinaryIO, hasher: "hashlib._Hash", data: bytes | bytearray
+) -> None:
+    """Hash and write a block of data.
+
+    Both release the GIL, so they run at the same time in two worker threads
+    and a block takes as long as the slower of the two.
+    """
+    results = await asyncio.gather(
+        asyncio.to_thread(hasher.update, data),
+        asyncio.to_thread(f.write, data),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+async def _hash_and_write_stream(
+    f: BinaryIO, hasher: "hashlib._Hash", stream: AsyncGenerator[bytes, None]
+) -> int:
+    """Hash and write a stream, returning the number of bytes written.
+
+    Chunks are gathered into blocks of `WRITE_BUFFER_SIZE`. Each block is
+    hashed and written in worker threads while the next one is received,
+    which keeps the CPU bound hashing off the event loop. Chunks that are
+    already a full block are passed on as-is rather than copied.
+    """
+    total_size = 0
+    buffer = bytearray()
+    pending: asyncio.Task[None] | None = None
+    try:
+        async for chunk in stream:
+            total_size += len(chunk)
+            block: bytes | bytearray
+            if not buffer and len(chunk) >= WRITE_BUFFER_SIZE:
+                block = chunk
+            else:
+                buffer += chunk
+                if len(buffer) < WRITE_BUFFER_SIZE:
+                    continue
+                block, buffer = buffer, bytearray()
+            if pending is not None:
+                await pending
+            pending = asyncio.create_task(_hash_and_write(f, hasher, block))
+        if pending is not None:
+            await pending
+        if buffer:
+            await _hash_and_write(f, hasher, buffer)
+    finally:
+        # Let an in flight write finish before the caller closes the file
+        if pending is not None and not pending.done():
+            await asyncio.gather(pending, return_exceptions=True)
+    return total_size
+
+
+def _md5_metadata(path: Path) -> BlobMetadata:
+    """Return the size and MD5 of a file, read in a single pass.
+
+    `hashlib.file_digest` reads and hashes the file in C without a Python
+    level loop over small chunks.
+    """
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        md5 = hashlib.file_digest(f, "md5").hexdigest()
+        read_size = f.tell()
+
+    if read_size != size:
+        # This could happen if file was modified during read
+        raise ValueError(
+            f"File size changed during read: metadata={size}, read={read_size}"
+        )
+
+    return BlobMetadata(size=size, content_md5=md5)
+
+
 class LocalBlobStorage(BlobStorage):
     """Local filesystem implementation of Blob Storage.
 
@@ -109,19 +242,19 @@ class LocalBlobStorage(BlobStorage):
         md5_hasher = hashlib.md5()
 
         try:
-            async with aiofiles.open(temp_path, "wb") as f:
+            f = await asyncio.to_thread(temp_path.open, "wb")
+            try:
                 if isinstance(stream, bytes):
                     total_size = len(stream)
-                    md5_hasher.update(stream)
-                    await f.write(stream)
+                    await _hash_and_write(f, md5_hasher, stream)
                 else:
-                    async for chunk in stream:
-                        total_size += len(chunk)
-                        md5_hasher.update(chunk)
-                        await f.write(chunk)
+                    total_size = await _hash_and_write_stream(f, md5_hasher, stream)
+                await asyncio.to_thread(_sync, f)
+            finally:
+                await asyncio.to_thread(f.close)
 
-            # Move to final location
-            await aiofiles.os.rename(temp_path, blob_path)
+            # Atomically replace any previous blob with the same key
+            await aiofiles.os.replace(temp_path, blob_path)
 
             return BlobMetadata(
                 content_md5=md5_hasher.hexdigest(),
@@ -129,10 +262,33 @@ class LocalBlobStorage(BlobStorage):
             )
 
         except Exception:
-            if await aiofiles.os.path.exists(temp_path):
+            with suppress(FileNotFoundError):
                 await aiofiles.os.remove(temp_path)
             raise
 
+    async def concat(
+        self, bucket: str, key: str, source_keys: list[str]
+    ) -> BlobMetadata:
+        """Write a blob made of the content of other blobs, in order."""
+        blob_path = self._get_path(bucket, key)
+        sources = [self._get_path(bucket, source_key) for source_key in source_keys]
+        await aiofiles.os.makedirs(blob_path.parent, exist_ok=True)
+
+        # Write to temp file for atomicity
+        temp_dir = self.root / "temp"
+        await aiofiles.os.makedirs(temp_dir, exist_ok=True)
+        temp_path = temp_dir / f"{secrets.token_hex(8)}.tmp"
+
+        try:
+            total_size = await asyncio.to_thread(_concat_files, sources, temp_path)
+            await aiofiles.os.replace(temp_path, blob_path)
+        except Exception:
+            with suppress(FileNotFoundError):
+                await aiofiles.os.remove(temp_path)
+            raise
+
+        return BlobMetadata(size=total_size)
+
     async def get(
         self, bucket: str, key: str, start: int | None = None, end: int | None = None
     ) -> AsyncGenerator[bytes, None]:
@@ -169,9 +325,8 @@ class LocalBlobStorage(BlobStorage):
 
     async def delete(self, bucket: str, key: str) -> None:
         """Delete blob."""
-        path = self._get_path(bucket, key)
-        if await aiofiles.os.path.exists(path):
-            await aiofiles.os.remove(path)
+        with suppress(FileNotFoundError):
+            await aiofiles.os.remove(self._get_path(bucket, key))
 
     async def exists(self, bucket: str, key: str) -> bool:
         """Check if blob exists."""
@@ -182,32 +337,13 @@ class LocalBlobStorage(BlobStorage):
     ) -> BlobMetadata:
         """Get metadata for a blob."""
         path = self._get_path(bucket, key)
-        if not await aiofiles.os.path.exists(path):
-            raise FileNotFoundError(f"Blob {bucket}/{key} not found")
-
-        stat = await aiofiles.os.stat(path)
-
-        if not include_md5:
-            return BlobMetadata(size=stat.st_size)
-
-        # Compute MD5 and size
-        md5_hasher = hashlib.md5()
-        read_size = 0
-        async with aiofiles.open(path, "rb") as f:
-            while True:
-                chunk = await f.read(8192)
-                if not chunk:
-                    break
-                md5_hasher.update(chunk)
-                read_size += len(chunk)
-
-        if read_size != stat.st_size:
-            # This could happen if file was modified during read
-            raise ValueError(
-                f"File size changed during read: metadata={stat.st_size}, read={read_size}"
-            )
-
-        return BlobMetadata(size=stat.st_size, content_md5=md5_hasher.hexdigest())
+        try:
+            if include_md5:
+                return await asyncio.to_thread(_md5_metadata, path)
+            stat = await aiofiles.os.stat(path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Blob {bucket}/{key} not found") from None
+        return BlobMetadata(size=stat.st_size)
 
     def get_blob_path(self, bucket: str, key: str) -> Path:
         """Get physical path to the blob."""
@@ -1,9 +1,11 @@
+import asyncio
 import logging
 import time
 from abc import ABC, abstractmethod
 from typing import Optional
 
 from sqlalchemy import delete, select, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from supernote.server.db.models.kv import KeyValueDO
 from supernote.server.db.session import DatabaseSessionManager
@@ -12,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TTL = 31536000  # 1 year in seconds
 
+PURGE_INTERVAL = 60  # seconds between purges of expired keys
+
 
 class CoordinationService(ABC):
     """Interface for distributed locks and key-value state (tokens).
@@ -52,30 +56,56 @@ class SqliteCoordinationService(CoordinationService):
 
     def __init__(self, session_manager: DatabaseSessionManager) -> None:
         self._session_manager = session_manager
-
-    async def _cleanup(self) -> None:
-        """Cleanup expired keys."""
-        # This could be run periodically or on access.
-        # For simplicity, we trust on-access checks or external cleanup jobs.
-        pass
+        self._purge_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """Start periodically purging expired keys."""
+        if self._purge_task is None:
+            self._purge_task = asyncio.create_task(self._purge_loop())
+
+    async def stop(self) -> None:
+        """Stop purging expired keys."""
+        if self._purge_task is None:
+            return
+        self._purge_task.cancel()
+        try:
+            await self._purge_task
+        except asyncio.CancelledError:
+            pass
+        self._purge_task = None
+
+    async def _purge_loop(self) -> None:
+        while True:
+            await asyncio.sleep(PURGE_INTERVAL)
+            try:
+                await self.purge_expired()
+            except Exception:
+                logger.exception("Failed to purge expired keys")
+
+    async def purge_expired(self) -> int:
+        """Delete all expired keys, returning the number of keys deleted.
+
+        Reads ignore expired keys without deleting them, so this keeps the
+        table from growing with keys that are never read again.
+        """
+        async with self._session_manager.session() as session:
+            stmt = delete(KeyValueDO).where(KeyValueDO.expiry < time.time())
+            result = await session.execute(stmt)
+            await session.commit()
+            return int(result.rowcount)  # type: ignore[attr-defined]
 
     async def set_value(self, key: str, value: str, ttl: int | None = None) -> None:
         """Set a key-value pair with optional TTL."""
         async with self._session_manager.session() as session:
             expiry = time.time() + (ttl if ttl else DEFAULT_TTL)
 
-            # Upsert
-            stmt = select(KeyValueDO).where(KeyValueDO.key == key)
-            result = await session.execute(stmt)
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                existing.value = value
-                existing.expiry = expiry
-            else:
-                new_kv = KeyValueDO(key=key, value=value, expiry=expiry)
-                session.add(new_kv)
-
+            # Upsert in a single statement
+            stmt = sqlite_insert(KeyValueDO).values(key=key, value=value, expiry=expiry)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[KeyValueDO.key],
+                set_={"value": stmt.excluded.value, "expiry": stmt.excluded.expiry},
+            )
+            await session.execute(stmt)
             await session.commit()
 
     async def get_value(self, key: str) -> Optional[str]:
@@ -85,13 +115,7 @@ class SqliteCoordinationService(CoordinationService):
             result = await session.execute(stmt)
             kv = result.scalar_one_or_none()
 
-            if not kv:
-                return None
-
-            if time.time() > kv.expiry:
-                # Lazy delete
-                await session.execute(delete(KeyValueDO).where(KeyValueDO.key == key))
-                await session.commit()
+            if not kv or time.time() > kv.expiry:
                 return None
 
             return kv.value
@@ -1,11 +1,19 @@
+import asyncio
+import functools
+import inspect
 import logging
+import weakref
+from collections import OrderedDict
 from dataclasses import dataclass
 from io import BytesIO
 from pathlib import Path
+from typing import Any, Awaitable, Callable, TypeVar, cast
 
 from sqlalchemy import select
+from sqlalchemy.orm import QueryableAttribute
 
 from supernote.models.base import BooleanEnum
+from supernote.models.file_common import FileSortOrder, FileSortSequence
 from supernote.notebook import (
     ImageConverter,
     PdfConverter,
@@ -46,8 +54,23 @@ __all__ = [
     "FileEntity",
 ]
 
+FILE_INFO_CACHE_SIZE = 4096
+"""Maximum number of file info lookups cached by `FileService`."""
 
-@dataclass
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
+
+# Columns used to order listings. Anything else is ordered by time.
+_FILE_SORT_COLUMNS: dict[str, QueryableAttribute[Any]] = {
+    FileSortOrder.FILENAME: UserFileDO.file_name,
+    FileSortOrder.SIZE: UserFileDO.size,
+}
+_RECYCLE_SORT_COLUMNS: dict[str, QueryableAttribute[Any]] = {
+    FileSortOrder.FILENAME: RecycleFileDO.file_name,
+    FileSortOrder.SIZE: RecycleFileDO.size,
+}
+
+
+@dataclass(slots=True)
 class FileEntity:
     """Domain object representing a file in the system."""
 
@@ -89,17 +112,17 @@ def _to_file_entity(node: UserFileDO, full_path: str) -> FileEntity:
         id=node.id,
         parent_id=node.directory_id,
         name=node.file_name,
-        is_folder=bool(node.is_folder == "Y"),
+        is_folder=node.is_folder == "Y",
         size=node.size,
         md5=node.md5,
-        create_time=int(node.create_time),
-        update_time=int(node.update_time),
+        create_time=node.create_time,
+        update_time=node.update_time,
         full_path=full_path,
         storage_key=node.storage_key,
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RecycleEntity:
     """Domain object representing a file in the system."""
 
@@ -120,9 +143,9 @@ def _to_recycle_entity(node: RecycleFileDO) -> RecycleEntity:
     return RecycleEntity(
         id=node.id,
         name=node.file_name,
-        is_folder=bool(node.is_folder == "Y"),
+        is_folder=node.is_folder == "Y",
         size=node.size,
-        delete_time=int(node.delete_time),
+        delete_time=node.delete_time,
     )
 
 
@@ -150,6 +173,28 @@ class ConversionsVO:
     page_no: int
 
 
+def _invalidates_file_info(func: _F) -> _F:
+    """Mark a method that changes the files of the user given as first argument.
+
+    Cached file info for the user is invalidated once the method finishes,
+    whether or not it succeeds, so it also covers partially applied changes.
+    """
+    user_arg = list(inspect.signature(func).parameters)[1]
+
+    @functools.wraps(func)
+    async def wrapper(self: "FileService", *args: Any, **kwargs: Any) -> Any:
+        user = kwargs[user_arg] if user_arg in kwargs else args[0]
+        user_id = await self.user_service.get_user_id(user)
+        try:
+            return await func(self, *args, **kwargs)
+        finally:
+            self._file_info_generations[user_id] = (
+                self._file_info_generations.get(user_id, 0) + 1
+            )
+
+    return cast(_F, wrapper)
+
+
 class FileService:
     """File service."""
 
@@ -169,6 +214,34 @@ class FileService:
         self.session_manager = session_manager
         self.event_bus = event_bus
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._non_empty_users: set[int] = set()
+        """Ids of users known to have active files, see `is_empty`."""
+        self._directory_locks: weakref.WeakValueDictionary[int, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        """Per-user locks held while creating directories, see `_directory_lock`."""
+        # File caches are keyed by user id rather than email, since an email
+        # can be moved to another account.
+        self._file_info_cache: OrderedDict[
+            tuple[int, str | int], tuple[int, FileEntity | None]
+        ] = OrderedDict()
+        """LRU cache of file info lookups: (user id, path or id) -> (generation, info)."""
+        self._file_info_generations: dict[int, int] = {}
+        """Per-user id counter bumped by every change to the user's files."""
+        self._storage_usage_cache: dict[int, tuple[int, int]] = {}
+        """Storage usage by user id: user id -> (generation, usage)."""
+
+    def _directory_lock(self, user_id: int) -> asyncio.Lock:
+        """Return the lock serializing directory creation for a user.
+
+        Creating a missing directory is a check-then-insert, so concurrent
+        uploads into a new path could otherwise create the same directory
+        twice. Locks are dropped once no request holds them.
+        """
+        if (lock := self._directory_locks.get(user_id)) is None:
+            lock = asyncio.Lock()
+            self._directory_locks[user_id] = lock
+        return lock
 
     async def list_folder(
         self, user: str, path_str: str, recursive: bool = False
@@ -191,21 +264,20 @@ class FileService:
                 parent_id = node.id
 
             if recursive:
-                recursive_list = await vfs.list_recursive(user_id, parent_id)
-                for item, rel_path in recursive_list:
-                    full_path = f"{clean_path}/{rel_path}" if clean_path else rel_path
-                    entities.append(_to_file_entity(item, full_path))
+                recursive_list = await vfs.list_recursive(
+                    user_id, parent_id, clean_path
+                )
+                entities.extend(
+                    _to_file_entity(item, full_path)
+                    for item, full_path in recursive_list
+                )
             else:
                 # Flat listing
                 do_list = await vfs.list_directory(user_id, parent_id)
-
-                for item in do_list:
-                    full_path = (
-                        f"{clean_path}/{item.file_name}"
-                        if clean_path
-                        else item.file_name
-                    )
-                    entities.append(_to_file_entity(item, full_path))
+                prefix = f"{clean_path}/" if clean_path else ""
+                entities.extend(
+                    _to_file_entity(item, prefix + item.file_name) for item in do_list
+                )
         return entities
 
     async def list_folder_by_id(
@@ -218,48 +290,69 @@ class FileService:
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
 
-            # Check if folder exists and verify ownership
+            # Check if folder exists and verify ownership. The ancestor chain
+            # ends with the folder itself and also gives its path.
+            base_path = ""
             if folder_id != 0:
-                node = await vfs.get_node_by_id(user_id, folder_id)
-                if not node:
+                chain = await vfs.get_ancestor_chain(user_id, folder_id)
+                if not chain:
                     raise FileNotFound(f"Folder ID {folder_id} not found")
-                if node.is_folder != "Y":
+                if chain[-1].is_folder != "Y":
                     raise InvalidPath(f"ID {folder_id} is not a folder")
-                # TODO: Retrieve path string for display if needed?
-                # For V3 (device), path_display might not be critical or we can construct relative to root?
-                # We can't easily rebuild full path without walking up.
-                # Assuming devices rely on IDs and relative paths.
-
-            # Resolve base path for the folder
-            base_path_display = await vfs.get_full_path(user_id, folder_id)
+                base_path = "/".join(node.file_name for node in chain)
 
             if recursive:
-                recursive_list = await vfs.list_recursive(user_id, folder_id)
-                for item, rel_path in recursive_list:
-                    # rel_path is relative to folder_id
-                    # if base_path is empty (root), full path is /rel_path
-                    # if base_path is /foo, full path is /foo/rel_path
-                    base_path_clean = base_path_display.strip("/")
-                    full_path = (
-                        f"{base_path_clean}/{rel_path}" if base_path_clean else rel_path
-                    )
-                    entities.append(_to_file_entity(item, full_path))
+                recursive_list = await vfs.list_recursive(user_id, folder_id, base_path)
+                entities.extend(
+                    _to_file_entity(item, full_path)
+                    for item, full_path in recursive_list
+                )
             else:
                 do_list = await vfs.list_directory(user_id, folder_id)
-                for item in do_list:
-                    base_path_clean = base_path_display.strip("/")
-                    full_path = (
-                        f"{base_path_clean}/{item.file_name}"
-                        if base_path_clean
-                        else item.file_name
-                    )
-                    entities.append(_to_file_entity(item, full_path))
+                prefix = f"{base_path}/" if base_path else ""
+                entities.extend(
+                    _to_file_entity(item, prefix + item.file_name) for item in do_list
+                )
         return entities
 
+    async def _cached_file_info(
+        self,
+        user_id: int,
+        key: str | int,
+        load: Callable[[], Awaitable[FileEntity | None]],
+    ) -> FileEntity | None:
+        """Return file info from the cache, or load and cache it.
+
+        Entries are stamped with the user's generation when the load starts
+        and are ignored once any change to the user's files bumps it, so a
+        lookup that raced with a change is never served afterwards.
+        """
+        generation = self._file_info_generations.get(user_id, 0)
+        cache_key = (user_id, key)
+        entry = self._file_info_cache.get(cache_key)
+        if entry is not None and entry[0] == generation:
+            self._file_info_cache.move_to_end(cache_key)
+            return entry[1]
+        info = await load()
+        self._file_info_cache[cache_key] = (generation, info)
+        self._file_info_cache.move_to_end(cache_key)
+        if len(self._file_info_cache) > FILE_INFO_CACHE_SIZE:
+            self._file_info_cache.popitem(last=False)
+        return info
+
     async def get_file_info(self, user: str, path_str: str) -> FileEntity | None:
-        """Get file info by path or ID for a specific user using VFS."""
+        """Get file info by path or ID for a specific user using VFS.
+
+        Results are cached until the user's files change.
+        """
         user_id = await self.user_service.get_user_id(user)
+        return await self._cached_file_info(
+            user_id,
+            path_str,
+            functools.partial(self._load_file_info, user_id, path_str),
+        )
 
+    async def _load_file_info(self, user_id: int, path_str: str) -> FileEntity | None:
         # Handle Root
         clean_path = path_str.strip("/")
         if not clean_path:
@@ -283,13 +376,25 @@ class FileService:
                 return None
 
             # Always resolve the canonical path from the node structure
-            full_path = await vfs.get_full_path(user_id, node.id)
+            full_path = await vfs.get_node_path(user_id, node)
 
             return _to_file_entity(node, full_path)
 
     async def get_file_info_by_id(self, user: str, file_id: int) -> FileEntity | None:
-        """Get file info by path or ID for a specific user using VFS."""
+        """Get file info by path or ID for a specific user using VFS.
+
+        Results are cached until the user's files change.
+        """
         user_id = await self.user_service.get_user_id(user)
+        return await self._cached_file_info(
+            user_id,
+            file_id,
+            functools.partial(self._load_file_info_by_id, user_id, file_id),
+        )
+
+    async def _load_file_info_by_id(
+        self, user_id: int, file_id: int
+    ) -> FileEntity | None:
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
             node = await vfs.get_node_by_id(user_id, file_id)
@@ -297,8 +402,8 @@ class FileService:
                 return None
 
             # Always resolve the canonical path from the node structure.
-            # This may do a bunch of queries.
-            full_path = await vfs.get_full_path(user_id, node.id)
+            # This may do a bunch of queries, one per ancestor.
+            full_path = await vfs.get_node_path(user_id, node)
 
             return _to_file_entity(node, full_path)
 
@@ -314,24 +419,16 @@ class FileService:
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
 
-            # Resolve paths by walking up to root (directory_id=0)
-            path_parts: list[str] = []
-            id_path_parts: list[str] = []
-
-            curr_id = node_id
-            while curr_id != 0:
-                node = await vfs.get_node_by_id(user_id, curr_id)
-                if not node:
-                    break
-                path_parts.insert(0, node.file_name)
-                id_path_parts.insert(0, str(node.id))
-                curr_id = node.directory_id
+            chain = await vfs.get_ancestor_chain(user_id, node_id)
+            path_parts = [node.file_name for node in chain]
+            id_path_parts = [str(node.id) for node in chain]
 
             # Construct paths
             path = "/".join(path_parts).strip()
             id_path = "/".join(id_path_parts).strip()
             return PathInfo(path=path, id_path=id_path)
 
+    @_invalidates_file_info
     async def finish_upload(
         self,
         user: str,
@@ -365,7 +462,8 @@ class FileService:
             clean_path = path_str.strip("/")
             parent_id = 0
             if clean_path:
-                parent_id = await vfs.ensure_directory_path(user_id, clean_path)
+                async with self._directory_lock(user_id):
+                    parent_id = await vfs.ensure_directory_path(user_id, clean_path)
 
             new_file = await vfs.create_file(
                 user_id=user_id,
@@ -390,6 +488,7 @@ class FileService:
 
         return _to_file_entity(new_file, full_path)
 
+    @_invalidates_file_info
     async def upload_finish_web(
         self,
         user: str,
@@ -441,6 +540,7 @@ class FileService:
                 )
             )
 
+    @_invalidates_file_info
     async def create_directory(self, user: str, path: str) -> FileEntity:
         """Create a directory for a specific user using VFS."""
         user_id = await self.user_service.get_user_id(user)
@@ -450,7 +550,8 @@ class FileService:
 
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
-            node_id = await vfs.ensure_directory_path(user_id, rel_path)
+            async with self._directory_lock(user_id):
+                node_id = await vfs.ensure_directory_path(user_id, rel_path)
             node = await vfs.get_node_by_id(user_id, node_id)
             if not node:
                 raise FileError(f"Failed to create directory: {rel_path}")
@@ -459,6 +560,7 @@ class FileService:
 
     # TODO: We should be able to share code between the version that creates by path
     # and the version that creates by ID.
+    @_invalidates_file_info
     async def create_directory_by_id(
         self, user: str, parent_id: int, name: str
     ) -> FileEntity:
@@ -467,10 +569,11 @@ class FileService:
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
             new_dir = await vfs.create_directory(user_id, parent_id, name)
-            full_path = await vfs.get_full_path(user_id, new_dir.id)
+            full_path = await vfs.get_node_path(user_id, new_dir)
 
             return _to_file_entity(new_dir, full_path)
 
+    @_invalidates_file_info
     async def delete_item(self, email: str, id: int) -> FileEntity:
         """Delete a file or directory for a specific user using VFS."""
         user_id = await self.user_service.get_user_id(email)
@@ -485,40 +588,44 @@ class FileService:
             if node.file_name in IMMUTABLE_SYSTEM_DIRECTORIES:
                 raise AccessDenied(f"Cannot delete system directory: {node.file_name}")
 
-            path_display = await vfs.get_full_path(user_id, node.id)
+            path_display = await vfs.get_node_path(user_id, node)
             entity = _to_file_entity(node, path_display)
 
             success = await vfs.delete_node(user_id, id)
             if not success:
                 raise FileNotFound(f"Node {id} not found for user {email}")
+            self._non_empty_users.discard(user_id)
             return entity
 
+    @_invalidates_file_info
     async def delete_items(self, user: str, id_list: list[int], parent_id: int) -> None:
         """Delete files or directories for a specific user using VFS (Web API)."""
         user_id = await self.user_service.get_user_id(user)
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
-            for file_id in id_list:
-                # Validate parent ownership/location
-                node = await vfs.get_node_by_id(user_id, file_id)
-                if not node:
-                    continue  # Already gone?
-
+            nodes = await vfs.get_nodes_by_ids(user_id, id_list)
+            # Missing ids are skipped as already gone. Everything else is
+            # validated before anything is deleted.
+            misplaced = {
+                node.directory_id
+                for node in nodes.values()
+                if node.directory_id != parent_id
+            }
+            # Special case for flattened Web API: allow parent_id=0 if it's a
+            # child of a category container
+            parents = (
+                await vfs.get_nodes_by_ids(user_id, misplaced)
+                if parent_id == 0 and misplaced
+                else {}
+            )
+            for node in nodes.values():
                 if node.directory_id != parent_id:
-                    # Special case for flattened Web API: allow parent_id=0 if it's a categorized folder
-                    is_categorized = False
-                    # We need to know if it's a child of a category container
-                    async with self.session_manager.session() as sess:
-                        vfs_i = VirtualFileSystem(sess)
-                        parent_node = await vfs_i.get_node_by_id(
-                            user_id, node.directory_id
-                        )
-                        if parent_node and parent_node.file_name in CATEGORY_CONTAINERS:
-                            is_categorized = True
-
-                    if not (parent_id == 0 and is_categorized):
+                    parent_node = parents.get(node.directory_id)
+                    if not (
+                        parent_node and parent_node.file_name in CATEGORY_CONTAINERS
+                    ):
                         raise InvalidPath(
-                            f"File {file_id} is not in directory {parent_id}"
+                            f"File {node.id} is not in directory {parent_id}"
                         )
 
                 # Immutability check
@@ -527,22 +634,45 @@ class FileService:
                         f"Cannot delete system directory: {node.file_name}"
                     )
 
-                await vfs.delete_node(user_id, file_id)
+            if nodes:
+                await vfs.delete_nodes(user_id, list(nodes.values()))
+                self._non_empty_users.discard(user_id)
 
     async def get_storage_usage(self, user: str) -> int:
-        """Get total storage usage for a specific user using VFS."""
+        """Get total storage usage for a specific user using VFS.
+
+        The result is cached until the user's files change, since clients
+        poll for it far more often than they change files.
+        """
         user_id = await self.user_service.get_user_id(user)
+        generation = self._file_info_generations.get(user_id, 0)
+        entry = self._storage_usage_cache.get(user_id)
+        if entry is not None and entry[0] == generation:
+            return entry[1]
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
-            return await vfs.get_total_usage(user_id)
+            usage = await vfs.get_total_usage(user_id)
+        self._storage_usage_cache[user_id] = (generation, usage)
+        return usage
 
     async def is_empty(self, user: str) -> bool:
-        """Check if user storage is empty using VFS."""
+        """Check if user storage is empty using VFS.
+
+        This is checked at the start of every sync and is almost never true
+        once a user has files, so a non-empty result is remembered until the
+        user deletes something.
+        """
         user_id = await self.user_service.get_user_id(user)
+        if user_id in self._non_empty_users:
+            return False
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
-            return await vfs.is_empty(user_id)
+            empty = await vfs.is_empty(user_id)
+        if not empty:
+            self._non_empty_users.add(user_id)
+        return empty
 
+    @_invalidates_file_info
     async def move_items(
         self,
         user: str,
@@ -554,8 +684,9 @@ class FileService:
 
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
+            nodes = await vfs.get_nodes_by_ids(user_id, id_list)
             for item_id in id_list:
-                node = await vfs.get_node_by_id(user_id, item_id)
+                node = nodes.get(item_id)
                 if not node:
                     raise FileNotFound(f"Source item {item_id} not found")
 
@@ -565,6 +696,8 @@ class FileService:
                         f"Cannot move system directory: {node.file_name}"
                     )
 
+            for item_id in id_list:
+                node = nodes[item_id]
                 await vfs.move_node(
                     user_id,
                     item_id,
@@ -573,6 +706,7 @@ class FileService:
                     autorename=True,
                 )
 
+    @_invalidates_file_info
     async def move_item(
         self, user: str, item_id: int, to_path: str, autorename: bool = False
     ) -> FileEntity:
@@ -589,9 +723,11 @@ class FileService:
             if node.file_name in IMMUTABLE_SYSTEM_DIRECTORIES:
                 raise AccessDenied(f"Cannot move system directory: {node.file_name}")
 
-            # Resolve destination parent
-            clean_to_path = to_path.strip("/")
+            # Resolve destination parent. Its path is tracked as well, so the
+            # result's path does not have to be re-read from the database.
+            clean_to_path = "/".join(p for p in to_path.split("/") if p)
             parent_id = 0
+            parent_path = ""
             new_name = node.file_name
 
             if clean_to_path:
@@ -599,14 +735,16 @@ class FileService:
                 if dest_node and dest_node.is_folder == "Y":
                     # Destination is an existing folder, move INTO it
                     parent_id = dest_node.id
+                    parent_path = clean_to_path
                 else:
                     # Destination is a new path (rename)
                     parts = clean_to_path.rsplit("/", 1)
                     if len(parts) == 2:
                         parent_path, new_name = parts
-                        parent_id = await vfs.ensure_directory_path(
-                            user_id, parent_path
-                        )
+                        async with self._directory_lock(user_id):
+                            parent_id = await vfs.ensure_directory_path(
+                                user_id, parent_path
+                            )
                     else:
                         new_name = parts[0]
                         parent_id = 0
@@ -617,11 +755,14 @@ class FileService:
 
             if not new_node:
                 raise FileError(f"Moving item {item_id} to {parent_id} failed")
-            # Re-fetch the new full path for simplicity rather than trying to
-            # rebuild it.
-            full_path = await vfs.get_full_path(user_id, new_node.id)
+            full_path = (
+                f"{parent_path}/{new_node.file_name}"
+                if parent_path
+                else new_node.file_name
+            )
             return _to_file_entity(new_node, full_path)
 
+    @_invalidates_file_info
     async def copy_items(
         self,
         user: str,
@@ -633,8 +774,9 @@ class FileService:
 
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
+            nodes = await vfs.get_nodes_by_ids(user_id, id_list)
             for item_id in id_list:
-                node = await vfs.get_node_by_id(user_id, item_id)
+                node = nodes.get(item_id)
                 if not node:
                     raise FileNotFound(f"Source item {item_id} not found")
 
@@ -645,6 +787,8 @@ class FileService:
                         f"Cannot copy system directory: {node.file_name}"
                     )
 
+            for item_id in id_list:
+                node = nodes[item_id]
                 # Copy logic (no source parent check usually required for copy but we can add it for completeness)
                 await vfs.copy_node(
                     user_id,
@@ -654,6 +798,7 @@ class FileService:
                     new_name=node.file_name,
                 )
 
+    @_invalidates_file_info
     async def copy_item(
         self, email: str, id: int, to_path: str, autorename: bool
     ) -> FileEntity:
@@ -670,9 +815,11 @@ class FileService:
             if node.file_name in IMMUTABLE_SYSTEM_DIRECTORIES:
                 raise AccessDenied(f"Cannot copy system directory: {node.file_name}")
 
-            # Resolve destination parent
-            clean_to_path = to_path.strip("/")
+            # Resolve destination parent. Its path is tracked as well, so the
+            # result's path does not have to be re-read from the database.
+            clean_to_path = "/".join(p for p in to_path.split("/") if p)
             parent_id = 0
+            parent_path = ""
             new_name = node.file_name
 
             if clean_to_path:
@@ -680,14 +827,16 @@ class FileService:
                 if dest_node and dest_node.is_folder == "Y":
                     # Destination is an existing folder, copy INTO it
                     parent_id = dest_node.id
+                    parent_path = clean_to_path
                 else:
                     # Destination is a new path (rename)
                     parts = clean_to_path.rsplit("/", 1)
                     if len(parts) == 2:
                         parent_path, new_name = parts
-                        parent_id = await vfs.ensure_directory_path(
-                            user_id, parent_path
-                        )
+                        async with self._directory_lock(user_id):
+                            parent_id = await vfs.ensure_directory_path(
+                                user_id, parent_path
+                            )
                     else:
                         new_name = parts[0]
                         parent_id = 0
@@ -699,11 +848,14 @@ class FileService:
             if not new_node:
                 raise FileError(f"Copying item {id} to {parent_id} failed")
 
-            # Re-fetch the new full path for simplicity rather than trying to
-            # rebuild it.
-            full_path = await vfs.get_full_path(user_id, new_node.id)
+            full_path = (
+                f"{parent_path}/{new_node.file_name}"
+                if parent_path
+                else new_node.file_name
+            )
             return _to_file_entity(new_node, full_path)
 
+    @_invalidates_file_info
     async def rename_item(self, user: str, id: int, new_name: str) -> None:
         """Rename a file or directory for a specific user using VFS."""
         user_id = await self.user_service.get_user_id(user)
@@ -760,7 +912,7 @@ class FileService:
                 has_subfolders = any(c.is_folder == BooleanEnum.YES for c in children)
 
                 # Construct FileEntity
-                full_path = await vfs.get_full_path(user_id, node.id)
+                full_path = await vfs.get_node_path(user_id, node)
 
                 entity = FileEntity(
                     id=node.id,
@@ -769,8 +921,8 @@ class FileService:
                     is_folder=True,
                     size=node.size,
                     md5=node.md5,
-                    create_time=int(node.create_time),
-                    update_time=int(node.update_time),
+                    create_time=node.create_time,
+                    update_time=node.update_time,
                     full_path=full_path,
                 )
 
@@ -786,20 +938,31 @@ class FileService:
             vfs = VirtualFileSystem(session)
             return await vfs.get_full_path(user_id, node_id)
 
-    async def list_recycle(self, user: str) -> list[RecycleEntity]:
-        """List files in recycle bin for a specific user using VFS."""
+    async def list_recycle(
+        self,
+        user: str,
+        order: FileSortOrder,
+        sequence: FileSortSequence,
+        page_no: int,
+        page_size: int,
+    ) -> tuple[list[RecycleEntity], int]:
+        """List a page of the recycle bin for a specific user using VFS.
+
+        Returns the page of items and the total number of items.
+        """
         user_id = await self.user_service.get_user_id(user)
 
-        recycle_files: list[RecycleEntity] = []
-
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
-            items = await vfs.list_recycle(user_id)
-
-            for item in items:
-                recycle_files.append(_to_recycle_entity(item))
+            items, total = await vfs.list_recycle_page(
+                user_id,
+                _RECYCLE_SORT_COLUMNS.get(order, RecycleFileDO.delete_time),
+                sequence.lower() == FileSortSequence.DESC,
+                (page_no - 1) * page_size,
+                page_size,
+            )
 
-        return recycle_files
+        return [_to_recycle_entity(item) for item in items], total
 
     async def delete_from_recycle(self, user: str, id_list: list[int]) -> None:
         """Permanently delete items from recycle bin for a specific user using VFS."""
@@ -827,13 +990,13 @@ class FileService:
                             NoteDeletedEvent(file_id=node.file_id, user_id=user_id)
                         )
 
+    @_invalidates_file_info
     async def revert_from_recycle(self, user: str, id_list: list[int]) -> None:
         """Restore items from recycle bin for a specific user using VFS."""
         user_id = await self.user_service.get_user_id(user)
         async with self.session_manager.session() as session:
             vfs = VirtualFileSystem(session)
-            for recycle_id in id_list:
-                await vfs.restore_node(user_id, recycle_id)
+            await vfs.restore_nodes(user_id, id_list)
 
     async def clear_recycle(self, user: str) -> None:
         """Empty the recycle bin for a specific user using VFS."""
@@ -858,7 +1021,7 @@ class FileService:
 
             for item in do_list:
                 # Resolve full path using VFS recursion
-                full_path = await vfs.get_full_path(user_id, item.id)
+                full_path = await vfs.get_node_path(user_id, item)
                 results.append(_to_file_entity(item, full_path))
 
         return results
@@ -878,11 +1041,45 @@ class FileService:
             # Mapping to FileEntity
             file_entities: list[FileEntity] = []
             for item in items:
-                full_path = await vfs.get_full_path(user_id, item.id)
+                full_path = await vfs.get_node_path(user_id, item)
                 file_entities.append(_to_file_entity(item, full_path))
 
             return file_entities
 
+    async def query_file_page(
+        self,
+        user: str,
+        directory_id: int,
+        order: FileSortOrder,
+        sequence: FileSortSequence,
+        page_no: int,
+        page_size: int,
+    ) -> tuple[list[FileEntity], int]:
+        """Query a page of files in a directory for a specific user.
+
+        Returns the page of files and the total number of files in the
+        directory.
+        """
+        user_id = await self.user_service.get_user_id(user)
+
+        async with self.session_manager.session() as session:
+            vfs = VirtualFileSystem(session)
+            items, total = await vfs.list_directory_page(
+                user_id,
+                directory_id,
+                _FILE_SORT_COLUMNS.get(order, UserFileDO.update_time),
+                sequence.lower() == FileSortSequence.DESC,
+                (page_no - 1) * page_size,
+                page_size,
+            )
+
+            file_entities: list[FileEntity] = []
+            for item in items:
+                full_path = await vfs.get_node_path(user_id, item)
+                file_entities.append(_to_file_entity(item, full_path))
+
+            return file_entities, total
+
     async def convert_note_to_png(self, user: str, file_id: int) -> list[ConversionsVO]:
         """Convert a note to PNG pages."""
         user_id = await self.user_service.get_user_id(user)
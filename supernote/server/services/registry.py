@@ -0,0 +1,36 @@
+"""Registry of the long-lived services shared by request handlers.
+
+The services are resolved once when the application is created and stored
+on the app under a single key, so handlers perform one lookup per request
+instead of one lookup per service.
+"""
+
+from dataclasses import dataclass
+
+from aiohttp import web
+
+from supernote.server.services.file import FileService
+from supernote.server.services.sync_lock import SyncLocks
+from supernote.server.utils.url_signer import UrlSigner
+
+__all__ = [
+    "Services",
+    "get_services",
+]
+
+SERVICES_KEY = "services"
+
+
+@dataclass(frozen=True, slots=True)
+class Services:
+    """Services used by the file request handlers."""
+
+    file_service: FileService
+    url_signer: UrlSigner
+    sync_locks: SyncLocks
+
+
+def get_services(request: web.Request) -> Services:
+    """Return the services registered on the request's application."""
+    services: Services = request.app[SERVICES_KEY]
+    return services
@@ -89,6 +89,17 @@ class SummaryService:
         """Initialize the summary service."""
         self.user_service = user_service
         self.session_manager = session_manager
+        # Tag lists are read on every folder navigation but rarely change.
+        # The generation is bumped on every change so that a list read
+        # while a tag is changing is not cached. Both are keyed by user id,
+        # since an email can move to another account.
+        self._tags_cache: dict[int, list[SummaryTagItem]] = {}
+        self._tags_generations: dict[int, int] = {}
+
+    def _invalidate_tags(self, user_id: int) -> None:
+        """Drop the cached tag list for a user after a tag changes."""
+        self._tags_generations[user_id] = self._tags_generations.get(user_id, 0) + 1
+        self._tags_cache.pop(user_id, None)
 
     async def add_tag(self, user_email: str, name: str) -> SummaryTagItem:
         """Add a new summary tag."""
@@ -101,6 +112,7 @@ class SummaryService:
             )
             session.add(tag_do)
             await session.commit()
+            self._invalidate_tags(user_id)
             await session.refresh(tag_do)
             return _to_tag_item(tag_do)
 
@@ -113,6 +125,7 @@ class SummaryService:
                 raise SummaryNotFound(f"Tag with ID {tag_id} not found")
             tag_do.name = name
             await session.commit()
+            self._invalidate_tags(user_id)
             return True
 
     async def delete_tag(self, user_email: str, tag_id: int) -> bool:
@@ -124,16 +137,24 @@ class SummaryService:
                 raise SummaryNotFound(f"Tag with ID {tag_id} not found")
             await session.delete(tag_do)
             await session.commit()
+            self._invalidate_tags(user_id)
             return True
 
     async def list_tags(self, user_email: str) -> list[SummaryTagItem]:
         """List all summary tags for a user."""
         user_id = await self.user_service.get_user_id(user_email)
+        if (cached := self._tags_cache.get(user_id)) is not None:
+            return list(cached)
+
+        generation = self._tags_generations.get(user_id, 0)
         async with self.session_manager.session() as session:
             stmt = select(SummaryTagDO).where(SummaryTagDO.user_id == user_id)
             result = await session.execute(stmt)
-            tags = list(result.scalars().all())
-            return [_to_tag_item(tag) for tag in tags]
+            tags = [_to_tag_item(tag) for tag in result.scalars().all()]
+
+        if self._tags_generations.get(user_id, 0) == generation:
+            self._tags_cache[user_id] = tags
+        return list(tags)
 
     async def add_summary(self, user_email: str, dto: AddSummaryDTO) -> SummaryItem:
         """Add a new summary."""
@@ -0,0 +1,89 @@
+"""Per-user locks that keep one device synchronizing at a time."""
+
+import asyncio
+import heapq
+import logging
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "MAX_EVICTIONS_PER_CALL",
+    "SYNC_LOCK_TIMEOUT",
+    "SyncLocks",
+]
+
+SYNC_LOCK_TIMEOUT = 300  # 5 minutes
+
+# Upper bound on stale heap entries removed per call, so a burst of expiries
+# is spread across requests rather than stalling one of them.
+MAX_EVICTIONS_PER_CALL = 8
+
+
+class SyncLocks:
+    """Tracks which device currently owns the sync session for each user.
+
+    Expiry times use the monotonic clock so wall clock adjustments cannot
+    extend or cut short a session. Expiries are also kept in a heap so stale
+    sessions are evicted in order, a few per acquire, rather than lingering
+    for users that never sync again.
+    """
+
+    __slots__ = ("_timeout", "_clock", "_mutex", "_owners", "_expiries")
+
+    def __init__(
+        self,
+        timeout: float = SYNC_LOCK_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the sync locks."""
+        self._timeout = timeout
+        self._clock = clock
+        self._mutex = asyncio.Lock()
+        self._owners: dict[str, tuple[str, float]] = {}
+        """Active sync sessions: user -> (equipment_no, expiry)."""
+        self._expiries: list[tuple[float, str]] = []
+        """Heap of (expiry, user), may contain entries superseded by a renewal."""
+
+    def __len__(self) -> int:
+        """Return the number of tracked sync sessions."""
+        return len(self._owners)
+
+    def _evict_expired(self, now: float) -> None:
+        """Remove a bounded number of sessions that expired at or before `now`."""
+        for _ in range(MAX_EVICTIONS_PER_CALL):
+            if not self._expiries or self._expiries[0][0] > now:
+                return
+            expiry, user = heapq.heappop(self._expiries)
+            owner = self._owners.get(user)
+            if owner is not None and owner[1] == expiry:
+                del self._owners[user]
+
+    async def acquire(self, user: str, equipment_no: str) -> bool:
+        """Start or renew a sync session for the device.
+
+        Returns False if another device holds an unexpired session.
+        """
+        async with self._mutex:
+            now = self._clock()
+            self._evict_expired(now)
+            owner = self._owners.get(user)
+            # Eviction is bounded, so the owner may have expired but not yet
+            # been evicted.
+            if owner is not None and owner[1] > now and owner[0] != equipment_no:
+                logger.info(
+                    "Sync conflict: user %s already syncing from %s", user, owner[0]
+                )
+                return False
+            expiry = now + self._timeout
+            self._owners[user] = (equipment_no, expiry)
+            heapq.heappush(self._expiries, (expiry, user))
+            return True
+
+    async def release(self, user: str, equipment_no: str) -> None:
+        """End the sync session if it is owned by the device."""
+        async with self._mutex:
+            owner = self._owners.get(user)
+            if owner is not None and owner[0] == equipment_no:
+                del self._owners[user]
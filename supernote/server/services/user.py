@@ -67,6 +67,18 @@ class UserService:
         self._config = config
         self._coordination_service = coordination_service
         self._session_manager = session_manager
+        # Nearly every file operation resolves the caller's email to a user
+        # id. A user's id never changes, so only entries for removed or
+        # renamed accounts need to be dropped.
+        self._user_ids: dict[str, int] = {}
+        self._user_id_generations: dict[str, int] = {}
+
+    def _invalidate_user_id(self, account: str) -> None:
+        """Drop the cached id for an email after its account changes."""
+        self._user_id_generations[account] = (
+            self._user_id_generations.get(account, 0) + 1
+        )
+        self._user_ids.pop(account, None)
 
     async def list_users(self) -> list[UserDO]:
         async with self._session_manager.session() as session:
@@ -181,6 +193,7 @@ class UserService:
             )
             await session.execute(delete(UserDO).where(UserDO.id == user.id))
             await session.commit()
+        self._invalidate_user_id(account)
 
     async def generate_random_code(self, account: str) -> tuple[str, str]:
         """Generate a random code for login challenge."""
@@ -206,10 +219,19 @@ class UserService:
         return await self._get_user_do(account)
 
     async def get_user_id(self, account: str) -> int:
-        user = await self._get_user_do(account)
-        if user:
-            return user.id
-        raise ValueError(f"User {account} not found")
+        if (user_id := self._user_ids.get(account)) is not None:
+            return user_id
+        # A lookup that raced with an account change must not be cached.
+        generation = self._user_id_generations.get(account, 0)
+        async with self._session_manager.session() as session:
+            stmt = select(UserDO.id).where(UserDO.email == account)
+            result = await session.execute(stmt)
+            user_id = result.scalar_one_or_none()
+        if user_id is None:
+            raise ValueError(f"User {account} not found")
+        if self._user_id_generations.get(account, 0) == generation:
+            self._user_ids[account] = user_id
+        return user_id
 
     async def verify_login_hash(
         self, account: str, client_hash: str, timestamp: str
@@ -404,6 +426,7 @@ class UserService:
                 update(UserDO).where(UserDO.email == account).values(email=dto.email)
             )
             await session.commit()
+        self._invalidate_user_id(account)
         return True
 
     async def admin_reset_password(self, email: str, password_md5: str) -> None:
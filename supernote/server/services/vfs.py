@@ -1,15 +1,31 @@
 import logging
 import time
-from typing import Optional
+from collections.abc import Collection
+from typing import Any, Optional
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import column, delete, func, literal, select, table, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-
-from supernote.server.db.models.file import RecycleFileDO, UserFileDO
+from sqlalchemy.orm import QueryableAttribute, aliased
+
+from supernote.server.db.models.file import (
+    FILE_NAME_FTS_TABLE,
+    CapacityDO,
+    RecycleFileDO,
+    UserFileDO,
+)
 from supernote.server.exceptions import FileAlreadyExists, InvalidPath
 
 logger = logging.getLogger(__name__)
 
+_FILE_NAME_FTS = table(FILE_NAME_FTS_TABLE, column("rowid"), column("file_name"))
+
+# The trigram tokenizer cannot match terms shorter than a trigram.
+_FTS_MIN_KEYWORD_LENGTH = 3
+
+# Guards ancestor walks against cycles in a corrupted tree.
+_MAX_PATH_DEPTH = 50
+
 
 class VirtualFileSystem:
     """Core implementation of the Database-Driven Virtual Filesystem."""
@@ -63,27 +79,82 @@ class VirtualFileSystem:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def list_directory_page(
+        self,
+        user_id: int,
+        parent_id: int,
+        order_by: QueryableAttribute[Any],
+        descending: bool,
+        offset: int,
+        limit: int,
+    ) -> tuple[list[UserFileDO], int]:
+        """List one page of the immediate children of a directory.
+
+        Returns the page of children and the total number of children. Ties
+        are ordered by id so that pages do not overlap.
+        """
+        criteria = (
+            UserFileDO.user_id == user_id,
+            UserFileDO.directory_id == parent_id,
+            UserFileDO.is_active == "Y",
+        )
+        total = await self.db.scalar(
+            select(func.count()).select_from(UserFileDO).where(*criteria)
+        )
+        stmt = (
+            select(UserFileDO)
+            .where(*criteria)
+            .order_by(order_by.desc() if descending else order_by, UserFileDO.id)
+            .offset(max(offset, 0))
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all()), total or 0
+
     async def list_recursive(
         self, user_id: int, parent_id: int, base_path: str = ""
     ) -> list[tuple[UserFileDO, str]]:
         """List all descendants of a directory recursively.
 
-        Returns a list of tuples: (node, relative_path_from_parent).
+        Returns a list of tuples: (node, path), with each folder followed by
+        its descendants. Paths are relative to the parent, prefixed with
+        `base_path` when one is given.
+
+        The tree is read one level at a time, with a single query for all of
+        the folders at that depth rather than one query per folder.
         """
-        results: list[tuple[UserFileDO, str]] = []
+        children_by_parent: dict[int, list[UserFileDO]] = {}
+        seen = {parent_id}
+        frontier = [parent_id]
+        while frontier:
+            stmt = select(UserFileDO).where(
+                UserFileDO.user_id == user_id,
+                UserFileDO.directory_id.in_(frontier),
+                UserFileDO.is_active == "Y",
+            )
+            result = await self.db.execute(stmt)
+            frontier = []
+            for child in result.scalars():
+                children_by_parent.setdefault(child.directory_id, []).append(child)
+                if child.is_folder == "Y" and child.id not in seen:
+                    seen.add(child.id)
+                    frontier.append(child.id)
 
-        children = await self.list_directory(user_id, parent_id)
-        for child in children:
+        results: list[tuple[UserFileDO, str]] = []
+        stack = [
+            (child, base_path)
+            for child in reversed(children_by_parent.get(parent_id, []))
+        ]
+        while stack:
+            child, parent_path = stack.pop()
             child_rel_path = (
-                f"{base_path}/{child.file_name}" if base_path else child.file_name
+                f"{parent_path}/{child.file_name}" if parent_path else child.file_name
             )
             results.append((child, child_rel_path))
-
-            if child.is_folder == "Y":
-                sub_results = await self.list_recursive(
-                    user_id, child.id, child_rel_path
-                )
-                results.extend(sub_results)
+            stack.extend(
+                (grandchild, child_rel_path)
+                for grandchild in reversed(children_by_parent.get(child.id, []))
+            )
 
         return results
 
@@ -114,6 +185,7 @@ class VirtualFileSystem:
             is_active="Y",
         )
         self.db.add(new_file)
+        await self._add_usage(user_id, size)
         await self.db.commit()
         await self.db.refresh(new_file)
         return new_file
@@ -127,31 +199,55 @@ class VirtualFileSystem:
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_nodes_by_ids(
+        self, user_id: int, node_ids: Collection[int]
+    ) -> dict[int, UserFileDO]:
+        """Fetch active nodes by id in one query, keyed by id.
+
+        Ids that are missing or inactive are left out of the result.
+        """
+        if not node_ids:
+            return {}
+        stmt = select(UserFileDO).where(
+            UserFileDO.user_id == user_id,
+            UserFileDO.id.in_(node_ids),
+            UserFileDO.is_active == "Y",
+        )
+        result = await self.db.execute(stmt)
+        return {node.id: node for node in result.scalars()}
+
     async def delete_node(self, user_id: int, node_id: int) -> bool:
         """Soft delete a file/folder."""
         node = await self.get_node_by_id(user_id, node_id)
         if not node:
             return False
+        await self.delete_nodes(user_id, [node])
+        return True
 
+    async def delete_nodes(self, user_id: int, nodes: list[UserFileDO]) -> None:
+        """Soft delete already loaded files/folders in a single transaction."""
         # TODO: Handle recursive soft delete for folders?
-        # For now, just mark the node.
-
-        node.is_active = "N"
-
-        # Create recycle bin entry
+        # For now, just mark the nodes.
         now_ms = int(time.time() * 1000)
-        recycle = RecycleFileDO(
-            user_id=user_id,
-            file_id=node.id,
-            file_name=node.file_name,
-            size=node.size,
-            is_folder=node.is_folder,
-            delete_time=now_ms,
-        )
-        self.db.add(recycle)
+        freed = 0
+        for node in nodes:
+            node.is_active = "N"
+            if node.is_folder == "N":
+                freed += node.size
+
+            # Create recycle bin entry
+            recycle = RecycleFileDO(
+                user_id=user_id,
+                file_id=node.id,
+                file_name=node.file_name,
+                size=node.size,
+                is_folder=node.is_folder,
+                delete_time=now_ms,
+            )
+            self.db.add(recycle)
 
+        await self._add_usage(user_id, -freed)
         await self.db.commit()
-        return True
 
     async def resolve_path(self, user_id: int, path: str) -> UserFileDO | None:
         """Resolve a posix-style path to a file node."""
@@ -182,31 +278,58 @@ class VirtualFileSystem:
 
         return current_node
 
-    async def get_full_path(self, user_id: int, node_id: int) -> str:
-        """Resolve the full path of a node by walking up the directory tree."""
-        if node_id == 0:
-            return ""
+    async def get_ancestor_chain(self, user_id: int, node_id: int) -> list[UserFileDO]:
+        """Return a node and its ancestors, ordered from the root down.
 
-        path_parts: list[str] = []
-        current_id = node_id
+        The chain is read with a single recursive query rather than one
+        query per level. It stops early at a missing or inactive node.
+        """
+        if node_id == 0:
+            return []
 
-        # Loop until root (0) or not found.
-        # Check for circular refs? Simple depth limit could work if needed.
-        depth = 0
-        max_depth = 50
+        ancestors = (
+            select(
+                UserFileDO.id,
+                UserFileDO.directory_id,
+                literal(1).label("depth"),
+            )
+            .where(
+                UserFileDO.user_id == user_id,
+                UserFileDO.id == node_id,
+                UserFileDO.is_active == "Y",
+            )
+            .cte("ancestors", recursive=True)
+        )
+        parent = aliased(UserFileDO)
+        ancestors = ancestors.union_all(
+            select(parent.id, parent.directory_id, ancestors.c.depth + 1).where(
+                parent.user_id == user_id,
+                parent.id == ancestors.c.directory_id,
+                parent.is_active == "Y",
+                ancestors.c.depth < _MAX_PATH_DEPTH,
+            )
+        )
+        stmt = (
+            select(UserFileDO)
+            .join(ancestors, UserFileDO.id == ancestors.c.id)
+            .order_by(ancestors.c.depth.desc())
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
 
-        while current_id != 0 and depth < max_depth:
-            node = await self.get_node_by_id(user_id, current_id)
-            if not node:
-                # If node is missing mid-tree, we might have a broken tree or root
-                # Just return what we have? or broken?
-                break
+    async def get_full_path(self, user_id: int, node_id: int) -> str:
+        """Resolve the full path of a node by walking up the directory tree."""
+        chain = await self.get_ancestor_chain(user_id, node_id)
+        return "/".join(node.file_name for node in chain)
 
-            path_parts.insert(0, node.file_name)
-            current_id = node.directory_id
-            depth += 1
+    async def get_node_path(self, user_id: int, node: UserFileDO) -> str:
+        """Resolve the full path of a node that has already been loaded.
 
-        return "/".join(path_parts)
+        This only walks the node's ancestors, avoiding a query for the node
+        itself.
+        """
+        parent_path = await self.get_full_path(user_id, node.directory_id)
+        return f"{parent_path}/{node.file_name}" if parent_path else node.file_name
 
     async def ensure_directory_path(self, user_id: int, path: str) -> int:
         """Ensure a directory path exists, creating if necessary. Returns the final directory ID."""
@@ -362,6 +485,8 @@ class VirtualFileSystem:
             is_active="Y",
         )
         self.db.add(new_node)
+        if new_node.is_folder == "N":
+            await self._add_usage(user_id, new_node.size)
         await self.db.commit()
         await self.db.refresh(new_node)
 
@@ -385,29 +510,75 @@ class VirtualFileSystem:
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
+    async def list_recycle_page(
+        self,
+        user_id: int,
+        order_by: QueryableAttribute[Any],
+        descending: bool,
+        offset: int,
+        limit: int,
+    ) -> tuple[list[RecycleFileDO], int]:
+        """List one page of the recycle bin.
+
+        Returns the page of entries and the total number of entries. Ties are
+        ordered by id so that pages do not overlap.
+        """
+        total = await self.db.scalar(
+            select(func.count())
+            .select_from(RecycleFileDO)
+            .where(RecycleFileDO.user_id == user_id)
+        )
+        stmt = (
+            select(RecycleFileDO)
+            .where(RecycleFileDO.user_id == user_id)
+            .order_by(order_by.desc() if descending else order_by, RecycleFileDO.id)
+            .offset(max(offset, 0))
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all()), total or 0
+
     async def restore_node(self, user_id: int, recycle_id: int) -> bool:
         """Restore a file from recycle bin."""
+        return await self.restore_nodes(user_id, [recycle_id]) > 0
+
+    async def restore_nodes(self, user_id: int, recycle_ids: list[int]) -> int:
+        """Restore files from recycle bin in a single transaction.
+
+        Returns the number of recycle bin entries restored.
+        """
         stmt = select(RecycleFileDO).where(
-            RecycleFileDO.user_id == user_id, RecycleFileDO.id == recycle_id
+            RecycleFileDO.user_id == user_id, RecycleFileDO.id.in_(recycle_ids)
         )
         result = await self.db.execute(stmt)
-        if (recycle_entry := result.scalar_one_or_none()) is None:
-            return False
+        recycle_entries = result.scalars().all()
+        if not recycle_entries:
+            return 0
 
-        # Get original node
-        node_stmt = select(UserFileDO).where(
-            UserFileDO.user_id == user_id, UserFileDO.id == recycle_entry.file_id
+        # Get original nodes
+        file_ids = {entry.file_id for entry in recycle_entries}
+        node_stmt = select(UserFileDO.id, UserFileDO.size).where(
+            UserFileDO.user_id == user_id,
+            UserFileDO.id.in_(file_ids),
+            UserFileDO.is_active != "Y",
+            UserFileDO.is_folder == "N",
         )
         node_result = await self.db.execute(node_stmt)
-        if node := node_result.scalar_one_or_none():
-            node.is_active = "Y"
-            # TODO: Lets add common functions for getting the current now_ms so we can
-            # fake out update time in tests etc.
-            node.update_time = int(time.time() * 1000)
-
-        await self.db.delete(recycle_entry)
+        await self._add_usage(user_id, sum(size for _, size in node_result.all()))
+        # TODO: Lets add common functions for getting the current now_ms so we can
+        # fake out update time in tests etc.
+        await self.db.execute(
+            update(UserFileDO)
+            .where(UserFileDO.user_id == user_id, UserFileDO.id.in_(file_ids))
+            .values(is_active="Y", update_time=int(time.time() * 1000))
+        )
+        await self.db.execute(
+            delete(RecycleFileDO).where(
+                RecycleFileDO.id.in_([entry.id for entry in recycle_entries])
+            )
+        )
         await self.db.commit()
-        return True
+        return len(recycle_entries)
 
     async def purge_recycle(
         self, user_id: int, recycle_ids: list[int] | None = None
@@ -423,12 +594,24 @@ class VirtualFileSystem:
         await self.db.commit()
 
     async def search_files(self, user_id: int, keyword: str) -> list[UserFileDO]:
-        """Search for active files/folders by keyword (case-insensitive)."""
+        """Search for active files/folders by keyword (case-insensitive).
+
+        Keywords of at least three characters are matched with the trigram
+        full text index rather than scanning every file name with LIKE.
+        Either way the keyword is a literal substring: LIKE wildcards in
+        short keywords are escaped so results do not depend on its length.
+        """
         stmt = select(UserFileDO).where(
             UserFileDO.user_id == user_id,
             UserFileDO.is_active == "Y",
-            UserFileDO.file_name.ilike(f"%{keyword}%"),
         )
+        if len(keyword) >= _FTS_MIN_KEYWORD_LENGTH:
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            stmt = stmt.join(
+                _FILE_NAME_FTS, _FILE_NAME_FTS.c.rowid == UserFileDO.id
+            ).where(_FILE_NAME_FTS.c.file_name.op("MATCH")(phrase))
+        else:
+            stmt = stmt.where(UserFileDO.file_name.icontains(keyword, autoescape=True))
         result = await self.db.execute(stmt)
         return list(result.scalars().all())
 
@@ -453,15 +636,53 @@ class VirtualFileSystem:
         return result.scalar_one_or_none() is not None
 
     async def get_total_usage(self, user_id: int) -> int:
-        """Calculate total storage usage for a user in bytes."""
-        stmt = select(func.sum(UserFileDO.size)).where(
+        """Return total storage usage for a user in bytes.
+
+        The total is kept in `CapacityDO` and adjusted by every write that
+        changes the active files. It is computed from the files the first
+        time it is needed.
+        """
+        stmt = select(CapacityDO.used_capacity).where(CapacityDO.user_id == user_id)
+        if (used := (await self.db.execute(stmt)).scalar_one_or_none()) is not None:
+            return used
+
+        # Seed in a single statement so no concurrent write is missed
+        usage = select(
+            literal(user_id),
+            func.coalesce(func.sum(UserFileDO.size), 0),
+            literal(0),
+        ).where(
             UserFileDO.user_id == user_id,
             UserFileDO.is_active == "Y",
             UserFileDO.is_folder == "N",
         )
-        result = await self.db.execute(stmt)
-        total = result.scalar()
-        return total or 0
+        await self.db.execute(
+            sqlite_insert(CapacityDO)
+            .from_select(
+                [
+                    CapacityDO.user_id,
+                    CapacityDO.used_capacity,
+                    CapacityDO.total_capacity,
+                ],
+                usage,
+            )
+            .on_conflict_do_nothing()
+        )
+        await self.db.commit()
+        return (await self.db.execute(stmt)).scalar_one()
+
+    async def _add_usage(self, user_id: int, delta: int) -> None:
+        """Adjust the stored usage total, if it has been computed yet.
+
+        This must be called in the same transaction as the file change.
+        """
+        if not delta:
+            return
+        await self.db.execute(
+            update(CapacityDO)
+            .where(CapacityDO.user_id == user_id)
+            .values(used_capacity=CapacityDO.used_capacity + delta)
+        )
 
     async def is_empty(self, user_id: int) -> bool:
         """Check if user has any active files."""
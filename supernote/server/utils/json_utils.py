@@ -0,0 +1,113 @@
+"""Helpers for encoding and decoding JSON with orjson.
+
+orjson encodes straight to UTF-8 bytes in native code, which avoids the
+stdlib `json.dumps` string round trip used by `web.json_response`.
+
+Response models are converted with their own `to_dict()` rather than
+orjson's native dataclass support so that mashumaro field aliases and
+`omit_none` settings keep producing the same wire format.
+
+Responses with long lists can instead be streamed in batches with
+`json_list_response`, so the whole list is never held as dicts or bytes.
+
+Request bodies are decoded the same way with `orjson.loads` rather than
+`request.json()`, with a size guard since the application accepts large
+uploads and would otherwise buffer a body of any size.
+"""
+
+from typing import Any, Callable, Sequence, TypeVar
+
+import orjson
+from aiohttp import web
+from mashumaro.mixins.dict import DataClassDictMixin
+
+from supernote.server.constants import (
+    JSON_STREAM_BATCH_SIZE,
+    JSON_STREAM_THRESHOLD,
+    MAX_JSON_BODY_SIZE,
+)
+
+__all__ = [
+    "dumps",
+    "json_list_response",
+    "json_response",
+    "read_json",
+]
+
+JSON_CONTENT_TYPE = "application/json"
+
+STREAMED_RESPONSE_KEY = "streamed_response"
+"""Request key set once `json_list_response` has started sending a response."""
+
+_T = TypeVar("_T")
+
+
+def dumps(data: DataClassDictMixin | dict[str, Any] | list[Any]) -> bytes:
+    """Encode a response model or plain JSON data as UTF-8 bytes."""
+    if isinstance(data, DataClassDictMixin):
+        data = data.to_dict()
+    return orjson.dumps(data)
+
+
+def json_response(
+    data: DataClassDictMixin | dict[str, Any] | list[Any] | bytes, status: int = 200
+) -> web.Response:
+    """Create a JSON response, encoding the body with orjson.
+
+    Bytes are sent as-is, so constant responses can be encoded once with
+    `dumps` at import time.
+    """
+    return web.Response(
+        body=data if isinstance(data, bytes) else dumps(data),
+        status=status,
+        content_type=JSON_CONTENT_TYPE,
+    )
+
+
+async def json_list_response(
+    request: web.Request,
+    data: dict[str, Any],
+    key: str,
+    items: Sequence[_T],
+    to_dict: Callable[[_T], Any],
+) -> web.StreamResponse:
+    """Create a JSON response of `data` with the encoded `items` under `key`.
+
+    Lists longer than `JSON_STREAM_THRESHOLD` are streamed, converting and
+    encoding `JSON_STREAM_BATCH_SIZE` items at a time. The request is marked
+    with `STREAMED_RESPONSE_KEY` first, since an error raised after that point
+    can no longer be sent as a separate response.
+    """
+    if len(items) <= JSON_STREAM_THRESHOLD:
+        return json_response({**data, key: [to_dict(item) for item in items]})
+
+    # A quoted key followed by a colon cannot occur inside an encoded string,
+    # so the empty list marks where to splice in the items.
+    marker = dumps({key: []})[1:-1]
+    head, _, tail = dumps({**data, key: []}).partition(marker)
+
+    response = web.StreamResponse()
+    response.content_type = JSON_CONTENT_TYPE
+    request[STREAMED_RESPONSE_KEY] = True
+    await response.prepare(request)
+    await response.write(head + marker[:-1])
+    for start in range(0, len(items), JSON_STREAM_BATCH_SIZE):
+        batch = items[start : start + JSON_STREAM_BATCH_SIZE]
+        body = dumps([to_dict(item) for item in batch])[1:-1]
+        await response.write(body if start == 0 else b"," + body)
+    await response.write(b"]" + tail)
+    await response.write_eof()
+    return response
+
+
+async def read_json(request: web.Request) -> Any:
+    """Read and decode a JSON request body with orjson.
+
+    Raises `web.HTTPRequestEntityTooLarge` if the declared body size exceeds
+    `MAX_JSON_BODY_SIZE`.
+    """
+    if request.content_length and request.content_length > MAX_JSON_BODY_SIZE:
+        raise web.HTTPRequestEntityTooLarge(
+            max_size=MAX_JSON_BODY_SIZE, actual_size=request.content_length
+        )
+    return orjson.loads(await request.read())
@@ -1,6 +1,56 @@
+import functools
 import os
+import re
+import urllib.parse
 import uuid
 
+from aiohttp import web
+
+# Characters that `urllib.parse.quote` leaves unchanged with its default `safe`.
+_UNQUOTED_RE = re.compile(r"[A-Za-z0-9_.~/-]*")
+
+
+def quote_path(value: str) -> str:
+    """Percent-encode a value for use in a URL, like `urllib.parse.quote`.
+
+    Generated inner names almost never need encoding, so those are returned
+    as-is after a single regex match instead of a per-character quote. Other
+    names are usually quoted again by follow up requests for the same file,
+    so their encoding is cached.
+    """
+    if _UNQUOTED_RE.fullmatch(value):
+        return value
+    return _quote_cached(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def _quote_cached(value: str) -> str:
+    return urllib.parse.quote(value)
+
+
+def file_suffixes(name: str) -> str:
+    """Return all suffixes of a file name, like `"".join(PurePath(name).suffixes)`.
+
+    Upload requests only need the extension, so this works on the string
+    directly instead of parsing a full path object.
+    """
+    parts = [part for part in name.split("/") if part and part != "."]
+    base = parts[-1] if parts else ""
+    if base.endswith("."):
+        return ""
+    stripped = base.lstrip(".")
+    dot = stripped.find(".")
+    return stripped[dot:] if dot != -1 else ""
+
+
+def absolute_url(request: web.Request, path: str) -> str:
+    """Return an absolute URL for `path` on the host the request was sent to.
+
+    Devices must be able to reach the URL at the address they already use,
+    so the origin comes from the request rather than the configured base URL.
+    """
+    return f"{request.scheme}://{request.host}{path}"
+
 
 def get_page_png_path(file_id: int, page_id: str) -> str:
     """Get the blob storage path for a page PNG."""
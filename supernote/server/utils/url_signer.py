@@ -38,13 +38,19 @@ Usage example:
 """
 
 import datetime
+import hashlib
+import hmac
 import logging
 import time
 import urllib.parse
 import uuid
+from collections import OrderedDict
 from typing import Any
 
 import jwt
+import orjson
+from jwt.algorithms import HMACAlgorithm
+from jwt.api_jws import PyJWS
 
 from supernote.server.exceptions import InvalidSignature, SignerError
 from supernote.server.services.coordination import CoordinationService
@@ -53,6 +59,31 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_EXPIRATION = datetime.timedelta(minutes=15)
 
+VERIFY_CACHE_SIZE = 1024
+"""Maximum number of decoded signature tokens remembered by `UrlSigner`."""
+
+
+class _KeyedHS256(HMACAlgorithm):
+    """HS256 bound to a single secret with the HMAC key schedule precomputed.
+
+    PyJWT validates and expands the key on every call. Here that is done once
+    and each signature starts from a copy of the keyed HMAC state. Tokens are
+    standard HS256 and verify with `jwt.decode`.
+    """
+
+    def __init__(self, secret_key: str) -> None:
+        super().__init__(HMACAlgorithm.SHA256)
+        self._key = super().prepare_key(secret_key)
+        self._hmac = hmac.new(self._key, digestmod=hashlib.sha256)
+
+    def prepare_key(self, key: str | bytes) -> bytes:
+        return self._key
+
+    def sign(self, msg: bytes, key: bytes) -> bytes:
+        mac = self._hmac.copy()
+        mac.update(msg)
+        return mac.digest()
+
 
 class UrlSigner:
     """Sign and verify URLs using HMAC-SHA256 (via JWT)."""
@@ -66,6 +97,11 @@ class UrlSigner:
         self.secret_key = secret_key
         self.algorithm = "HS256"
         self._coordination_service = coordination_service
+        self._jws = PyJWS(algorithms=[])
+        self._jws.register_algorithm(self.algorithm, _KeyedHS256(secret_key))
+        # Decoded payloads by signature token. Chunked uploads present the
+        # same token once per part, each with its own part query params.
+        self._verified: OrderedDict[str, dict[str, Any]] = OrderedDict()
 
     async def sign(
         self,
@@ -91,8 +127,8 @@ class UrlSigner:
         if expiration < datetime.timedelta(seconds=0):
             raise ValueError("Expiration must be non-negative")
 
-        now = int(time.time())
         now_ms = int(time.time() * 1000)
+        now = now_ms // 1000
 
         exp = now + int(expiration.total_seconds())
         nonce = uuid.uuid4().hex
@@ -120,8 +156,10 @@ class UrlSigner:
             payload["user"] = user
 
         try:
-            token = jwt.encode(payload, self.secret_key, algorithm=self.algorithm)
-        except jwt.PyJWTError as err:
+            token = self._jws.encode(
+                orjson.dumps(payload), self.secret_key, algorithm=self.algorithm
+            )
+        except (jwt.PyJWTError, orjson.JSONEncodeError) as err:
             raise SignerError(f"Failed to encode signature: {err}") from err
 
         # Check if query params exist
@@ -149,25 +187,34 @@ class UrlSigner:
             raise InvalidSignature(f"No signature found in URL: {signed_url}")
 
         signature = signatures[0]
-        try:
-            payload = jwt.decode(
-                signature, self.secret_key, algorithms=[self.algorithm]
-            )
-        except jwt.ExpiredSignatureError as err:
-            raise InvalidSignature(f"Signature expired: {signed_url}") from err
-        except jwt.InvalidTokenError as err:
-            raise InvalidSignature(f"Invalid signature: {signed_url}") from err
-        except jwt.PyJWTError as err:
-            raise InvalidSignature(f"Error decoding signature: {err}") from err
-
-        if not isinstance(payload, dict):
-            raise InvalidSignature(f"Invalid payload type: {type(payload)}")
+        payload = self._verified.get(signature)
+        if payload is None or payload["exp"] <= time.time():
+            payload = self._decode(signature, signed_url)
+            if "exp" in payload:
+                self._verified[signature] = payload
+                if len(self._verified) > VERIFY_CACHE_SIZE:
+                    self._verified.popitem(last=False)
+        else:
+            self._verified.move_to_end(signature)
 
         # We reconstruct the URL *without* the signature param to compare
         # against what was signed (payload['path']).
         if not (expected_path := payload.get("path")):
             raise InvalidSignature(f"No path found in payload: {payload}")
 
+        if not signed_url.startswith(expected_path):
+            raise InvalidSignature(
+                f"Signed path mismatch: signed path '{expected_path}' is not prefix of request '{signed_url}'"
+            )
+
+        # Verify timestamp if present in payload
+        if "timestamp" in payload:
+            ts_param = query_params.get("timestamp")
+            if not ts_param:
+                raise InvalidSignature("Timestamp missing from URL")
+            if str(payload["timestamp"]) != ts_param[0]:
+                raise InvalidSignature("Timestamp mismatch")
+
         # CONSUME NONCE (Single-Use Token)
         # Check and Remove (atomic pop if possible)
         nonce = payload.get("nonce")
@@ -188,19 +235,23 @@ class UrlSigner:
                 if not val:
                     raise InvalidSignature(f"Token invalid or expired (nonce: {nonce})")
 
-        if not signed_url.startswith(expected_path):
-            raise InvalidSignature(
-                f"Signed path mismatch: signed path '{expected_path}' is not prefix of request '{signed_url}'"
-            )
+        return dict(payload)
 
-        # Verify timestamp if present in payload
-        if "timestamp" in payload:
-            ts_param = query_params.get("timestamp")
-            if not ts_param:
-                raise InvalidSignature("Timestamp missing from URL")
-            if str(payload["timestamp"]) != ts_param[0]:
-                raise InvalidSignature("Timestamp mismatch")
+    def _decode(self, signature: str, signed_url: str) -> dict[str, Any]:
+        """Decode and validate a signature token."""
+        try:
+            payload = jwt.decode(
+                signature, self.secret_key, algorithms=[self.algorithm]
+            )
+        except jwt.ExpiredSignatureError as err:
+            raise InvalidSignature(f"Signature expired: {signed_url}") from err
+        except jwt.InvalidTokenError as err:
+            raise InvalidSignature(f"Invalid signature: {signed_url}") from err
+        except jwt.PyJWTError as err:
+            raise InvalidSignature(f"Error decoding signature: {err}") from err
 
+        if not isinstance(payload, dict):
+            raise InvalidSignature(f"Invalid payload type: {type(payload)}")
         return payload
 
     @staticmethod
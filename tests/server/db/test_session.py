@@ -4,6 +4,8 @@ These tests override the global sessionmanager for tests (if used by import
 side-effects in other tests). Best practice is to test a fresh instance here.
 """
 
+from pathlib import Path
+
 from sqlalchemy import text
 
 from supernote.server.db.session import DatabaseSessionManager
@@ -18,3 +20,16 @@ async def test_session_manager_session() -> None:
         assert result.scalar() == 1
 
     await manager.close()
+
+
+async def test_session_manager_sqlite_pragmas(tmp_path: Path) -> None:
+    """Test that SQLite connections are configured for small commits."""
+    manager = DatabaseSessionManager(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+    async with manager.session() as session:
+        result = await session.execute(text("PRAGMA journal_mode"))
+        assert result.scalar() == "wal"
+        result = await session.execute(text("PRAGMA synchronous"))
+        assert result.scalar() == 1  # NORMAL
+
+    await manager.close()
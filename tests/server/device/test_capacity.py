@@ -12,7 +12,7 @@ async def test_capacity_query_device(device_client: DeviceClient) -> None:
 
     # 2. Upload a file
     content = b"y" * 2048  # 2KB
-    await device_client.upload_content(
+    upload = await device_client.upload_content(
         "/capacity_test_device.txt", content, equipment_no="test"
     )
 
@@ -21,3 +21,9 @@ async def test_capacity_query_device(device_client: DeviceClient) -> None:
     assert cap_after.used == initial_used + 2048
     assert cap_after.allocation_vo
     assert cap_after.allocation_vo.allocated == cap.allocation_vo.allocated
+
+    # 4. Delete the file
+    assert upload.id
+    await device_client.delete(int(upload.id), equipment_no="test")
+    cap_deleted = await device_client.get_capacity()
+    assert cap_deleted.used == initial_used
@@ -1,4 +1,7 @@
+import pytest
+
 from supernote.client.device import DeviceClient
+from supernote.server.utils import json_utils
 
 
 async def test_device_list_folder(device_client: DeviceClient) -> None:
@@ -22,3 +25,37 @@ async def test_device_list_folder(device_client: DeviceClient) -> None:
     res_sub = await device_client.list_folder(path="/FolderDevice", equipment_no="test")
     assert len(res_sub.entries) == 1
     assert res_sub.entries[0].name == "FileDevice.txt"
+
+
+async def test_device_list_folder_entries_match_query(
+    device_client: DeviceClient,
+) -> None:
+    """Test that listed entries match the entries returned by a query."""
+    await device_client.create_folder(path="/FolderMatch", equipment_no="test")
+    await device_client.upload_content("/FolderMatch/File.txt", b"content")
+
+    res = await device_client.list_folder(path="/FolderMatch", equipment_no="test")
+    assert res.equipment_no == "test"
+    assert len(res.entries) == 1
+
+    query = await device_client.query_by_path("/FolderMatch/File.txt", "test")
+    assert query.entries_vo
+    assert res.entries[0].to_dict() == query.entries_vo.to_dict()
+
+
+async def test_device_list_folder_streamed(
+    device_client: DeviceClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that large listings are streamed with the same wire format."""
+    await device_client.create_folder(path="/FolderStream", equipment_no="test")
+    for i in range(5):
+        await device_client.upload_content(f"/FolderStream/File{i}.txt", b"content")
+    expected = await device_client.list_folder(
+        path="/FolderStream", equipment_no="test"
+    )
+
+    monkeypatch.setattr(json_utils, "JSON_STREAM_THRESHOLD", 2)
+    monkeypatch.setattr(json_utils, "JSON_STREAM_BATCH_SIZE", 2)
+    res = await device_client.list_folder(path="/FolderStream", equipment_no="test")
+    assert len(res.entries) == 5
+    assert res.to_dict() == expected.to_dict()
@@ -89,6 +89,26 @@ async def test_move_file(device_client: DeviceClient) -> None:
     assert [e.name for e in data.entries] == []
 
 
+async def test_move_file_into_nested_folder(device_client: DeviceClient) -> None:
+    await device_client.create_folder(path="/Outer/Inner", equipment_no="SN123456")
+    upload_result = await device_client.upload_content(
+        "/My.note", b"contents", equipment_no="SN123456"
+    )
+    assert upload_result.id
+
+    # Moving into an existing folder keeps the name, and the returned path
+    # is normalized.
+    move_result = await device_client.move(
+        id=int(upload_result.id),
+        to_path="/Outer//Inner/",
+        equipment_no="SN123456",
+        autorename=False,
+    )
+    assert move_result.entries_vo
+    assert move_result.entries_vo.path_display == "Outer/Inner/My.note"
+    assert move_result.entries_vo.parent_path == "Outer/Inner"
+
+
 async def test_copy_file_autorename(device_client: DeviceClient) -> None:
     # Create Folder
     await device_client.create_folder(path="/CopySource", equipment_no="SN123456")
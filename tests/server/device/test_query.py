@@ -59,3 +59,23 @@ async def test_query_by_path_not_found(device_client: DeviceClient) -> None:
     )
     assert data.entries_vo is None
     assert data.equipment_no == "SN123"
+
+
+async def test_query_after_changes(device_client: DeviceClient) -> None:
+    """Test that repeated queries reflect changes made in between."""
+    missing = await device_client.query_by_path(path="Note/new.note", equipment_no="SN")
+    assert not missing.entries_vo
+
+    upload = await device_client.upload_content("Note/new.note", b"v1")
+    found = await device_client.query_by_path(path="Note/new.note", equipment_no="SN")
+    assert found.entries_vo
+    assert found.entries_vo.id == upload.id
+
+    by_id = await device_client.query_by_id(file_id=int(upload.id), equipment_no="SN")
+    assert by_id.entries_vo
+
+    await device_client.delete(int(upload.id), equipment_no="SN")
+    by_id = await device_client.query_by_id(file_id=int(upload.id), equipment_no="SN")
+    assert not by_id.entries_vo
+    missing = await device_client.query_by_path(path="Note/new.note", equipment_no="SN")
+    assert not missing.entries_vo
@@ -53,6 +53,24 @@ async def test_sync_start_syn_type(
     assert data["synType"] is True  # Non-empty storage
 
 
+async def test_sync_start_empty_after_delete(
+    device_client: DeviceClient,
+    session_manager: DatabaseSessionManager,
+) -> None:
+    async with session_manager.session() as session:
+        await session.execute(delete(UserFileDO))
+        await session.commit()
+
+    await device_client.upload_content("test.note", b"content", equipment_no="test")
+    assert (await device_client.sync_start("SN123456")).syn_type is True
+    # Repeated checks are answered without changing the result.
+    assert (await device_client.sync_start("SN123456")).syn_type is True
+
+    # Deleting the only file makes the storage empty again.
+    await device_client.delete_by_path("/test.note", equipment_no="SN123456")
+    assert (await device_client.sync_start("SN123456")).syn_type is False
+
+
 async def test_sync_lock(client: TestClient, auth_headers: dict[str, str]) -> None:
     # 1. Start sync from SN123
     resp = await client.post(
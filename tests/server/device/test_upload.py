@@ -1,8 +1,14 @@
+import asyncio
+import hashlib
 import os
 from urllib.parse import urlparse
 
+from aiohttp.test_utils import TestClient
+
 from supernote.client.client import Client
 from supernote.client.device import DeviceClient
+from supernote.server.constants import USER_DATA_BUCKET
+from supernote.server.services.file import FileService
 
 
 async def test_upload_file(
@@ -100,3 +106,38 @@ async def test_upload_apply_response_fields(device_client: DeviceClient) -> None
     uuid_part, tail_part = parts
     assert len(uuid_part) == 36  # Standard UUID length
     assert tail_part == "EST"
+
+
+async def test_concurrent_upload_finish_same_directory(
+    client: TestClient,
+    device_client: DeviceClient,
+    create_test_user: None,
+    test_users: list[str],
+) -> None:
+    """Test that concurrent uploads into a new directory create it once."""
+    assert client.app
+    file_service: FileService = client.app["file_service"]
+    contents = [f"content {i}".encode() for i in range(5)]
+    for i, content in enumerate(contents):
+        await file_service.blob_storage.put(USER_DATA_BUCKET, f"inner_{i}", content)
+
+    await asyncio.gather(
+        *[
+            file_service.finish_upload(
+                test_users[0],
+                f"file_{i}.txt",
+                "/Concurrent/Nested",
+                hashlib.md5(content).hexdigest(),
+                inner_name=f"inner_{i}",
+            )
+            for i, content in enumerate(contents)
+        ]
+    )
+
+    root = await device_client.list_folder(path="/Concurrent", equipment_no="SN_TEST")
+    assert [e.name for e in root.entries] == ["Nested"]
+
+    nested = await device_client.list_folder(
+        path="/Concurrent/Nested", equipment_no="SN_TEST"
+    )
+    assert sorted(e.name for e in nested.entries) == [f"file_{i}.txt" for i in range(5)]
@@ -2,8 +2,19 @@ import pytest
 
 from supernote.client.client import Client
 from supernote.client.exceptions import BadRequestException
+from supernote.models.base import BooleanEnum
 from supernote.models.extended import WebSummaryListRequestDTO, WebSummaryListVO
+from supernote.models.file_common import EntriesVO, FileSortOrder, FileSortSequence
+from supernote.models.file_web import RecycleFileVO, UserFileVO
 from supernote.models.summary import AddSummaryVO
+from supernote.server.routes.file_web import (
+    _flatten_path,
+    _sort_and_page,
+    _to_recycle_file_dict,
+    _to_search_entry_dict,
+    _to_user_file_dict,
+)
+from supernote.server.services.file import FileEntity, RecycleEntity
 
 
 @pytest.fixture
@@ -65,3 +76,112 @@ async def test_web_summary_list_invalid(
             web_summary_list_url,
             json={"fileId": "invalid"},
         )
+
+
+@pytest.mark.parametrize("order", list(FileSortOrder))
+@pytest.mark.parametrize("sequence", list(FileSortSequence))
+@pytest.mark.parametrize("page_no", [1, 2, 7])
+def test_sort_and_page(
+    order: FileSortOrder, sequence: FileSortSequence, page_no: int
+) -> None:
+    """Test that partial selection of a page matches a full stable sort."""
+    items = [
+        FileEntity(
+            id=i,
+            parent_id=0,
+            name=f"file{i % 7}",
+            is_folder=False,
+            size=i % 5,
+            md5=None,
+            create_time=0,
+            update_time=i % 3,
+            full_path=f"file{i}",
+        )
+        for i in range(60)
+    ]
+    key = {
+        FileSortOrder.FILENAME: lambda x: x.name,
+        FileSortOrder.SIZE: lambda x: x.size,
+        FileSortOrder.TIME: lambda x: x.sort_time,
+    }[order]
+    expected = sorted(items, key=key, reverse=sequence == FileSortSequence.DESC)
+
+    page, total = _sort_and_page(list(items), sequence, order, page_no, 5)
+    assert total == 60
+    assert [item.id for item in page] == [
+        item.id for item in expected[(page_no - 1) * 5 : page_no * 5]
+    ]
+
+
+@pytest.mark.parametrize("is_folder", [True, False])
+@pytest.mark.parametrize("md5", [None, "abc"])
+def test_wire_format_matches_models(is_folder: bool, md5: str | None) -> None:
+    """Test that directly built entries match the response models."""
+    entity = FileEntity(
+        id=12,
+        parent_id=3,
+        name="file.note",
+        is_folder=is_folder,
+        size=100,
+        md5=md5,
+        create_time=1000,
+        update_time=2000,
+        full_path="NOTE/Note/Sub/file.note",
+        storage_key="inner-name",
+    )
+    assert (
+        _to_user_file_dict(entity)
+        == UserFileVO(
+            id="12",
+            directory_id="3",
+            file_name="file.note",
+            size=100,
+            md5=md5,
+            inner_name="inner-name",
+            is_folder=BooleanEnum.of(is_folder),
+            create_time=1000,
+            update_time=2000,
+        ).to_dict()
+    )
+    assert (
+        _to_search_entry_dict(entity)
+        == EntriesVO(
+            id="12",
+            name="file.note",
+            tag="folder" if is_folder else "file",
+            path_display="Note/Sub/file.note",
+            parent_path="Note/Sub",
+            content_hash=md5 or "",
+            size=100,
+            last_update_time=2000,
+        ).to_dict()
+    )
+
+    item = RecycleEntity(
+        id=5, name="old.note", is_folder=is_folder, size=10, delete_time=3000
+    )
+    assert (
+        _to_recycle_file_dict(item)
+        == RecycleFileVO(
+            file_id="5",
+            is_folder="Y" if is_folder else "N",
+            file_name="old.note",
+            update_time="3000",
+            size=10,
+        ).to_dict()
+    )
+
+
+@pytest.mark.parametrize(
+    ("full_path", "expected"),
+    [
+        ("file.note", ("file.note", "")),
+        ("Note/file.note", ("Note/file.note", "Note")),
+        ("NOTE/Note/Sub/file.note", ("Note/Sub/file.note", "Note/Sub")),
+        ("DOCUMENT/Document", ("Document", "")),
+        ("NOTE", ("NOTE", "")),
+    ],
+)
+def test_flatten_path(full_path: str, expected: tuple[str, str]) -> None:
+    """Test flattening category containers out of search result paths."""
+    assert _flatten_path(full_path) == expected
@@ -1,10 +1,13 @@
 import urllib.parse
 
 import pytest
+from aiohttp.test_utils import TestClient
 
 from supernote.client.client import Client
 from supernote.client.device import DeviceClient
 from supernote.client.exceptions import ApiException
+from supernote.server.constants import USER_DATA_BUCKET
+from supernote.server.services.file import FileService
 
 
 async def test_oss_upload_simple(
@@ -110,3 +113,119 @@ async def test_oss_invalid_range_header(
     with pytest.raises(ApiException) as excinfo:
         await authenticated_client.get(valid_url, headers={"Range": "garbage"})
     assert "400" in str(excinfo.value)
+
+
+async def test_oss_download_headers(
+    authenticated_client: Client,
+    device_client: DeviceClient,
+) -> None:
+    path = "/oss_headers.txt"
+    content = b"0123456789"
+    await device_client.upload_content(path=path, content=content)
+
+    query_res = await device_client.query_by_path(path, "WEB")
+    assert query_res.entries_vo
+    file_id = int(query_res.entries_vo.id)
+
+    async def download_url() -> str:
+        # Signed URLs are single use
+        info = await device_client.download_v3(file_id, "WEB")
+        assert info
+        return info.url
+
+    resp = await authenticated_client.get(await download_url())
+    assert resp.status == 200
+    assert resp.headers["Content-Length"] == str(len(content))
+    assert resp.headers["Accept-Ranges"] == "bytes"
+    assert "Transfer-Encoding" not in resp.headers
+    assert await resp.read() == content
+
+    resp = await authenticated_client.get(
+        await download_url(), headers={"Range": "bytes=2-4"}
+    )
+    assert resp.status == 206
+    assert resp.headers["Content-Range"] == f"bytes 2-4/{len(content)}"
+    assert await resp.read() == b"234"
+
+    # Range starting past the end of the file
+    with pytest.raises(ApiException) as excinfo:
+        await authenticated_client.get(
+            await download_url(), headers={"Range": "bytes=10-"}
+        )
+    assert "416" in str(excinfo.value)
+
+    # Multiple ranges are not supported
+    with pytest.raises(ApiException) as excinfo:
+        await authenticated_client.get(
+            await download_url(), headers={"Range": "bytes=0-1,4-5"}
+        )
+    assert "400" in str(excinfo.value)
+
+
+async def test_oss_download_content_disposition(
+    authenticated_client: Client,
+    device_client: DeviceClient,
+) -> None:
+    path = '/Übersicht "v1".txt'
+    await device_client.upload_content(path=path, content=b"content")
+
+    query_res = await device_client.query_by_path(path, "WEB")
+    assert query_res.entries_vo
+    info = await device_client.download_v3(int(query_res.entries_vo.id), "WEB")
+    assert info
+
+    resp = await authenticated_client.get(info.url)
+    assert resp.headers["Content-Disposition"] == (
+        'attachment; filename="_bersicht _v1_.txt"; '
+        "filename*=UTF-8''%C3%9Cbersicht%20%22v1%22.txt"
+    )
+    assert resp.content_disposition is not None
+    assert resp.content_disposition.filename == 'Übersicht "v1".txt'
+
+
+async def test_oss_download_missing_blob(
+    client: TestClient,
+    authenticated_client: Client,
+    device_client: DeviceClient,
+    test_users: list[str],
+) -> None:
+    path = "/oss_missing_blob.txt"
+    await device_client.upload_content(path=path, content=b"content")
+
+    query_res = await device_client.query_by_path(path, "WEB")
+    assert query_res.entries_vo
+    file_id = int(query_res.entries_vo.id)
+    info = await device_client.download_v3(file_id, "WEB")
+    assert info
+
+    # The blob goes away after the download URL was signed
+    assert client.app
+    file_service: FileService = client.app["file_service"]
+    entity = await file_service.get_file_info_by_id(test_users[0], file_id)
+    assert entity
+    assert entity.storage_key
+    await file_service.blob_storage.delete(USER_DATA_BUCKET, entity.storage_key)
+
+    with pytest.raises(ApiException, match="Blob not found"):
+        await authenticated_client.get(info.url)
+
+
+async def test_oss_download_deleted_file(
+    authenticated_client: Client,
+    device_client: DeviceClient,
+) -> None:
+    path = "/oss_deleted_file.txt"
+    await device_client.upload_content(path=path, content=b"content")
+
+    query_res = await device_client.query_by_path(path, "WEB")
+    assert query_res.entries_vo
+    file_id = int(query_res.entries_vo.id)
+    info = await device_client.download_v3(file_id, "WEB")
+    assert info
+
+    # Deleting only moves the file to the recycle bin and keeps its blob, but
+    # the URL signed before the delete must no longer serve it
+    await device_client.delete(file_id, "WEB")
+
+    with pytest.raises(ApiException, match="File not found"):
+        await authenticated_client.get(info.url)
@@ -91,3 +91,32 @@ async def test_oss_upload_part_public_access_flow(
     vo = FileChunkVO.from_json(result)
     assert vo.status == "success"
     assert vo.chunk_md5 == hashlib.md5(content).hexdigest()
+
+
+async def test_oss_upload_part_requires_multipart(
+    device_client: DeviceClient,
+    client: Client,
+) -> None:
+    """Verify a non-multipart upload is rejected without consuming the URL."""
+
+    filename = "oss_upload_part_multipart_test.txt"
+    content = b"Multipart Test Content"
+    apply_vo = await device_client.upload_apply(
+        file_name=filename, path=f"/{filename}", size=len(content), equipment_no="TEST"
+    )
+    assert apply_vo.part_upload_url
+
+    parsed = urllib.parse.urlparse(apply_vo.part_upload_url)
+    relative_url = f"{parsed.path}?{parsed.query}"
+    params = {"uploadId": "test_upload_id", "partNumber": 1, "totalChunks": 1}
+
+    resp = await client.post(relative_url, data=content, params=params, headers={})
+    assert resp.status == 415
+
+    # The final chunk was rejected before its nonce was consumed.
+    data = FormData()
+    data.add_field("file", content, filename=filename)
+    resp = await client.post(relative_url, data=data, params=params, headers={})
+    assert resp.status == 200
+    vo = FileChunkVO.from_json(await resp.text())
+    assert vo.chunk_md5 == hashlib.md5(content).hexdigest()
@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from supernote.server.services import blob
 from supernote.server.services.blob import LocalBlobStorage
 
 
@@ -70,6 +71,9 @@ async def test_delete_blob(tmp_path: Path) -> None:
     assert not await storage.exists(bucket, key)
     assert not storage.get_blob_path(bucket, key).exists()
 
+    # Deleting a missing blob is a no-op
+    await storage.delete(bucket, key)
+
 
 async def test_isolation(tmp_path: Path) -> None:
     """Verify different keys store separately even if content is same."""
@@ -174,3 +178,68 @@ async def test_get_range_large(tmp_path: Path) -> None:
     data = b"".join(chunks)
     assert len(data) == 5
     assert data == b"xxyyy"
+
+
+async def test_concat(tmp_path: Path) -> None:
+    storage = LocalBlobStorage(tmp_path)
+    bucket = "test-bucket"
+    parts = [b"Part1", b"", b"Part3" * 1000]
+    source_keys = [f"part-{i}" for i in range(len(parts))]
+    for source_key, part in zip(source_keys, parts):
+        await storage.put(bucket, source_key, part)
+
+    metadata = await storage.concat(bucket, "merged", source_keys)
+    assert metadata.size == sum(len(part) for part in parts)
+    assert storage.get_blob_path(bucket, "merged").read_bytes() == b"".join(parts)
+
+    # Sources are left in place
+    assert await storage.exists(bucket, "part-0")
+
+
+async def test_concat_missing_source(tmp_path: Path) -> None:
+    storage = LocalBlobStorage(tmp_path)
+    bucket = "test-bucket"
+    await storage.put(bucket, "part-0", b"Part1")
+
+    with pytest.raises(FileNotFoundError):
+        await storage.concat(bucket, "merged", ["part-0", "missing"])
+    assert not await storage.exists(bucket, "merged")
+    assert not list((tmp_path / "temp").iterdir())
+
+
+async def test_put_stream_buffered(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that streams larger than the write buffer are written in order."""
+    monkeypatch.setattr(blob, "WRITE_BUFFER_SIZE", 10)
+    storage = LocalBlobStorage(tmp_path)
+    # Small chunks are gathered and full size chunks are written directly
+    chunks = [bytes([i]) * (i + 3) for i in range(20)] + [b"x" * 10, b"y" * 25]
+
+    async def data_stream() -> AsyncGenerator[bytes, None]:
+        for chunk in chunks:
+            yield chunk
+
+    full_content = b"".join(chunks)
+    metadata = await storage.put("test-bucket", "buffered-key", data_stream())
+    assert metadata.size == len(full_content)
+    assert metadata.content_md5 == hashlib.md5(full_content).hexdigest()
+    assert (
+        storage.get_blob_path("test-bucket", "buffered-key").read_bytes()
+        == full_content
+    )
+
+
+async def test_put_stream_failure_removes_temp_file(tmp_path: Path) -> None:
+    """Test that a failed upload leaves neither a blob nor a temp file."""
+    storage = LocalBlobStorage(tmp_path)
+
+    async def data_stream() -> AsyncGenerator[bytes, None]:
+        yield b"Part1"
+        raise ConnectionResetError("client went away")
+
+    with pytest.raises(ConnectionResetError):
+        await storage.put("test-bucket", "failed-key", data_stream())
+
+    assert not await storage.exists("test-bucket", "failed-key")
+    assert not list((tmp_path / "temp").iterdir())
@@ -13,7 +13,9 @@ TEST_DB_URL = "sqlite+aiosqlite:///:memory:"
 
 
 @pytest.fixture
-async def local_coordination_service() -> AsyncGenerator[CoordinationService, None]:
+async def local_coordination_service() -> AsyncGenerator[
+    SqliteCoordinationService, None
+]:
     """Create a local coordination service for testing."""
     manager = DatabaseSessionManager(TEST_DB_URL)
     assert manager._engine
@@ -33,3 +35,30 @@ async def test_key_expiry(local_coordination_service: CoordinationService) -> No
 
     with freezegun.freeze_time("2024-01-01 12:00:16"):
         assert await local_coordination_service.get_value("foo") is None
+
+
+async def test_set_value_overwrites(
+    local_coordination_service: CoordinationService,
+) -> None:
+    """Test that setting an existing key replaces its value and expiry."""
+    with freezegun.freeze_time("2024-01-01 12:00:00"):
+        await local_coordination_service.set_value("foo", "bar", ttl=15)
+        await local_coordination_service.set_value("foo", "baz", ttl=60)
+
+    with freezegun.freeze_time("2024-01-01 12:00:16"):
+        assert await local_coordination_service.get_value("foo") == "baz"
+
+
+async def test_purge_expired(
+    local_coordination_service: SqliteCoordinationService,
+) -> None:
+    """Test that expired keys are purged in bulk."""
+    with freezegun.freeze_time("2024-01-01 12:00:00"):
+        await local_coordination_service.set_value("short-1", "a", ttl=15)
+        await local_coordination_service.set_value("short-2", "b", ttl=15)
+        await local_coordination_service.set_value("long", "c", ttl=60)
+
+    with freezegun.freeze_time("2024-01-01 12:00:16"):
+        assert await local_coordination_service.purge_expired() == 2
+        assert await local_coordination_service.purge_expired() == 0
+        assert await local_coordination_service.get_value("long") == "c"
@@ -0,0 +1,68 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from supernote.models.user import UpdateEmailDTO, UserRegisterDTO
+from supernote.server.constants import USER_DATA_BUCKET
+from supernote.server.db.session import DatabaseSessionManager
+from supernote.server.services.blob import LocalBlobStorage
+from supernote.server.services.file import FileService
+from supernote.server.services.user import UserService
+
+PASSWORD_MD5 = hashlib.md5(b"pw").hexdigest()
+
+
+@pytest.fixture
+def file_service(
+    storage_root: Path,
+    blob_storage: LocalBlobStorage,
+    user_service: UserService,
+    session_manager: DatabaseSessionManager,
+) -> FileService:
+    return FileService(storage_root, blob_storage, user_service, session_manager)
+
+
+async def test_file_info_cache_follows_account(
+    file_service: FileService, user_service: UserService
+) -> None:
+    """Cached file info is not served to a new account that reuses an email."""
+    await user_service.create_user(
+        UserRegisterDTO(email="a@x.com", password=PASSWORD_MD5)
+    )
+    folder = await file_service.create_directory("a@x.com", "Docs")
+    assert await file_service.get_file_info_by_id("a@x.com", folder.id)
+    assert await file_service.get_file_info("a@x.com", "Docs")
+
+    await user_service.update_email("a@x.com", UpdateEmailDTO(email="b@x.com"))
+    await user_service.create_user(
+        UserRegisterDTO(email="a@x.com", password=PASSWORD_MD5)
+    )
+
+    assert await file_service.get_file_info_by_id("a@x.com", folder.id) is None
+    assert await file_service.get_file_info("a@x.com", "Docs") is None
+    info = await file_service.get_file_info_by_id("b@x.com", folder.id)
+    assert info
+    assert info.full_path == "Docs"
+
+
+async def test_storage_usage_cache_follows_account(
+    file_service: FileService, user_service: UserService
+) -> None:
+    """Cached storage usage is not served to a new account that reuses an email."""
+    await user_service.create_user(
+        UserRegisterDTO(email="a@x.com", password=PASSWORD_MD5)
+    )
+    await file_service.blob_storage.put(USER_DATA_BUCKET, "inner-a", b"hello")
+    await file_service.upload_finish_web(
+        "a@x.com", 0, "a.txt", hashlib.md5(b"hello").hexdigest(), "inner-a"
+    )
+    assert await file_service.get_storage_usage("a@x.com") == 5
+
+    await user_service.update_email("a@x.com", UpdateEmailDTO(email="b@x.com"))
+    await user_service.create_user(
+        UserRegisterDTO(email="a@x.com", password=PASSWORD_MD5)
+    )
+
+    assert await file_service.get_storage_usage("a@x.com") == 0
+    assert await file_service.get_storage_usage("b@x.com") == 5
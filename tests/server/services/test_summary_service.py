@@ -0,0 +1,36 @@
+import hashlib
+
+import pytest
+
+from supernote.models.user import UpdateEmailDTO, UserRegisterDTO
+from supernote.server.db.session import DatabaseSessionManager
+from supernote.server.services.summary import SummaryService
+from supernote.server.services.user import UserService
+
+PASSWORD_MD5 = hashlib.md5(b"pw").hexdigest()
+
+
+@pytest.fixture
+def summary_service(
+    user_service: UserService, session_manager: DatabaseSessionManager
+) -> SummaryService:
+    return SummaryService(user_service, session_manager)
+
+
+async def test_tags_cache_follows_account(
+    summary_service: SummaryService, user_service: UserService
+) -> None:
+    """Cached tags are not served to a new account that reuses an email."""
+    await user_service.create_user(
+        UserRegisterDTO(email="a@x.com", password=PASSWORD_MD5)
+    )
+    await summary_service.add_tag("a@x.com", "Work")
+    assert [tag.name for tag in await summary_service.list_tags("a@x.com")] == ["Work"]
+
+    await user_service.update_email("a@x.com", UpdateEmailDTO(email="b@x.com"))
+    await user_service.create_user(
+        UserRegisterDTO(email="a@x.com", password=PASSWORD_MD5)
+    )
+
+    assert await summary_service.list_tags("a@x.com") == []
+    assert [tag.name for tag in await summary_service.list_tags("b@x.com")] == ["Work"]
@@ -0,0 +1,63 @@
+from supernote.server.services.sync_lock import MAX_EVICTIONS_PER_CALL, SyncLocks
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def test_acquire_conflict() -> None:
+    """Test that a second device cannot start a sync while one is active."""
+    locks = SyncLocks(timeout=60, clock=FakeClock())
+    assert await locks.acquire("user@example.com", "SN1")
+    assert await locks.acquire("user@example.com", "SN1")
+    assert not await locks.acquire("user@example.com", "SN2")
+    assert await locks.acquire("other@example.com", "SN2")
+
+
+async def test_release() -> None:
+    """Test that only the owning device can release the lock."""
+    locks = SyncLocks(timeout=60, clock=FakeClock())
+    assert await locks.acquire("user@example.com", "SN1")
+    await locks.release("user@example.com", "SN2")
+    assert not await locks.acquire("user@example.com", "SN2")
+    await locks.release("user@example.com", "SN1")
+    assert await locks.acquire("user@example.com", "SN2")
+
+
+async def test_expiry() -> None:
+    """Test that expired sessions are evicted, honoring renewals."""
+    clock = FakeClock()
+    locks = SyncLocks(timeout=60, clock=clock)
+    assert await locks.acquire("user@example.com", "SN1")
+    assert await locks.acquire("idle@example.com", "SN1")
+
+    clock.now += 30
+    assert await locks.acquire("user@example.com", "SN1")  # Renew
+
+    clock.now += 45
+    assert await locks.acquire("new@example.com", "SN3")
+    # The idle session expired while the renewed one is still held.
+    assert len(locks) == 2
+    assert not await locks.acquire("user@example.com", "SN2")
+
+    clock.now += 60
+    assert await locks.acquire("user@example.com", "SN2")
+
+
+async def test_bounded_eviction() -> None:
+    """Test that expired sessions are evicted a few at a time."""
+    clock = FakeClock()
+    locks = SyncLocks(timeout=60, clock=clock)
+    for i in range(20):
+        assert await locks.acquire(f"user{i}@example.com", "SN1")
+
+    clock.now += 60
+    assert await locks.acquire("new@example.com", "SN1")
+    assert len(locks) == 20 - MAX_EVICTIONS_PER_CALL + 1
+
+    # Sessions that are expired but not yet evicted do not block others
+    assert await locks.acquire("user19@example.com", "SN2")
@@ -1,6 +1,12 @@
 import hashlib
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from unittest.mock import patch
 
-from supernote.models.user import UpdatePasswordDTO, UserRegisterDTO
+import pytest
+
+from supernote.models.user import UpdateEmailDTO, UpdatePasswordDTO, UserRegisterDTO
 from supernote.server.services.user import UserService
 from supernote.server.utils.hashing import hash_with_salt
 
@@ -78,3 +84,54 @@ async def test_unregister(user_service: UserService) -> None:
 
     await user_service.unregister("del@test.com")
     assert not await user_service.check_user_exists("del@test.com")
+
+
+async def test_get_user_id_after_account_changes(user_service: UserService) -> None:
+    """Cached user ids follow email changes and unregistration."""
+    pw_md5 = hashlib.md5("pw".encode()).hexdigest()
+    user = await user_service.register(
+        UserRegisterDTO(email="old@test.com", password=pw_md5)
+    )
+    assert await user_service.get_user_id("old@test.com") == user.id
+
+    await user_service.update_email(
+        "old@test.com", UpdateEmailDTO(email="new@test.com")
+    )
+    with pytest.raises(ValueError, match="not found"):
+        await user_service.get_user_id("old@test.com")
+    assert await user_service.get_user_id("new@test.com") == user.id
+
+    await user_service.unregister("new@test.com")
+    with pytest.raises(ValueError, match="not found"):
+        await user_service.get_user_id("new@test.com")
+
+
+async def test_get_user_id_racing_account_change(user_service: UserService) -> None:
+    """A lookup that raced with an email change is not cached."""
+    pw_md5 = hashlib.md5("pw".encode()).hexdigest()
+    user = await user_service.register(
+        UserRegisterDTO(email="race@test.com", password=pw_md5)
+    )
+    session_manager = user_service._session_manager
+    session = session_manager.session
+    raced = False
+
+    @asynccontextmanager
+    async def racing_session() -> AsyncIterator[Any]:
+        nonlocal raced
+        async with session() as sess:
+            yield sess
+        if not raced:
+            # The account changes after the lookup read the old id.
+            raced = True
+            await user_service.update_email(
+                "race@test.com", UpdateEmailDTO(email="moved@test.com")
+            )
+
+    with patch.object(session_manager, "session", racing_session):
+        assert await user_service.get_user_id("race@test.com") == user.id
+
+    new_user = await user_service.register(
+        UserRegisterDTO(email="race@test.com", password=pw_md5)
+    )
+    assert await user_service.get_user_id("race@test.com") == new_user.id
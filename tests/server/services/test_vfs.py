@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from supernote.server.db.models.file import RecycleFileDO, UserFileDO
 from supernote.server.services.vfs import VirtualFileSystem
 
 
@@ -56,3 +57,192 @@ async def test_vfs_file_operations(db_session: AsyncSession) -> None:
     # Verify can't get
     node = await vfs.get_node_by_id(user_id, file_node.id)
     assert node is None
+
+
+async def test_vfs_total_usage(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 777
+
+    # Usage before the total has been computed is seeded from the files
+    folder = await vfs.create_directory(user_id, 0, "Folder")
+    await vfs.create_file(user_id, folder.id, "a.txt", 100, "a", "key-a")
+    assert await vfs.get_total_usage(user_id) == 100
+    assert await vfs.get_total_usage(888) == 0
+
+    # Writes keep the stored total up to date
+    file_b = await vfs.create_file(user_id, 0, "b.txt", 20, "b", "key-b")
+    assert await vfs.get_total_usage(user_id) == 120
+
+    await vfs.copy_node(user_id, folder.id, 0, autorename=False, new_name="Copy")
+    assert await vfs.get_total_usage(user_id) == 220
+
+    await vfs.delete_node(user_id, file_b.id)
+    assert await vfs.get_total_usage(user_id) == 200
+
+    recycle = await vfs.list_recycle(user_id)
+    assert await vfs.restore_node(user_id, recycle[0].id)
+    assert await vfs.get_total_usage(user_id) == 220
+
+
+async def test_vfs_search_files(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 666
+
+    report = await vfs.create_file(user_id, 0, "Annual Report.pdf", 10, "a", "key-a")
+    await vfs.create_file(user_id, 0, "notes.txt", 10, "b", "key-b")
+    await vfs.create_file(999, 0, "report.pdf", 10, "c", "key-c")
+
+    # Substring matches are case-insensitive and scoped to the user
+    results = await vfs.search_files(user_id, "REPORT")
+    assert [node.file_name for node in results] == ["Annual Report.pdf"]
+
+    # Keywords shorter than a trigram still match
+    results = await vfs.search_files(user_id, "no")
+    assert [node.file_name for node in results] == ["notes.txt"]
+
+    # Quotes in the keyword are matched literally
+    assert await vfs.search_files(user_id, 'rep"ort') == []
+
+    # LIKE wildcards are literal at any keyword length
+    await vfs.create_file(user_id, 0, "100%_done.txt", 10, "d", "key-d")
+    for keyword in ("%", "_", "%_", "0%_d"):
+        results = await vfs.search_files(user_id, keyword)
+        assert [node.file_name for node in results] == ["100%_done.txt"]
+
+    # The index follows renames and deletes
+    await vfs.move_node(user_id, report.id, 0, autorename=False, new_name="Summary.pdf")
+    assert await vfs.search_files(user_id, "report") == []
+    assert [node.file_name for node in await vfs.search_files(user_id, "summ")] == [
+        "Summary.pdf"
+    ]
+
+    await vfs.delete_node(user_id, report.id)
+    assert await vfs.search_files(user_id, "summ") == []
+
+
+async def test_vfs_restore_nodes(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 555
+
+    nodes = [
+        await vfs.create_file(user_id, 0, f"{i}.txt", 10, str(i), f"key-{i}")
+        for i in range(3)
+    ]
+    for node in nodes:
+        await vfs.delete_node(user_id, node.id)
+    assert await vfs.get_total_usage(user_id) == 0
+
+    recycle = await vfs.list_recycle(user_id)
+    assert len(recycle) == 3
+
+    # Unknown ids are ignored
+    restored = await vfs.restore_nodes(user_id, [recycle[0].id, recycle[1].id, 999])
+    assert restored == 2
+    assert len(await vfs.list_recycle(user_id)) == 1
+    assert len(await vfs.list_directory(user_id, 0)) == 2
+    assert await vfs.get_total_usage(user_id) == 20
+
+    assert await vfs.restore_nodes(user_id, [999]) == 0
+
+
+async def test_vfs_get_node_path(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 444
+
+    folder = await vfs.create_directory(user_id, 0, "Folder")
+    sub = await vfs.create_directory(user_id, folder.id, "Sub")
+    file_node = await vfs.create_file(user_id, sub.id, "a.txt", 1, "a", "key-a")
+
+    assert await vfs.get_node_path(user_id, folder) == "Folder"
+    assert await vfs.get_node_path(user_id, file_node) == "Folder/Sub/a.txt"
+    assert await vfs.get_node_path(user_id, file_node) == await vfs.get_full_path(
+        user_id, file_node.id
+    )
+
+
+async def test_vfs_get_ancestor_chain(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 445
+
+    folder = await vfs.create_directory(user_id, 0, "Folder")
+    sub = await vfs.create_directory(user_id, folder.id, "Sub")
+    file_node = await vfs.create_file(user_id, sub.id, "a.txt", 1, "a", "key-a")
+
+    chain = await vfs.get_ancestor_chain(user_id, file_node.id)
+    assert [node.id for node in chain] == [folder.id, sub.id, file_node.id]
+    assert await vfs.get_ancestor_chain(user_id, 0) == []
+    assert await vfs.get_ancestor_chain(user_id + 1, file_node.id) == []
+
+    # An inactive ancestor ends the chain.
+    await vfs.delete_node(user_id, folder.id)
+    chain = await vfs.get_ancestor_chain(user_id, file_node.id)
+    assert [node.id for node in chain] == [sub.id, file_node.id]
+
+
+async def test_vfs_list_recursive(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 333
+
+    a = await vfs.create_directory(user_id, 0, "A")
+    a1 = await vfs.create_directory(user_id, a.id, "A1")
+    await vfs.create_file(user_id, a1.id, "deep.txt", 1, "d", "key-d")
+    await vfs.create_file(user_id, a.id, "a.txt", 1, "a", "key-a")
+    b = await vfs.create_directory(user_id, 0, "B")
+    await vfs.create_file(user_id, b.id, "b.txt", 1, "b", "key-b")
+
+    # Each folder is followed by its descendants
+    results = await vfs.list_recursive(user_id, 0)
+    assert [path for _, path in results] == [
+        "A",
+        "A/A1",
+        "A/A1/deep.txt",
+        "A/a.txt",
+        "B",
+        "B/b.txt",
+    ]
+
+    results = await vfs.list_recursive(user_id, a.id, "A")
+    assert [path for _, path in results] == ["A/A1", "A/A1/deep.txt", "A/a.txt"]
+
+
+async def test_vfs_list_directory_page(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 333
+
+    for name, size in [("c.pdf", 10), ("a.pdf", 30), ("b.pdf", 10), ("d.pdf", 20)]:
+        await vfs.create_file(user_id, 0, name, size, "hash", f"key-{name}")
+    await vfs.create_file(user_id + 1, 0, "other.pdf", 5, "hash", "key-other")
+
+    page, total = await vfs.list_directory_page(
+        user_id, 0, UserFileDO.file_name, False, 1, 2
+    )
+    assert total == 4
+    assert [node.file_name for node in page] == ["b.pdf", "c.pdf"]
+
+    # Ties keep their creation order, matching a stable sort
+    page, total = await vfs.list_directory_page(
+        user_id, 0, UserFileDO.size, True, 0, 10
+    )
+    assert total == 4
+    assert [node.file_name for node in page] == ["a.pdf", "d.pdf", "c.pdf", "b.pdf"]
+
+    page, total = await vfs.list_directory_page(
+        user_id, 0, UserFileDO.file_name, False, 10, 2
+    )
+    assert page == []
+    assert total == 4
+
+
+async def test_vfs_list_recycle_page(db_session: AsyncSession) -> None:
+    vfs = VirtualFileSystem(db_session)
+    user_id = 334
+
+    for name in ["c.pdf", "a.pdf", "b.pdf"]:
+        node = await vfs.create_file(user_id, 0, name, 1, "hash", f"key-{name}")
+        await vfs.delete_node(user_id, node.id)
+
+    page, total = await vfs.list_recycle_page(
+        user_id, RecycleFileDO.file_name, True, 0, 2
+    )
+    assert total == 3
+    assert [entry.file_name for entry in page] == ["c.pdf", "b.pdf"]
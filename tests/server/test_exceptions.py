@@ -0,0 +1,69 @@
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from pytest_aiohttp import AiohttpClient
+
+from supernote.server.constants import JSON_STREAM_BATCH_SIZE, JSON_STREAM_THRESHOLD
+from supernote.server.exceptions import FileNotFound, error_middleware
+from supernote.server.utils.json_utils import json_list_response
+
+NUM_ITEMS = JSON_STREAM_THRESHOLD + 1
+FAILING_ITEM = JSON_STREAM_BATCH_SIZE + 1
+
+
+def _to_dict(item: int) -> dict[str, int]:
+    if item == FAILING_ITEM:
+        raise ValueError("Cannot encode item")
+    return {"id": item}
+
+
+async def _streamed_handler(request: web.Request) -> web.StreamResponse:
+    return await json_list_response(
+        request, {"success": True}, "items", list(range(NUM_ITEMS)), _to_dict
+    )
+
+
+async def _not_found_handler(request: web.Request) -> web.StreamResponse:
+    raise FileNotFound("File not found")
+
+
+async def test_error_middleware_converts_errors(
+    aiohttp_client: AiohttpClient,
+) -> None:
+    """Test that handler errors become JSON error responses."""
+    app = web.Application(middlewares=[error_middleware])
+    app.router.add_get("/", _not_found_handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/")
+    assert resp.status == 404
+    assert await resp.json() == {
+        "success": False,
+        "errorCode": "E0081",
+        "errorMsg": "File not found",
+    }
+
+
+async def test_error_middleware_streamed_failure(
+    aiohttp_client: AiohttpClient,
+) -> None:
+    """Test that a failure mid-stream aborts the response instead of appending one."""
+    app = web.Application(middlewares=[error_middleware])
+    app.router.add_get("/", _streamed_handler)
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/")
+    assert resp.status == 200
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await resp.read()
+
+
+async def test_error_middleware_connection_reset() -> None:
+    """Test that client disconnects are not reported as internal errors."""
+
+    async def handler(request: web.Request) -> web.StreamResponse:
+        raise ConnectionResetError("Cannot write to closing transport")
+
+    with pytest.raises(ConnectionResetError):
+        await error_middleware(make_mocked_request("GET", "/"), handler)
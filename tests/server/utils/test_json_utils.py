@@ -0,0 +1,76 @@
+import json
+from unittest import mock
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+
+from supernote.models.base import BaseResponse, create_error_response
+from supernote.models.file_device import SynchronousStartLocalVO
+from supernote.server.constants import MAX_JSON_BODY_SIZE
+from supernote.server.utils.json_utils import dumps, json_response, read_json
+
+
+def test_dumps_matches_to_dict() -> None:
+    """Test that models are encoded with their aliases and omit_none config."""
+    vo = SynchronousStartLocalVO(equipment_no="SN123", syn_type=False)
+    assert json.loads(dumps(vo)) == vo.to_dict()
+    assert json.loads(dumps(vo)) == {
+        "success": True,
+        "equipmentNo": "SN123",
+        "synType": False,
+    }
+
+
+def test_dumps_plain_data() -> None:
+    """Test that plain dicts and lists are encoded as-is."""
+    assert dumps({"a": [1, "b"]}) == b'{"a":[1,"b"]}'
+    assert dumps([]) == b"[]"
+
+
+def test_json_response() -> None:
+    """Test building a response with a status code."""
+    resp = json_response(create_error_response("Not found", "E0081"), status=404)
+    assert resp.status == 404
+    assert resp.content_type == "application/json"
+    assert isinstance(resp.body, bytes)
+    assert json.loads(resp.body) == {
+        "success": False,
+        "errorCode": "E0081",
+        "errorMsg": "Not found",
+    }
+
+
+def test_json_response_non_ascii() -> None:
+    """Test that non-ASCII text round trips as UTF-8."""
+    resp = json_response(BaseResponse(error_msg="Übersicht"))
+    assert isinstance(resp.body, bytes)
+    assert json.loads(resp.body.decode("utf-8"))["errorMsg"] == "Übersicht"
+
+
+async def test_read_json() -> None:
+    """Test decoding a request body."""
+    payload = mock.Mock()
+    payload.readany = mock.AsyncMock(side_effect=[b'{"equipmentNo": "SN123"}', b""])
+    request = make_mocked_request(
+        "POST", "/", headers={"Content-Length": "24"}, payload=payload
+    )
+    assert await read_json(request) == {"equipmentNo": "SN123"}
+
+
+async def test_read_json_too_large() -> None:
+    """Test that oversized bodies are rejected before being read."""
+    request = make_mocked_request(
+        "POST", "/", headers={"Content-Length": str(MAX_JSON_BODY_SIZE + 1)}
+    )
+    with pytest.raises(web.HTTPRequestEntityTooLarge):
+        await read_json(request)
+
+
+def test_json_response_bytes() -> None:
+    """Test that pre-encoded bodies are sent unchanged."""
+    body = dumps(BaseResponse())
+    resp = json_response(body, status=201)
+    assert resp.status == 201
+    assert resp.content_type == "application/json"
+    assert resp.body is body
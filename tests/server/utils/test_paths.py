@@ -0,0 +1,67 @@
+import urllib.parse
+from pathlib import PurePath
+
+import pytest
+from aiohttp.test_utils import make_mocked_request
+
+from supernote.server.utils.paths import (
+    absolute_url,
+    file_suffixes,
+    generate_inner_name,
+    quote_path,
+)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "plain.note",
+        "a/b/c_d-e~f.pdf",
+        "with space.note",
+        "Übersicht.note",
+        "query?and=amp&hash#.pdf",
+        "%41",
+    ],
+)
+def test_quote_path_matches_urllib(value: str) -> None:
+    """Test that quote_path produces the same output as urllib.parse.quote."""
+    assert quote_path(value) == urllib.parse.quote(value)
+
+
+def test_quote_path_inner_name() -> None:
+    """Test that generated inner names do not need encoding."""
+    inner_name = generate_inner_name("My Note.note", "SN100B10004997")
+    assert quote_path(inner_name) == inner_name
+
+
+def test_absolute_url() -> None:
+    """Test that URLs point back at the host the request was sent to."""
+    request = make_mocked_request("GET", "/", headers={"Host": "10.0.0.5:8080"})
+    assert (
+        absolute_url(request, "/api/oss/download?path=a.note")
+        == "http://10.0.0.5:8080/api/oss/download?path=a.note"
+    )
+
+
+@pytest.mark.parametrize(
+    "name",
+    [
+        "",
+        "plain.note",
+        "archive.tar.gz",
+        ".bashrc",
+        "..a.b",
+        "a..b",
+        "foo.",
+        "a.b.",
+        "...x",
+        "v1.2 final.pdf",
+        "dir/x.note/",
+        "a/./b.pdf/.",
+        "a\\b.c",
+    ],
+)
+def test_file_suffixes_matches_pathlib(name: str) -> None:
+    """Test that file_suffixes matches joining PurePath suffixes."""
+    assert file_suffixes(name) == "".join(PurePath(name).suffixes)
@@ -1,6 +1,8 @@
 import datetime
+from unittest.mock import patch
 
 import freezegun
+import jwt
 import pytest
 
 from supernote.server.exceptions import InvalidSignature
@@ -63,6 +65,41 @@ async def test_verify_failure_expired(signer: UrlSigner) -> None:
             await signer.verify(signed_url)
 
 
+async def test_verify_reused_url_expires(signer: UrlSigner) -> None:
+    """Test that a URL verified more than once still expires."""
+    initial_time = datetime.datetime(2023, 1, 1, 12, 0, 0)
+    with freezegun.freeze_time(initial_time) as frozen_time:
+        signed_url = await signer.sign(
+            "/reused", expiration=datetime.timedelta(minutes=7)
+        )
+
+        first = await signer.verify(signed_url)
+        second = await signer.verify(signed_url)
+        assert first == second
+        assert first is not second
+
+        frozen_time.tick(delta=datetime.timedelta(minutes=8))
+
+        with pytest.raises(InvalidSignature, match="Signature expired"):
+            await signer.verify(signed_url)
+
+
+async def test_verify_reuses_decoded_token(signer: UrlSigner) -> None:
+    """Test that one token is decoded once across per-part query params."""
+    signed_url = await signer.sign("/upload/data")
+    with patch.object(signer, "_decode", wraps=signer._decode) as decode:
+        for part in range(1, 4):
+            payload = await signer.verify(f"{signed_url}&partNumber={part}")
+            assert payload["path"] == "/upload/data"
+        assert decode.call_count == 1
+
+        # The path is still checked against the cached payload.
+        tampered_url = signed_url.replace("/upload/data", "/other/data")
+        with pytest.raises(InvalidSignature, match="Signed path mismatch"):
+            await signer.verify(tampered_url)
+        assert decode.call_count == 1
+
+
 async def test_sign_with_user(signer: UrlSigner) -> None:
     """Test signing with user identity."""
     path = "/user/resource"
@@ -93,3 +130,19 @@ async def test_sign_rejects_fragment(signer: UrlSigner) -> None:
     """Test that signing rejects fragments."""
     with pytest.raises(ValueError, match="fragments.*not supported"):
         await signer.sign("/api/resource#section1")
+
+
+async def test_signature_is_standard_hs256(signer: UrlSigner) -> None:
+    """Test that signatures are plain HS256 tokens for the secret key."""
+    signed_url = await signer.sign("/test/path", user="user@example.com")
+    token = UrlSigner.extract_signature(signed_url)
+    assert token is not None
+
+    payload = jwt.decode(
+        token, "test-secret-key-32-characters-long!!", algorithms=["HS256"]
+    )
+    assert payload["path"] == "/test/path"
+    assert payload["user"] == "user@example.com"
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        jwt.decode(token, "another-secret-key-32-characters-long", algorithms=["HS256"])
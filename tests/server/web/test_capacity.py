@@ -1,3 +1,8 @@
+from unittest.mock import patch
+
+import pytest
+
+from supernote.client.exceptions import ApiException
 from supernote.client.web import WebClient
 
 
@@ -20,3 +25,13 @@ async def test_capacity_query_web(
     cap_after = await web_client.get_capacity_web()
     assert cap_after.used_capacity == initial_used + 1024
     assert cap_after.total_capacity == cap.total_capacity
+
+
+async def test_capacity_query_web_uncaught_exception(web_client: WebClient) -> None:
+    # Unexpected errors are converted to a JSON error response
+    with patch(
+        "supernote.server.services.file.FileService.get_storage_usage",
+        side_effect=Exception("BOOM"),
+    ):
+        with pytest.raises(ApiException, match="BOOM"):
+            await web_client.get_capacity_web()
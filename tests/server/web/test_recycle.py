@@ -160,3 +160,23 @@ async def test_delete_wrong_parent(
     # Note: list_query for parent
     list_result = await web_client.list_query(directory_id=parent_id)
     assert not any(f.id == str(child_id) for f in list_result.user_file_vo_list)
+
+
+async def test_delete_batch_is_validated_first(
+    web_client: WebClient,
+) -> None:
+    parent_vo = await web_client.create_folder(parent_id=0, name="ParentFolder")
+    parent_id = int(parent_vo.id)
+    child_vo = await web_client.create_folder(parent_id=parent_id, name="ChildFolder")
+    sibling_vo = await web_client.create_folder(parent_id=0, name="Sibling")
+
+    # One misplaced id fails the whole batch before anything is deleted.
+    with pytest.raises(ApiException, match="is not in directory 0"):
+        await web_client.file_delete(
+            id_list=[int(sibling_vo.id), int(child_vo.id)], parent_id=0
+        )
+
+    list_result = await web_client.list_query(directory_id=0)
+    assert any(f.id == sibling_vo.id for f in list_result.user_file_vo_list)
+    recycle_list_result = await web_client.recycle_list(page_no=1, page_size=20)
+    assert recycle_list_result.total == 0
@@ -1,4 +1,7 @@
+import pytest
+
 from supernote.client.web import WebClient
+from supernote.server.utils import json_utils
 
 
 async def test_search_by_filename(
@@ -83,3 +86,18 @@ async def test_search_path_reconstruction(
     assert entry.name == "DeepTarget"
     assert entry.path_display == "Nested/Folder/DeepTarget"
     assert entry.parent_path == "Nested/Folder"
+
+
+async def test_search_streamed(
+    web_client: WebClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that large result sets are streamed with the same wire format."""
+    for i in range(5):
+        await web_client.create_folder(parent_id=0, name=f"Streamed{i}")
+    expected = await web_client.search(keyword="Streamed")
+
+    monkeypatch.setattr(json_utils, "JSON_STREAM_THRESHOLD", 2)
+    monkeypatch.setattr(json_utils, "JSON_STREAM_BATCH_SIZE", 2)
+    data = await web_client.search(keyword="Streamed")
+    assert len(data.entries) == 5
+    assert data.to_dict() == expected.to_dict()